@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+Headless startup and interaction benchmark for both GUIs
+Author: @ncux11
+
+Starts scripts/steamdeck_gui.py (Tk) and gui/main.py (Qt) in fresh
+processes with a throwaway HOME and measures:
+
+    first_paint_ms        process start -> first paint of the main window
+    tab_open_ms           first switch to each tab (builds the lazy view)
+    tab_revisit_ms        switch back to an already built tab
+    console_lines_per_s   lines pushed through the batched output console
+    idle.wakeups_per_s    context switches of the idle GUI (all threads)
+    idle.cpu_percent      CPU time of the idle GUI
+
+Tk needs an X server: an existing DISPLAY is used, otherwise Xvfb is
+started if installed. Qt runs on the offscreen platform unless
+QT_QPA_PLATFORM is set. Each metric is the median over --runs processes;
+results are written as JSON (with the import times of import_time.py)
+so versions can be compared with --compare.
+
+Usage:
+    python3 benchmarks/gui_bench.py [--runs N] [--lines N] [--idle S] [tk] [qt]
+    python3 benchmarks/gui_bench.py --compare OLD.json NEW.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+ENTRIES = ("tk", "qt")
+
+DEFAULT_RUNS = 3
+DEFAULT_LINES = 20000
+DEFAULT_IDLE_S = 5.0
+
+# Seconds to wait for the first paint, console drain and background loaders
+WAIT_TIMEOUT = 30.0
+# Extra seconds a driver process may take on top of the idle window
+DRIVER_TIMEOUT = 120
+
+XVFB_SCREEN = "1280x800x24"
+
+# Metrics where a larger value is better (everything else: smaller is better)
+HIGHER_IS_BETTER = ("console_lines_per_s",)
+
+
+# --- Drivers (run inside a fresh GUI process) ---
+
+def _usage():
+    import resource
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return (time.monotonic(), usage.ru_utime + usage.ru_stime,
+            usage.ru_nvcsw + usage.ru_nivcsw)
+
+
+def _idle_stats(before):
+    wall = time.monotonic() - before[0]
+    _, cpu, switches = _usage()
+    return {
+        "seconds": round(wall, 2),
+        "wakeups_per_s": round((switches - before[2]) / wall, 2),
+        "cpu_percent": round((cpu - before[1]) / wall * 100, 2),
+    }
+
+
+def _pump(process_events, done, timeout=WAIT_TIMEOUT):
+    """Process GUI events until done() is true; False on timeout"""
+    deadline = time.monotonic() + timeout
+    while not done():
+        if time.monotonic() > deadline:
+            return False
+        process_events()
+        time.sleep(0.001)
+    return True
+
+
+def _settled(scheduler):
+    return scheduler.pending_count() == 0 and scheduler.running_count() == 0
+
+
+class _Clock:
+    """Milliseconds since the start of the driver process"""
+    
+    def __init__(self):
+        import steamdeck_probe
+        # /proc gives the interpreter start-up (10 ms ticks), perf_counter the rest
+        self.offset = (steamdeck_probe.process_age() or 0.0) * 1000
+        self.start = time.perf_counter()
+    
+    def now_ms(self):
+        return round(self.offset + (time.perf_counter() - self.start) * 1000, 2)
+
+
+def _timed(action, process_events):
+    start = time.perf_counter()
+    action()
+    process_events()
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+def drive_tk(lines, idle):
+    """Benchmark scripts/steamdeck_gui.py"""
+    sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+    clock = _Clock()
+    
+    import tkinter as tk
+    
+    # The game watcher is a separate long-lived process, not part of the GUI
+    import steamdeck_gamewatch
+    steamdeck_gamewatch.ensure_running = lambda: False
+    
+    import steamdeck_gui
+    from steamdeck_scheduler import get_scheduler
+    
+    gui_class = steamdeck_gui.SteamDeckGUI
+    # The modal alpha warning and the network update check are not measured
+    gui_class.show_alpha_warning = lambda self: None
+    gui_class.auto_check_updates = lambda self: None
+    
+    painted = []
+    report_first_paint = gui_class.report_first_paint
+    
+    def on_first_paint(self, event=None):
+        report_first_paint(self, event)
+        painted.append(clock.now_ms())
+    
+    gui_class.report_first_paint = on_first_paint
+    
+    root = tk.Tk()
+    app = gui_class(root)
+    _pump(root.update, lambda: painted)
+    result = {"first_paint_ms": painted[0] if painted else None}
+    
+    notebook = app.notebook
+    tab_ids = notebook.tabs()
+    titles = [notebook.tab(tab_id, "text") for tab_id in tab_ids]
+    result["tab_open_ms"] = {
+        title: _timed(lambda: notebook.select(tab_id), root.update)
+        for tab_id, title in list(zip(tab_ids, titles))[1:]
+    }
+    result["tab_revisit_ms"] = {
+        title: _timed(lambda: notebook.select(tab_id), root.update)
+        for tab_id, title in zip(tab_ids, titles)
+    }
+    
+    # Script output arrives from worker threads through the OutputBuffer
+    notebook.select(app.utilities_tab)
+    root.update()
+    console = app.get_active_console()
+    last = f"bench line {lines - 1}"
+    
+    def produce():
+        for i in range(lines):
+            app.append_output(f"bench line {i}")
+    
+    start = time.perf_counter()
+    threading.Thread(target=produce, daemon=True).start()
+    drained = _pump(root.update, lambda: console.get("end-2l", "end-1c") == last)
+    elapsed = time.perf_counter() - start
+    result["console_lines_per_s"] = round(lines / elapsed) if drained else None
+    
+    scheduler = get_scheduler()
+    _pump(root.update, lambda: _settled(scheduler))
+    before = _usage()
+    root.after(int(idle * 1000), root.quit)
+    root.mainloop()
+    result["idle"] = _idle_stats(before)
+    
+    scheduler.shutdown()
+    root.destroy()
+    return result
+
+
+def drive_qt(lines, idle):
+    """Benchmark gui/main.py"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+    clock = _Clock()
+    
+    sys.path.insert(0, str(PROJECT_ROOT / "gui"))
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QApplication
+    
+    # The game watcher is a separate long-lived process, not part of the GUI
+    import steamdeck_gamewatch
+    steamdeck_gamewatch.ensure_running = lambda: False
+    
+    import main as gui_main
+    from core.config import config
+    from steamdeck_scheduler import get_scheduler
+    
+    # The network update check is not measured (in memory, not saved)
+    config.config["auto_check_updates"] = False
+    
+    painted = []
+    window_class = gui_main.MainWindow
+    report_first_paint = window_class._report_first_paint
+    
+    def on_first_paint(self):
+        report_first_paint(self)
+        painted.append(clock.now_ms())
+    
+    window_class._report_first_paint = on_first_paint
+    
+    app = QApplication([sys.argv[0]])
+    window = window_class()
+    window.show()
+    _pump(app.processEvents, lambda: painted)
+    result = {
+        "platform": app.platformName(),
+        "first_paint_ms": painted[0] if painted else None,
+    }
+    
+    tabs = window.tabs
+    titles = [tabs.tabText(i) for i in range(tabs.count())]
+    result["tab_open_ms"] = {
+        titles[i]: _timed(lambda: tabs.setCurrentIndex(i), app.processEvents)
+        for i in range(1, tabs.count())
+    }
+    result["tab_revisit_ms"] = {
+        titles[i]: _timed(lambda: tabs.setCurrentIndex(i), app.processEvents)
+        for i in range(tabs.count())
+    }
+    
+    # Runner output reaches the console on the GUI thread, between events
+    tabs.setCurrentIndex(1)
+    console = tabs.widget(1).ensure_built().output
+    app.processEvents()
+    document = console.view.document()
+    last = f"bench line {lines - 1}"
+    chunk = 100
+    
+    start = time.perf_counter()
+    for first in range(0, lines, chunk):
+        for i in range(first, min(first + chunk, lines)):
+            console.append(f"bench line {i}")
+        app.processEvents()
+    drained = _pump(app.processEvents, lambda: document.lastBlock().text() == last)
+    elapsed = time.perf_counter() - start
+    result["console_lines_per_s"] = round(lines / elapsed) if drained else None
+    
+    scheduler = get_scheduler()
+    _pump(app.processEvents, lambda: _settled(scheduler))
+    before = _usage()
+    QTimer.singleShot(int(idle * 1000), app.quit)
+    app.exec()
+    result["idle"] = _idle_stats(before)
+    
+    scheduler.shutdown()
+    window.hide()
+    return result
+
+
+DRIVERS = {"tk": drive_tk, "qt": drive_qt}
+
+
+def run_driver(name, lines, idle):
+    # The GUIs print progress to stdout; keep it free for the JSON result
+    stdout = sys.stdout
+    sys.stdout = sys.stderr
+    result = DRIVERS[name](lines, idle)
+    sys.stdout = stdout
+    print(json.dumps(result, ensure_ascii=False))
+    return 0
+
+
+# --- Runner ---
+
+@contextmanager
+def virtual_display(env):
+    """Run with the current DISPLAY, or with Xvfb if there is none"""
+    if env.get("DISPLAY") or not shutil.which("Xvfb"):
+        yield env
+        return
+    
+    number = 99
+    while Path(f"/tmp/.X11-unix/X{number}").exists():
+        number += 1
+    xvfb = subprocess.Popen(
+        ["Xvfb", f":{number}", "-screen", "0", XVFB_SCREEN, "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.monotonic() + 5
+        while not Path(f"/tmp/.X11-unix/X{number}").exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        yield dict(env, DISPLAY=f":{number}")
+    finally:
+        xvfb.terminate()
+        xvfb.wait()
+
+
+def measure(name, env, lines, idle):
+    """Run one driver process; returns its metrics or {"skipped": reason}"""
+    try:
+        result = subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), "--driver", name,
+             "--lines", str(lines), "--idle", str(idle)],
+            cwd=str(PROJECT_ROOT),
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=DRIVER_TIMEOUT + idle
+        )
+    except subprocess.TimeoutExpired:
+        return {"skipped": "timed out"}
+    
+    if result.returncode != 0:
+        return {"skipped": (result.stderr.strip().splitlines() or ["driver failed"])[-1]}
+    try:
+        return json.loads(result.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        return {"skipped": "no result"}
+
+
+def merge_runs(runs):
+    """Median of every numeric metric over several runs"""
+    merged = {}
+    for key, value in runs[0].items():
+        values = [run.get(key) for run in runs]
+        if isinstance(value, dict) and all(isinstance(v, dict) for v in values):
+            merged[key] = merge_runs(values)
+        elif all(isinstance(v, (int, float)) for v in values):
+            merged[key] = round(statistics.median(values), 2)
+        else:
+            merged[key] = value
+    return merged
+
+
+def benchmark(entries, runs, lines, idle):
+    import import_time
+    
+    home = tempfile.mkdtemp(prefix="steamdeck-bench-")
+    env = dict(os.environ, HOME=home)
+    results = {}
+    try:
+        with virtual_display(env) as env:
+            for name in entries:
+                samples = []
+                for _ in range(runs):
+                    # Every run starts cold: no snapshot, config or logs
+                    shutil.rmtree(home, ignore_errors=True)
+                    os.makedirs(home)
+                    sample = measure(name, env, lines, idle)
+                    if "skipped" in sample:
+                        samples = [sample]
+                        break
+                    samples.append(sample)
+                
+                result = merge_runs(samples) if "skipped" not in samples[0] else samples[0]
+                imports = import_time.measure(name)
+                imports.pop("slowest", None)
+                result["import"] = imports
+                results[name] = result
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+    return results
+
+
+def flatten(data, prefix=""):
+    """Numeric metrics as {"tk.tab_open_ms.Игры": value}"""
+    flat = {}
+    for key, value in data.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, path + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+
+def compare(old_path, new_path):
+    old = json.loads(Path(old_path).read_text(encoding="utf-8"))
+    new = json.loads(Path(new_path).read_text(encoding="utf-8"))
+    print(f"{old.get('version')} ({old.get('timestamp')}) -> "
+          f"{new.get('version')} ({new.get('timestamp')})")
+    
+    old_flat = flatten(old["results"])
+    new_flat = flatten(new["results"])
+    for key in sorted(set(old_flat) | set(new_flat)):
+        before, after = old_flat.get(key), new_flat.get(key)
+        if before is None or after is None:
+            print(f"  {key:45} {before!s:>10} -> {after!s:>10}")
+            continue
+        change = (after - before) / before * 100 if before else 0.0
+        better = (change > 0) == key.endswith(HIGHER_IS_BETTER)
+        mark = "" if abs(change) < 5 else ("better" if better else "WORSE")
+        print(f"  {key:45} {before:10.2f} -> {after:10.2f} {change:+7.1f}% {mark}")
+    return 0
+
+
+def print_results(results):
+    for name, result in results.items():
+        if "skipped" in result:
+            print(f"{name}: skipped ({result['skipped']})")
+            continue
+        print(f"{name}:")
+        for key, value in flatten(result).items():
+            print(f"    {key:40} {value}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS,
+                        help="fresh processes per GUI (median is reported)")
+    parser.add_argument("--lines", type=int, default=DEFAULT_LINES,
+                        help="lines written to the console")
+    parser.add_argument("--idle", type=float, default=DEFAULT_IDLE_S,
+                        help="seconds of idle measurement")
+    parser.add_argument("--output", type=Path,
+                        help="result file (default: benchmarks/results/<version>-<time>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"),
+                        help="compare two result files")
+    parser.add_argument("--driver", choices=ENTRIES, help=argparse.SUPPRESS)
+    parser.add_argument("entries", nargs="*", default=list(ENTRIES),
+                        help="GUIs to benchmark (default: all)")
+    args = parser.parse_args(argv)
+    
+    if args.driver:
+        return run_driver(args.driver, args.lines, args.idle)
+    if args.compare:
+        return compare(*args.compare)
+    
+    results = benchmark(args.entries, args.runs, args.lines, args.idle)
+    print_results(results)
+    
+    version = (PROJECT_ROOT / "VERSION").read_text(encoding="utf-8").strip()
+    timestamp = time.strftime("%Y%m%d-%H%M%S")
+    output = args.output or RESULTS_DIR / f"{version}-{timestamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "version": version,
+        "timestamp": timestamp,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "settings": {"runs": args.runs, "lines": args.lines, "idle_s": args.idle},
+        "results": results,
+    }
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    print(f"Results: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Startup import-time budget check for the GUI entry points
+Author: @ncux11
+
+Imports each entry module in a fresh interpreter with `-X importtime`
+and fails (exit code 1) when the median cumulative import time exceeds
+its budget. Entry points whose dependencies are missing are skipped.
+
+Usage:
+    python3 benchmarks/import_time.py [--runs N] [--budget tk=100] [--top 10]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# name -> (directory put on sys.path, module imported at startup)
+ENTRY_POINTS = {
+    "tk": (PROJECT_ROOT / "scripts", "steamdeck_gui"),
+    "qt": (PROJECT_ROOT / "gui", "main"),
+}
+
+# Median cumulative import time allowed for each entry point (ms)
+BUDGETS_MS = {
+    "tk": 100,
+    "qt": 300,
+}
+
+DEFAULT_RUNS = 5
+
+
+def parse_importtime(stderr):
+    """Parse `-X importtime` output into (module, self_us, cumulative_us, depth) rows"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        except ValueError:
+            continue
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def import_once(directory, module):
+    """Import a module in a fresh interpreter
+    
+    Returns:
+        (rows, None) on success or (None, [error line]) if the import failed
+    """
+    env = dict(os.environ, PYTHONPATH=str(directory))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(directory),
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        return None, result.stderr.strip().splitlines()[-1:] or ["import failed"]
+    return parse_importtime(result.stderr), None
+
+
+def measure(name, runs=DEFAULT_RUNS):
+    """
+    Measure the startup imports of an entry point
+    
+    Returns:
+        dict with median/min cumulative time (ms) and the slowest imports,
+        or {"skipped": reason} if the entry module cannot be imported here
+    """
+    directory, module = ENTRY_POINTS[name]
+    totals = []
+    slowest = {}
+    for _ in range(runs):
+        rows, error = import_once(directory, module)
+        if rows is None:
+            return {"skipped": error[0]}
+        for row_name, self_us, cumulative_us, depth in rows:
+            if row_name == module and depth == 0:
+                totals.append(cumulative_us / 1000)
+            slowest[row_name] = min(slowest.get(row_name, self_us), self_us)
+    
+    return {
+        "module": module,
+        "runs": runs,
+        "median_ms": round(statistics.median(totals), 2),
+        "min_ms": round(min(totals), 2),
+        "slowest": sorted(slowest.items(), key=lambda item: item[1], reverse=True),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS,
+                        help="fresh interpreters per entry point")
+    parser.add_argument("--budget", action="append", default=[], metavar="NAME=MS",
+                        help="override a budget, e.g. tk=80")
+    parser.add_argument("--top", type=int, default=10,
+                        help="number of slowest imports (self time) to print")
+    parser.add_argument("entries", nargs="*", default=list(ENTRY_POINTS),
+                        help="entry points to check (default: all)")
+    args = parser.parse_args(argv)
+    
+    budgets = dict(BUDGETS_MS)
+    for override in args.budget:
+        name, _, value = override.partition("=")
+        budgets[name] = float(value)
+    
+    failed = False
+    for name in args.entries:
+        result = measure(name, args.runs)
+        if "skipped" in result:
+            print(f"{name}: skipped ({result['skipped']})")
+            continue
+        
+        budget = budgets[name]
+        over = result["median_ms"] > budget
+        failed |= over
+        status = "OVER BUDGET" if over else "ok"
+        print(f"{name}: import {result['module']} median {result['median_ms']:.1f} ms "
+              f"(min {result['min_ms']:.1f} ms, budget {budget:.0f} ms) - {status}")
+        for module, self_us in result["slowest"][:args.top]:
+            print(f"    {self_us / 1000:7.2f} ms  {module}")
+    
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
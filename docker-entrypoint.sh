@@ -95,12 +95,27 @@ run_tests() {
     print_success "Тесты завершены"
 }
 
+# Функция для замеров производительности GUI (без дисплея: Xvfb и offscreen Qt)
+run_benchmarks() {
+    print_message "Замеры производительности GUI..."
+    
+    cd /home/deck/SteamDeck
+    
+    # Результаты сохраняются в benchmarks/results/<версия>-<время>.json
+    if python3 benchmarks/gui_bench.py; then
+        print_success "Замеры завершены"
+    else
+        print_error "Замеры не выполнены"
+    fi
+}
+
 # Функция для интерактивного режима
 interactive_mode() {
     print_message "Запуск интерактивного режима..."
     print_message "Доступные команды:"
     echo "  test     - Запустить тесты"
     echo "  gui      - Запустить GUI"
+    echo "  bench    - Замеры производительности GUI"
     echo "  setup    - Запустить setup"
     echo "  shell    - Открыть shell"
     echo "  exit     - Выход"
@@ -116,6 +131,9 @@ interactive_mode() {
                 print_message "Запуск GUI..."
                 python3 scripts/steamdeck_gui.py
                 ;;
+            bench)
+                run_benchmarks
+                ;;
             setup)
                 print_message "Запуск setup..."
                 ./scripts/steamdeck_setup.sh
@@ -153,6 +171,9 @@ main() {
             print_message "Запуск GUI..."
             python3 scripts/steamdeck_gui.py
             ;;
+        bench)
+            run_benchmarks
+            ;;
         setup)
             print_message "Запуск setup..."
             ./scripts/steamdeck_setup.sh
@@ -166,7 +187,7 @@ main() {
             ;;
         *)
             print_error "Неизвестная команда: $1"
-            print_message "Использование: $0 [test|gui|setup|shell|interactive]"
+            print_message "Использование: $0 [test|gui|bench|setup|shell|interactive]"
             exit 1
             ;;
     esac
@@ -2,23 +2,42 @@
 """
 Configuration module for Steam Deck Enhancement Pack GUI
 Author: @ncux11
-Version: 1.0
+Version: 1.1
 """
 
-import os
+import atexit
 import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
+# Seconds between the last change and the background save
+SAVE_DELAY = 0.5
+
+_MISSING = object()
+
+
 class Config:
-    """Configuration manager for the GUI"""
+    """Configuration manager for the GUI
     
-    def __init__(self):
+    The file is read on first access, not at import. Changes are saved in
+    the background after SAVE_DELAY of quiet (one write for a burst of
+    changes) by writing a temporary file and renaming it over the config.
+    Inside `with config.batch():` changes are collected and listeners are
+    notified once when the outermost batch ends.
+    
+    Listeners are called with the set of changed keys on the thread that
+    made the change (the watch thread for external edits), so Qt code
+    should forward them to the GUI thread with a queued signal.
+    """
+    
+    def __init__(self, save_delay=SAVE_DELAY):
         self.project_root = Path(__file__).parent.parent.parent
         self.config_dir = Path.home() / ".steamdeck_gui"
         self.config_file = self.config_dir / "config.json"
-        
-        # Создаем директорию конфига если не существует
-        self.config_dir.mkdir(exist_ok=True)
+        self.save_delay = save_delay
         
         # Значения по умолчанию
         self.defaults = {
@@ -28,51 +47,227 @@ class Config:
             "install_dir": str(Path.home() / "utils" / "SteamDeck"),
             "games_dir": str(Path.home() / "Games"),
             "language": "ru",
+            "system_refresh_interval": 0,  # seconds, 0 = no periodic refresh
         }
         
-        # Загружаем конфиг
-        self.config = self.load_config()
+        self._lock = threading.RLock()
+        self._config = None
+        self._file_mtime = None
+        self._listeners = []
+        self._batch_depth = 0
+        self._batch_changed = set()
+        self._save_timer = None
+        self._flush_at_exit = False
+        self._watcher = None
+    
+    @property
+    def config(self):
+        """Current values (the file is loaded on first access)"""
+        with self._lock:
+            if self._config is None:
+                self._config = self.load_config()
+            return self._config
     
     def load_config(self):
-        """Load configuration from file"""
-        if self.config_file.exists():
+        """Load configuration from file (defaults if it is missing or broken)"""
+        try:
+            config, self._file_mtime = self._read_file()
+            return config
+        except FileNotFoundError:
+            return self.defaults.copy()
+        except Exception as e:
+            print(f"Error loading config: {e}")
+            return self.defaults.copy()
+    
+    def _read_file(self):
+        """Values merged with the defaults and the mtime of the file read"""
+        with open(self.config_file, 'r', encoding='utf-8') as f:
+            mtime = os.fstat(f.fileno()).st_mtime_ns
+            config = json.load(f)
+        if not isinstance(config, dict):
+            raise ValueError("config root is not an object")
+        # Объединяем с defaults для новых ключей
+        return {**self.defaults, **config}, mtime
+    
+    def save_config(self):
+        """Save configuration to file now (atomic replace)"""
+        import tempfile
+        
+        with self._lock:
+            self._cancel_save()
+            data = json.dumps(self.config, indent=2, ensure_ascii=False)
             try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                # Объединяем с defaults для новых ключей
-                return {**self.defaults, **config}
+                self.config_dir.mkdir(parents=True, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=str(self.config_dir), prefix=".config-")
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        f.write(data)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, self.config_file)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+                # Своя запись не считается внешним изменением
+                self._file_mtime = self.config_file.stat().st_mtime_ns
+                return True
             except Exception as e:
-                print(f"Error loading config: {e}")
-                return self.defaults.copy()
-        return self.defaults.copy()
+                print(f"Error saving config: {e}")
+                return False
     
-    def save_config(self):
-        """Save configuration to file"""
-        try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
-            return True
-        except Exception as e:
-            print(f"Error saving config: {e}")
-            return False
+    def flush(self):
+        """Write a pending background save immediately"""
+        with self._lock:
+            if self._save_timer is not None:
+                self.save_config()
     
     def get(self, key, default=None):
         """Get configuration value"""
-        return self.config.get(key, default)
+        with self._lock:
+            return self.config.get(key, default)
     
     def set(self, key, value):
-        """Set configuration value"""
-        self.config[key] = value
-        return self.save_config()
+        """Set configuration value (saved in the background)"""
+        self.update({key: value})
+        return True
+    
+    def update(self, values):
+        """Set several values with one save and one notification"""
+        with self._lock:
+            config = self.config
+            changed = {key for key, value in values.items()
+                       if config.get(key, _MISSING) != value}
+            for key in changed:
+                config[key] = values[key]
+            if not changed:
+                return
+            self._schedule_save()
+            if self._batch_depth:
+                self._batch_changed |= changed
+                return
+        self._notify(changed)
+    
+    @contextmanager
+    def batch(self):
+        """Group changes: listeners are notified once when the batch ends"""
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                changed = set()
+                if not self._batch_depth:
+                    changed, self._batch_changed = self._batch_changed, set()
+            if changed:
+                self._notify(changed)
+    
+    def add_listener(self, callback):
+        """Call callback(changed_keys) after keys change"""
+        with self._lock:
+            self._listeners.append(callback)
+    
+    def remove_listener(self, callback):
+        """Stop notifying callback"""
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+    
+    def reload(self):
+        """Re-read the file if it was changed by someone else
+        
+        Returns:
+            Set of keys whose values changed
+        """
+        with self._lock:
+            try:
+                mtime = self.config_file.stat().st_mtime_ns
+            except OSError:
+                return set()
+            # Несохранённые изменения всё равно перезапишут файл
+            if mtime == self._file_mtime or self._save_timer is not None:
+                return set()
+            
+            old = self.config
+            try:
+                new, self._file_mtime = self._read_file()
+            except (OSError, ValueError):
+                # Файл мог быть записан не до конца (редактор ещё сохраняет):
+                # текущие значения остаются, прочитаем при следующем изменении
+                return set()
+            changed = {key for key in old.keys() | new.keys()
+                       if old.get(key, _MISSING) != new.get(key, _MISSING)}
+            self._config = new
+            if self._batch_depth:
+                self._batch_changed |= changed
+                return changed
+        if changed:
+            self._notify(changed)
+        return changed
+    
+    def watch(self):
+        """Reload the file when it is written or replaced on disk
+        
+        The watch thread sleeps in inotify (steamdeck_gamewatch.ChangeListener)
+        until the config file is closed after writing or renamed into place.
+        
+        Returns:
+            False if inotify is not available
+        """
+        with self._lock:
+            if self._watcher is not None:
+                return True
+            scripts_dir = str(self.project_root / "scripts")
+            if scripts_dir not in sys.path:
+                sys.path.insert(0, scripts_dir)
+            from steamdeck_gamewatch import ChangeListener
+            
+            watcher = ChangeListener(self.reload, stamp=self.config_file)
+            if not watcher.start():
+                return False
+            self._watcher = watcher
+            return True
+    
+    def unwatch(self):
+        """Stop watching the config file"""
+        with self._lock:
+            watcher, self._watcher = self._watcher, None
+        if watcher is not None:
+            watcher.stop()
+    
+    def _schedule_save(self):
+        # Каждое изменение откладывает запись: серия изменений - одна запись
+        self._cancel_save()
+        if not self._flush_at_exit:
+            # Отложенная запись не должна теряться при выходе
+            atexit.register(self.flush)
+            self._flush_at_exit = True
+        self._save_timer = threading.Timer(self.save_delay, self.flush)
+        self._save_timer.daemon = True
+        self._save_timer.start()
+    
+    def _cancel_save(self):
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+    
+    def _notify(self, changed):
+        with self._lock:
+            listeners = list(self._listeners)
+        for callback in listeners:
+            try:
+                callback(set(changed))
+            except Exception as e:
+                print(f"Config listener error: {e}")
     
     def __getitem__(self, key):
         """Allow config['key'] syntax"""
-        return self.config.get(key)
+        return self.get(key)
     
     def __setitem__(self, key, value):
         """Allow config['key'] = value syntax"""
-        self.config[key] = value
-        self.save_config()
+        self.set(key, value)
 
-# Глобальный экземпляр конфига
+# Глобальный экземпляр конфига (файл читается при первом обращении)
 config = Config()
@@ -7,27 +7,36 @@ Version: 1.0
 """
 
 import sys
+import time
 from pathlib import Path
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtWidgets import QApplication, QMainWindow, QTabWidget, QMessageBox
 
-# Import views
+# Start time, used if the process age is not available from /proc
+STARTED_AT = time.perf_counter()
+
+# Views are imported when their tab is first shown
 sys.path.insert(0, str(Path(__file__).parent))
-from views.system_view import SystemView
-from views.games_view import GamesView
-from views.update_view import UpdateView
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from widgets.lazy_tab import LazyTab, view_factory
 from core.theme import Theme
 
 # Import core modules
 from core.config import config
+import steamdeck_probe
 
 
 class MainWindow(QMainWindow):
     """Main application window"""
     
+    # Config listeners run on the writer's thread; delivered here queued
+    config_changed = pyqtSignal(object)  # set of changed keys
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Steam Deck Enhancement Pack v1.0 - ALPHA")
         self.setMinimumSize(1024, 768)
+        self._first_paint_reported = False
         
         # Create theme
         self.theme = Theme(config.get("theme", "dark"))
@@ -38,6 +47,12 @@ class MainWindow(QMainWindow):
         # Apply theme
         self.theme.apply_to_app(QApplication.instance())
         
+        # Pick up config changes, including edits of the file by hand
+        self.config_changed.connect(self._on_config_changed, Qt.ConnectionType.QueuedConnection)
+        self._config_listener = self.config_changed.emit
+        config.add_listener(self._config_listener)
+        config.watch()
+        
         # Auto-check updates if enabled
         if config.get("auto_check_updates", True):
             self._check_updates_on_startup()
@@ -48,14 +63,36 @@ class MainWindow(QMainWindow):
         self.tabs = QTabWidget()
         self.tabs.setTabPosition(QTabWidget.TabPosition.North)
         
-        # Add tabs
-        self.tabs.addTab(SystemView(), "💻 Система")
-        self.tabs.addTab(GamesView(), "🎮 Игры")
-        self.tabs.addTab(UpdateView(), "⬆️ Обновления")
+        # Add tabs (views are built the first time their tab is shown)
+        self.tabs.addTab(LazyTab(view_factory("views.system_view", "SystemView")), "💻 Система")
+        self.tabs.addTab(LazyTab(view_factory("views.games_view", "GamesView")), "🎮 Игры")
+        self.tabs.addTab(LazyTab(view_factory("views.update_view", "UpdateView")), "⬆️ Обновления")
         
         # Set central widget
         self.setCentralWidget(self.tabs)
     
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._first_paint_reported:
+            self._first_paint_reported = True
+            self._report_first_paint()
+    
+    def _report_first_paint(self):
+        """Report time from process start to the first paint of the window
+        
+        Startup time matters when the GUI is launched from Steam Gaming Mode.
+        """
+        elapsed = steamdeck_probe.process_age()
+        if elapsed is None:
+            elapsed = time.perf_counter() - STARTED_AT
+        print(f"⏱ Время до первой отрисовки: {elapsed:.2f} с")
+    
+    def _on_config_changed(self, keys):
+        """Apply changed settings"""
+        if "theme" in keys:
+            self.theme = Theme(config.get("theme", "dark"))
+            self.theme.apply_to_app(QApplication.instance())
+    
     def _check_updates_on_startup(self):
         """Check for updates on startup (non-blocking)"""
         # This will be implemented later with proper async
@@ -71,6 +108,17 @@ class MainWindow(QMainWindow):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
+            # Stop running scripts together with their child processes
+            # (the engine and workers exist only if an opened view used them)
+            engine = sys.modules.get("utils.process_engine")
+            if engine is not None:
+                engine.get_engine().shutdown()
+            workers = sys.modules.get("steamdeck_worker")
+            if workers is not None:
+                workers.close_workers()
+            config.remove_listener(self._config_listener)
+            config.unwatch()
+            config.flush()
             event.accept()
         else:
             event.ignore()
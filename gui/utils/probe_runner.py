@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Probe Runner utility for Steam Deck Enhancement Pack GUI
+Author: @ncux11
+Version: 1.0
+"""
+
+import sys
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+from PyQt6.QtCore import QObject, QTimer, Qt, pyqtSignal
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+from steamdeck_scheduler import get_scheduler, PRIORITY_HIGH
+
+# Seconds a probe may take before its card shows a timeout
+DEFAULT_PROBE_TIMEOUT = 5.0
+
+
+class ProbeRunner(QObject):
+    """Runs named status probes concurrently on the shared job pool
+    
+    A probe is a plain function returning a (value, status) tuple. Each run
+    of run_all() starts every probe that is not already in flight; results
+    are emitted through probe_finished on the GUI thread as each one
+    finishes. A probe that does not answer within its timeout is reported
+    as timed out until its result arrives.
+    
+    With a snapshot cache, show_cached() emits the last stored results right
+    away and run_all(stale_only=True) only re-runs probes whose TTL expired
+    (stale-while-revalidate); a cached value is kept if the refresh times out.
+    """
+    
+    probe_started = pyqtSignal(str)             # name
+    probe_finished = pyqtSignal(str, str, str)  # name, value, status
+    
+    _result = pyqtSignal(str, int, str, str)    # name, run, value, status
+    
+    def __init__(self, parent=None, cache=None, cache_prefix=""):
+        """
+        Args:
+            cache: Optional SnapshotCache storing the last result of each probe
+            cache_prefix: Prefix of the snapshot fields ("<prefix>.<name>")
+        """
+        super().__init__(parent)
+        self.cache = cache
+        self.cache_prefix = cache_prefix
+        self._probes: Dict[str, Tuple[Callable, float]] = {}
+        self._pending: Dict[str, int] = {}
+        self._runs = 0
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.timeout.connect(self.run_all)
+        self._result.connect(self._on_result, Qt.ConnectionType.QueuedConnection)
+    
+    def add_probe(self, name: str, func: Callable, timeout: float = DEFAULT_PROBE_TIMEOUT):
+        """Register a probe returning (value, status)"""
+        self._probes[name] = (func, timeout)
+    
+    @property
+    def pending(self):
+        """Names of probes that are still running"""
+        return set(self._pending)
+    
+    def show_cached(self):
+        """Emit the stored result of every probe that has one"""
+        for name in self._probes:
+            entry = self._cached(name)
+            if entry is not None:
+                value, status = entry.value
+                self.probe_finished.emit(name, value, status)
+    
+    def run_all(self, stale_only=False):
+        """Start every registered probe that is not still running
+        
+        Args:
+            stale_only: Skip probes whose cached result is still fresh
+        """
+        for name in self._probes:
+            if name in self._pending:
+                continue
+            if stale_only and self.cache is not None and self.cache.is_fresh(self._field(name)):
+                continue
+            self._start(name)
+    
+    def start_refresh(self, interval_ms: int):
+        """Re-run the probes periodically"""
+        self._refresh_timer.start(interval_ms)
+    
+    def stop_refresh(self):
+        """Stop periodic refresh"""
+        self._refresh_timer.stop()
+    
+    def _start(self, name: str):
+        func, timeout = self._probes[name]
+        self._runs += 1
+        run = self._runs
+        self._pending[name] = run
+        
+        def _probe():
+            try:
+                value, status = func()
+            except Exception as e:
+                value, status = f"Ошибка: {e}", "error"
+            value = str(value)
+            # The snapshot is written to disk here, off the GUI thread
+            if self.cache is not None:
+                self.cache.set(self._field(name), [value, status])
+            self._result.emit(name, run, value, status)
+        
+        self.probe_started.emit(name)
+        get_scheduler().submit(_probe, name=f"probe {name}", priority=PRIORITY_HIGH)
+        QTimer.singleShot(int(timeout * 1000), lambda: self._on_timeout(name, run))
+    
+    def _on_result(self, name, run, value, status):
+        if self._pending.get(name) != run:
+            return
+        del self._pending[name]
+        self.probe_finished.emit(name, value, status)
+    
+    def _on_timeout(self, name, run):
+        # The probe stays pending, so a hung probe is not started again and
+        # a late result still replaces the timeout on its card
+        if self._pending.get(name) == run and self._cached(name) is None:
+            self.probe_finished.emit(name, "Нет ответа", "warning")
+    
+    def _field(self, name):
+        return f"{self.cache_prefix}.{name}" if self.cache_prefix else name
+    
+    def _cached(self, name):
+        if self.cache is None:
+            return None
+        entry = self.cache.get(self._field(name))
+        if entry is None or not isinstance(entry.value, list) or len(entry.value) != 2:
+            return None
+        return entry
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Process Engine for Steam Deck Enhancement Pack GUI
+Runs many scripts on a single asyncio event-loop thread
+Author: @ncux11
+Version: 1.0
+"""
+
+import asyncio
+import itertools
+import os
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Admission policy is shared with the job scheduler
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+from steamdeck_scheduler import (
+    Job, JobQueue, DEFAULT_MAX_WORKERS, PRIORITY_NORMAL,
+    JOB_DONE, JOB_FAILED, JOB_CANCELLED
+)
+from steamdeck_progress import PROGRESS_FD_ENV, parse_progress_line
+
+# Extra terminal state for processes killed by their timeout
+JOB_TIMED_OUT = "timed_out"
+
+# Seconds between SIGTERM and SIGKILL when stopping a process group
+KILL_GRACE = 3.0
+
+# Lines of output kept per job for the final result
+OUTPUT_TAIL_LINES = 10000
+
+# Max length of a single output line read from a pipe
+LINE_LIMIT = 1024 * 1024
+
+# Error raised by submit() after shutdown()
+ENGINE_STOPPED = "Process engine is stopped"
+
+# Per-job callbacks; a deduplicated submit adds its own to the existing job
+CALLBACKS = ("on_started", "on_output", "on_progress", "on_finished")
+
+
+class ProcessJob(Job):
+    """A subprocess scheduled on the engine"""
+    
+    _ids = itertools.count(1)
+    
+    def __init__(self, cmd: List[str], name: str = "", cwd: Optional[str] = None,
+                 env: Optional[Dict[str, str]] = None, timeout: Optional[float] = None,
+                 priority: int = PRIORITY_NORMAL, resource: Optional[str] = None,
+                 key: Optional[str] = None, on_started: Optional[Callable] = None,
+                 on_output: Optional[Callable] = None,
+                 on_progress: Optional[Callable] = None,
+                 on_finished: Optional[Callable] = None):
+        super().__init__(None, name=name or " ".join(cmd), priority=priority,
+                         resource=resource, key=key)
+        self.id = str(next(self._ids))
+        self.cmd = list(cmd)
+        self.cwd = cwd
+        self.env = env
+        self.timeout = timeout
+        self.on_started = on_started
+        self.on_output = on_output
+        self.on_progress = on_progress
+        self.on_finished = on_finished
+        self.pid: Optional[int] = None
+        self.returncode: Optional[int] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.output = deque(maxlen=OUTPUT_TAIL_LINES)
+        self.progress = None
+        self._task: Optional[asyncio.Task] = None
+    
+    @property
+    def success(self) -> bool:
+        """The process exited with code 0"""
+        return self.state == JOB_DONE
+    
+    @property
+    def duration(self) -> Optional[float]:
+        """Run time in seconds (None if not started)"""
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.monotonic()) - self.started_at
+    
+    def output_text(self) -> str:
+        """Collected output as a single string"""
+        return "\n".join(self.output)
+
+
+class ProcessEngine:
+    """asyncio subprocess engine running on one background thread"""
+    
+    def __init__(self, max_running: int = DEFAULT_MAX_WORKERS,
+                 limits: Optional[Dict[str, int]] = None):
+        self._queue = JobQueue(limits, max_running=max_running)
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, ProcessJob] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._closing = False
+    
+    # ------------------------------------------------------------------
+    # Public API (thread-safe)
+    # ------------------------------------------------------------------
+    
+    def submit(self, cmd: List[str], **kwargs) -> ProcessJob:
+        """
+        Queue a command
+        
+        Keyword arguments are passed to ProcessJob. If a job with the same
+        key is already queued or running, that job is returned instead and
+        this call's callbacks are attached to it.
+        
+        Raises:
+            RuntimeError: the engine has been shut down
+        """
+        self._ensure_loop()
+        job = ProcessJob(cmd, **kwargs)
+        with self._lock:
+            # The loop is stopped: a queued job would never run or finish
+            if self._closing:
+                raise RuntimeError(ENGINE_STOPPED)
+            if job.key is not None:
+                existing = self._queue.find(job.key)
+                if existing is not None:
+                    self._loop.call_soon_threadsafe(self._attach, existing, job)
+                    return existing
+            self._queue.push(job)
+            self._jobs[job.id] = job
+        self._loop.call_soon_threadsafe(self._pump)
+        return job
+    
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued job or kill the process group of a running one"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return False
+            if self._queue.remove(job):
+                del self._jobs[job.id]
+                queued = True
+            else:
+                queued = False
+        
+        if queued:
+            self._notify_finished(job, JOB_CANCELLED)
+            return True
+        
+        self._loop.call_soon_threadsafe(self._cancel_task, job)
+        return True
+    
+    def get(self, job_id: str) -> Optional[ProcessJob]:
+        """Look up an active (queued or running) job"""
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    def jobs(self) -> List[ProcessJob]:
+        """All active jobs"""
+        with self._lock:
+            return list(self._jobs.values())
+    
+    def shutdown(self):
+        """Kill all running processes and stop the loop thread
+        
+        Queued jobs are dropped; running tasks are cancelled and awaited on
+        the loop, so their process groups are killed before the loop stops.
+        """
+        if self._loop is None:
+            return
+        with self._lock:
+            # Nothing new starts while the running jobs are being killed
+            self._closing = True
+            queued = [job for job in self._jobs.values() if self._queue.remove(job)]
+            for job in queued:
+                del self._jobs[job.id]
+        for job in queued:
+            self._notify_finished(job, JOB_CANCELLED)
+        
+        future = asyncio.run_coroutine_threadsafe(self._cancel_all(), self._loop)
+        try:
+            # SIGTERM, then SIGKILL after the grace period
+            future.result(timeout=2 * KILL_GRACE + 1)
+        except Exception as e:
+            print(f"Process engine shutdown error: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=1)
+    
+    # ------------------------------------------------------------------
+    # Loop thread
+    # ------------------------------------------------------------------
+    
+    def _ensure_loop(self):
+        """Start the event-loop thread on first use"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run_loop,
+                name="steamdeck-process-engine",
+                daemon=True
+            )
+            self._thread.start()
+        self._ready.wait()
+    
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._ready.set()
+        self._loop.run_forever()
+    
+    def _pump(self):
+        """Start every queued job that fits the admission limits"""
+        while True:
+            with self._lock:
+                job = None if self._closing else self._queue.pop_runnable()
+            if job is None:
+                return
+            job._task = self._loop.create_task(self._run(job))
+    
+    def _cancel_task(self, job: ProcessJob):
+        if job._task is not None and not job._task.done():
+            job._task.cancel()
+    
+    async def _cancel_all(self):
+        """Cancel every running task and wait until its processes are killed"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        tasks = [job._task for job in jobs if job._task is not None and not job._task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def _attach(self, existing: ProcessJob, job: ProcessJob):
+        """Add the callbacks of a deduplicated submit to the existing job"""
+        if existing.done():
+            self._call(job.on_finished, existing)
+            return
+        if existing.pid is not None:
+            self._call(job.on_started, existing)
+        for name in CALLBACKS:
+            added = getattr(job, name)
+            if added is not None:
+                setattr(existing, name, self._chain(getattr(existing, name), added))
+    
+    @staticmethod
+    def _chain(first: Optional[Callable], second: Callable) -> Callable:
+        if first is None:
+            return second
+        
+        def both(*args):
+            ProcessEngine._call(first, *args)
+            ProcessEngine._call(second, *args)
+        
+        return both
+    
+    async def _run(self, job: ProcessJob):
+        """Run one process and stream its output"""
+        state = JOB_FAILED
+        process = None
+        progress = None
+        job.started_at = time.monotonic()
+        try:
+            env = job.env
+            pass_fds = ()
+            if job.on_progress is not None:
+                # Dedicated pipe for structured progress events
+                read_fd, write_fd = os.pipe()
+                progress = os.fdopen(read_fd, "rb", buffering=0)
+                env = dict(env or os.environ)
+                env[PROGRESS_FD_ENV] = str(write_fd)
+                pass_fds = (write_fd,)
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *job.cmd,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.STDOUT,
+                    cwd=job.cwd,
+                    env=env,
+                    pass_fds=pass_fds,
+                    limit=LINE_LIMIT,
+                    # Own process group, so cancellation reaches child processes
+                    start_new_session=True
+                )
+            finally:
+                # Only the child keeps the write end, so the pipe sees EOF on exit
+                for fd in pass_fds:
+                    os.close(fd)
+            job.pid = process.pid
+            self._call(job.on_started, job)
+            
+            await asyncio.wait_for(self._communicate(job, process, progress), job.timeout)
+            state = JOB_DONE if job.returncode == 0 else JOB_FAILED
+        
+        except asyncio.TimeoutError:
+            job.output.append(f"Timeout after {job.timeout} s")
+            await self._kill(process)
+            state = JOB_TIMED_OUT
+        except asyncio.CancelledError:
+            await self._kill(process)
+            state = JOB_CANCELLED
+        except Exception as e:
+            job.error = e
+            job.output.append(f"Error running script: {e}")
+            await self._kill(process)
+            state = JOB_FAILED
+        finally:
+            if progress is not None:
+                progress.close()
+            if process is not None and process.returncode is not None:
+                job.returncode = process.returncode
+            with self._lock:
+                self._queue.release(job)
+                self._jobs.pop(job.id, None)
+            self._notify_finished(job, state)
+            self._pump()
+    
+    async def _communicate(self, job: ProcessJob, process, progress=None):
+        """Read output lines (and progress events) until EOF, then wait for exit"""
+        readers = [self._read_output(job, process.stdout)]
+        if progress is not None:
+            readers.append(self._read_progress(job, progress))
+        await asyncio.gather(*readers)
+        job.returncode = await process.wait()
+    
+    async def _read_output(self, job: ProcessJob, stream: asyncio.StreamReader):
+        while True:
+            line = await stream.readline()
+            if not line:
+                break
+            text = line.decode("utf-8", errors="replace").rstrip("\r\n")
+            job.output.append(text)
+            self._call(job.on_output, job, text)
+    
+    async def _read_progress(self, job: ProcessJob, pipe):
+        """Parse progress events written to the STEAMDECK_PROGRESS_FD pipe"""
+        reader = asyncio.StreamReader(limit=LINE_LIMIT)
+        transport, _ = await self._loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), pipe
+        )
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                event = parse_progress_line(line.decode("utf-8", errors="replace"))
+                if event is not None:
+                    job.progress = event
+                    self._call(job.on_progress, job, event)
+        finally:
+            transport.close()
+    
+    async def _kill(self, process):
+        """Terminate a whole process group: SIGTERM, then SIGKILL"""
+        if process is None or process.returncode is not None:
+            return
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            try:
+                os.killpg(process.pid, sig)
+            except ProcessLookupError:
+                return
+            try:
+                await asyncio.wait_for(process.wait(), KILL_GRACE)
+                return
+            except asyncio.TimeoutError:
+                continue
+    
+    def _notify_finished(self, job: ProcessJob, state: str):
+        job.finished_at = time.monotonic()
+        job.result = (state == JOB_DONE, job.output_text())
+        job.finish(state)
+        self._call(job.on_finished, job)
+    
+    @staticmethod
+    def _call(callback: Optional[Callable], *args):
+        """Invoke a user callback without letting it break the loop"""
+        if callback is None:
+            return
+        try:
+            callback(*args)
+        except Exception as e:
+            print(f"Process engine callback error: {e}")
+
+
+_engine: Optional[ProcessEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> ProcessEngine:
+    """Shared engine instance for the GUI process"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = ProcessEngine()
+        return _engine
@@ -5,92 +5,255 @@ Author: @ncux11
 Version: 1.0
 """
 
-import subprocess
+import itertools
+import sys
 import threading
+from collections import deque
 from pathlib import Path
 from typing import Callable, Optional, List
 
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
 
-class ScriptRunner:
-    """Utility for running bash scripts with progress tracking"""
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+from utils.process_engine import get_engine, ProcessJob, JOB_CANCELLED, ENGINE_STOPPED
+from steamdeck_scheduler import get_scheduler, PRIORITY_NORMAL, RESOURCE_NETWORK, JOB_RUNNING
+from steamdeck_progress import ProgressTracker
+from steamdeck_worker import get_worker, WorkerError
+
+# Seconds before "steamdeck_update.sh check" is killed
+UPDATE_CHECK_TIMEOUT = 120
+
+
+class ScriptRunner(QObject):
+    """Utility for running bash scripts with progress tracking
+    
+    Scripts run on the shared asyncio process engine. Results are delivered
+    both to the optional plain callbacks (called on the engine thread) and
+    through Qt signals, which reach widgets on the GUI thread.
+    
+    Signals from the engine thread are buffered and handed over by a single
+    queued wake-up per burst; progress updates that arrive before the GUI
+    thread gets to them are merged into the latest one.
+    """
+    
+    job_started = pyqtSignal(str)               # job_id
+    job_output = pyqtSignal(str, str)           # job_id, line
+    job_progress = pyqtSignal(str, float, str)  # job_id, fraction (-1 if unknown), label
+    job_finished = pyqtSignal(str, bool, str)   # job_id, success, output
+    call_finished = pyqtSignal(str, bool, str)  # call_id, success, output
+    
+    _wake = pyqtSignal()
     
-    def __init__(self):
+    def __init__(self, engine=None, parent=None):
+        super().__init__(parent)
+        self.engine = engine or get_engine()
         self.processes = {}
-        self.running = False
+        self._lock = threading.Lock()
+        self._pending = deque()
+        self._latest_progress = {}
+        self._woken = False
+        self._call_ids = itertools.count(1)
+        self._wake.connect(self._deliver, Qt.ConnectionType.QueuedConnection)
+    
+    @property
+    def running(self) -> bool:
+        """At least one script started by this runner is running"""
+        with self._lock:
+            return any(job.state == JOB_RUNNING for job in self.processes.values())
+    
+    def job_state(self, job_id: str) -> Optional[str]:
+        """State of an active job (None once it has finished)"""
+        with self._lock:
+            job = self.processes.get(job_id)
+        return job.state if job else None
+    
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued job or kill a running script with its children"""
+        return self.engine.cancel(job_id)
     
     def run_script(
         self,
         script_path: str,
         args: List[str] = None,
         callback: Optional[Callable] = None,
-        output_callback: Optional[Callable] = None
+        output_callback: Optional[Callable] = None,
+        timeout: Optional[float] = None
     ):
-        """Run a bash script and return output"""
+        """Run a bash script and wait for its output"""
+        job = self.run_script_async(
+            script_path, args, callback, output_callback, timeout=timeout
+        )
+        if job is None:
+            if Path(script_path).exists():
+                return False, ENGINE_STOPPED
+            return False, f"Script not found: {script_path}"
+        
+        job.wait()
+        return job.result
+    
+    def run_script_async(
+        self,
+        script_path: str,
+        args: List[str] = None,
+        callback: Optional[Callable] = None,
+        output_callback: Optional[Callable] = None,
+        priority: int = PRIORITY_NORMAL,
+        resource: Optional[str] = None,
+        key: Optional[str] = None,
+        timeout: Optional[float] = None,
+        cwd: Optional[str] = None
+    ) -> Optional[ProcessJob]:
+        """Queue a bash script on the process engine and return its job"""
         if not Path(script_path).exists():
             if callback:
                 callback(False, f"Script not found: {script_path}")
-            return False, f"Script not found: {script_path}"
+            return None
         
         if args is None:
             args = []
         
-        self.running = True
+        def _started(job):
+            self._post(self.job_started, job.id)
         
-        try:
-            # Run script and capture output
-            process = subprocess.Popen(
-                ["bash", script_path] + args,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
+        def _output(job, line):
+            if output_callback:
+                output_callback(line)
+            self._post(self.job_output, job.id, line)
+        
+        tracker = ProgressTracker()
+        
+        def _progress(job, event):
+            tracker.update(event)
+            fraction = tracker.fraction
+            self._post_progress(
+                job.id, -1.0 if fraction is None else fraction, tracker.label()
             )
-            
-            # Read output line by line
-            output_lines = []
-            for line in process.stdout:
-                line = line.rstrip()
-                output_lines.append(line)
-                
-                # Call output callback if provided
-                if output_callback:
-                    output_callback(line)
-            
-            # Wait for process to complete
-            return_code = process.wait()
-            
-            # Call completion callback if provided
-            success = return_code == 0
-            output = "\n".join(output_lines)
-            
+        
+        def _finished(job):
+            with self._lock:
+                self.processes.pop(job.id, None)
+            success, output = job.result
+            if job.state == JOB_CANCELLED:
+                output = output + "\nCancelled" if output else "Cancelled"
             if callback:
                 callback(success, output)
-            
-            return success, output
-            
-        except Exception as e:
-            error_msg = f"Error running script: {str(e)}"
+            self._post(self.job_finished, job.id, success, output)
+        
+        try:
+            job = self.engine.submit(
+                ["bash", str(script_path)] + list(args),
+                name=" ".join([Path(script_path).name] + list(args)),
+                cwd=cwd,
+                timeout=timeout,
+                priority=priority,
+                resource=resource,
+                key=key,
+                on_started=_started,
+                on_output=_output,
+                on_progress=_progress,
+                on_finished=_finished
+            )
+        except RuntimeError as e:
+            # The GUI is closing: the engine no longer runs scripts
             if callback:
-                callback(False, error_msg)
-            return False, error_msg
-        finally:
-            self.running = False
+                callback(False, str(e))
+            return None
+        
+        with self._lock:
+            if not job.done():
+                self.processes[job.id] = job
+        
+        return job
     
-    def run_script_async(
+    def _post(self, signal, *args):
+        """Queue a signal emission for the GUI thread (any thread)"""
+        with self._lock:
+            self._pending.append([signal, args])
+            # Later progress must not jump over this emission
+            self._latest_progress.clear()
+            wake = self._mark_woken()
+        if wake:
+            self._wake.emit()
+    
+    def _post_progress(self, job_id: str, fraction: float, label: str):
+        """Queue job_progress, replacing an undelivered one of the same job"""
+        with self._lock:
+            entry = self._latest_progress.get(job_id)
+            if entry is not None:
+                entry[1] = (job_id, fraction, label)
+                return
+            entry = [self.job_progress, (job_id, fraction, label)]
+            self._latest_progress[job_id] = entry
+            self._pending.append(entry)
+            wake = self._mark_woken()
+        if wake:
+            self._wake.emit()
+    
+    def _mark_woken(self) -> bool:
+        """Whether a wake-up has to be emitted (called under the lock)"""
+        if self._woken:
+            return False
+        self._woken = True
+        return True
+    
+    def _deliver(self):
+        """Emit everything queued since the last wake-up (GUI thread)"""
+        with self._lock:
+            pending, self._pending = self._pending, deque()
+            self._latest_progress.clear()
+            self._woken = False
+        for signal, args in pending:
+            signal.emit(*args)
+    
+    def call_function(
         self,
         script_path: str,
-        args: List[str] = None,
-        callback: Optional[Callable] = None,
-        output_callback: Optional[Callable] = None
+        func: str,
+        *args,
+        timeout: Optional[float] = None
     ):
-        """Run a bash script asynchronously in a separate thread"""
-        def _run():
-            self.run_script(script_path, args, callback, output_callback)
+        """Call a function of a script in its persistent bash worker
         
-        thread = threading.Thread(target=_run, daemon=True)
-        thread.start()
-        return thread
+        The script is sourced once per GUI process, so quick queries do not
+        pay for a new bash and a full parse of the script. Blocks until the
+        function returns; use call_function_async from the GUI thread.
+        
+        Returns:
+            (success, output) tuple
+        """
+        try:
+            returncode, output = get_worker(script_path).call(func, *args, timeout=timeout)
+        except WorkerError as e:
+            return False, str(e)
+        return returncode == 0, output.rstrip("\n")
+    
+    def call_function_async(
+        self,
+        script_path: str,
+        func: str,
+        *args,
+        callback: Optional[Callable] = None,
+        timeout: Optional[float] = None
+    ) -> str:
+        """Call a script function on the shared job pool
+        
+        The result is passed to callback(success, output) on the pool thread
+        and emitted as call_finished(call_id, success, output).
+        
+        Returns:
+            Call id used in call_finished
+        """
+        call_id = f"call-{next(self._call_ids)}"
+        
+        def _call():
+            success, output = self.call_function(script_path, func, *args, timeout=timeout)
+            if callback:
+                callback(success, output)
+            self._post(self.call_finished, call_id, success, output)
+        
+        get_scheduler().submit(_call, name=f"{Path(script_path).name} {func}")
+        return call_id
     
     def get_version(self, project_root: Path):
         """Get current version from VERSION file"""
@@ -103,26 +266,25 @@ class ScriptRunner:
         """Check for updates using steamdeck_update.sh"""
         update_script = project_root / "scripts" / "steamdeck_update.sh"
         
-        def _callback(success, output):
-            if callback:
-                callback(success, output)
-        
         return self.run_script_async(
             str(update_script),
             ["check"],
-            callback=_callback
+            callback=callback,
+            resource=RESOURCE_NETWORK,
+            key="steamdeck_update.sh check",
+            timeout=UPDATE_CHECK_TIMEOUT,
+            cwd=str(project_root)
         )
     
     def apply_update(self, project_root: Path, callback: Optional[Callable] = None):
         """Apply updates using steamdeck_update.sh"""
         update_script = project_root / "scripts" / "steamdeck_update.sh"
         
-        def _callback(success, output):
-            if callback:
-                callback(success, output)
-        
         return self.run_script_async(
             str(update_script),
             ["update"],
-            callback=_callback
+            callback=callback,
+            resource=RESOURCE_NETWORK,
+            key="steamdeck_update.sh update",
+            cwd=str(project_root)
         )
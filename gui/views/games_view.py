@@ -6,21 +6,69 @@ Version: 1.0
 """
 
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-    QPushButton, QTextEdit, QMessageBox
+    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+    QPushButton, QMessageBox, QFileDialog, QInputDialog,
+    QListWidget, QListWidgetItem, QProgressBar
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
 from pathlib import Path
-import subprocess
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.script_runner import ScriptRunner
+from widgets.console import ConsoleWidget
+from steamdeck_scheduler import (
+    get_scheduler, RESOURCE_DISK, PRIORITY_LOW, JOB_QUEUED, JOB_RUNNING, JOB_CANCELLED
+)
+from steamdeck_gameindex import get_index
+import steamdeck_gamescript
+from steamdeck_gamewatch import ChangeListener, ensure_running, is_running
+import steamdeck_probe
+
+# Job list markers
+STATE_ICONS = {
+    JOB_QUEUED: "⏳",
+    JOB_RUNNING: "▶️",
+}
 
 
 class GamesView(QWidget):
-    """Games installation view"""
+    """Games installation view
+    
+    Installs run as background jobs on the process engine: output streams
+    into the console, several installs can be queued (disk-heavy jobs run
+    one at a time) and any of them can be cancelled. Game files already on
+    the device are listed from the shared game index, which is refreshed in
+    the background (only changed directories are re-read). While the game
+    watcher process runs, the list follows its index updates without
+    scanning the disk. SH installers are listed by the title read from
+    their script header (cached, so the archive payload is never read).
+    """
+    
+    _found = pyqtSignal(object)  # list of (GameFile, title)
+    _index_changed = pyqtSignal()
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.project_root = Path(__file__).parent.parent.parent
+        self.items = {}
+        
+        self.runner = ScriptRunner(parent=self)
+        self.runner.job_started.connect(self._on_job_started)
+        self.runner.job_output.connect(self._on_job_output)
+        self.runner.job_progress.connect(self._on_job_progress)
+        self.runner.job_finished.connect(self._on_job_finished)
+        self._found.connect(self._on_found, Qt.ConnectionType.QueuedConnection)
+        self._index_changed.connect(lambda: self.refresh_found(rescan=False),
+                                    Qt.ConnectionType.QueuedConnection)
+        
         self._setup_ui()
+        
+        # Index updates from the game watcher process
+        self.index_listener = ChangeListener(self._index_changed.emit)
+        if self.index_listener.start():
+            QApplication.instance().aboutToQuit.connect(self.index_listener.stop)
+        self.refresh_found(rescan=None)
     
     def _setup_ui(self):
         """Setup the UI"""
@@ -58,68 +106,274 @@ class GamesView(QWidget):
         
         layout.addLayout(buttons_layout)
         
+        # Game files found on the device
+        found_header = QHBoxLayout()
+        self.found_label = QLabel("Найденные игры: поиск...")
+        self.found_label.setStyleSheet("font-size: 12pt; color: #b0b0b0;")
+        found_header.addWidget(self.found_label)
+        found_header.addStretch()
+        
+        self.refresh_btn = QPushButton("🔄 Обновить")
+        self.refresh_btn.clicked.connect(lambda: self.refresh_found(rescan=True))
+        found_header.addWidget(self.refresh_btn)
+        layout.addLayout(found_header)
+        
+        self.found_list = QListWidget()
+        self.found_list.setMaximumHeight(160)
+        self.found_list.setToolTip("Двойной щелчок - установить")
+        self.found_list.itemDoubleClicked.connect(self._install_found)
+        layout.addWidget(self.found_list)
+        
+        # Install queue
+        queue_layout = QHBoxLayout()
+        
+        self.jobs_list = QListWidget()
+        self.jobs_list.setMaximumHeight(120)
+        self.jobs_list.currentItemChanged.connect(self._update_cancel_button)
+        queue_layout.addWidget(self.jobs_list)
+        
+        self.cancel_btn = QPushButton("⏹ Отменить")
+        self.cancel_btn.setMinimumHeight(50)
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel_selected)
+        queue_layout.addWidget(self.cancel_btn, alignment=Qt.AlignmentFlag.AlignTop)
+        
+        layout.addLayout(queue_layout)
+        
+        # Progress of the running install
+        self.progress = QProgressBar()
+        self.progress.setVisible(False)
+        layout.addWidget(self.progress)
+        
         # Output area
-        self.output = QTextEdit()
-        self.output.setReadOnly(True)
+        self.output = ConsoleWidget()
         self.output.setPlaceholderText("Вывод команд будет здесь...")
         layout.addWidget(self.output)
     
     def install_sh_game(self):
         """Install SH game"""
-        self.output.append("=== Установка SH игры ===")
-        
         script_path = self.project_root / "scripts" / "steamdeck_native_games.sh"
         
         if not script_path.exists():
             self.output.append("❌ Скрипт не найден!")
             return
         
+        game_script, _ = QFileDialog.getOpenFileName(
+            self, "Выберите скрипт игры", str(Path.home() / "Downloads"),
+            "Скрипты (*.sh);;Все файлы (*)"
+        )
+        if game_script:
+            self._install_sh(script_path, game_script)
+    
+    def _install_sh(self, script_path, game_script, title=None):
+        """Ask for the game name and queue the SH install"""
+        if title is None:
+            title = self._script_title(game_script)
+        name, ok = QInputDialog.getText(
+            self, "Название игры", "Название игры:", text=title
+        )
+        if not ok or not name.strip():
+            return
+        
+        self._queue_install(
+            script_path, ["install", name.strip(), game_script],
+            f"SH: {name.strip()}"
+        )
+    
+    @staticmethod
+    def _script_title(game_script):
+        """Game title from the script header, or the file name"""
         try:
-            result = subprocess.run(
-                ["bash", str(script_path), "interactive"],
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
-            
-            if result.returncode == 0:
-                self.output.append("✅ Игра установлена успешно!")
-            else:
-                self.output.append(f"❌ Ошибка: {result.stderr}")
-                
-            self.output.append(result.stdout)
-            
-        except subprocess.TimeoutExpired:
-            self.output.append("❌ Таймаут выполнения")
-        except Exception as e:
-            self.output.append(f"❌ Ошибка: {str(e)}")
+            return steamdeck_gamescript.analyze(game_script).display_name
+        except OSError:
+            return Path(game_script).stem
     
     def install_rar_game(self):
         """Install RAR game"""
-        self.output.append("=== Установка RAR игры ===")
-        
         script_path = self.project_root / "scripts" / "steamdeck_steamrip.sh"
         
         if not script_path.exists():
             self.output.append("❌ Скрипт не найден!")
             return
         
-        try:
-            result = subprocess.run(
-                ["bash", str(script_path), "interactive"],
-                capture_output=True,
-                text=True,
-                timeout=600
-            )
-            
-            if result.returncode == 0:
-                self.output.append("✅ Игра установлена успешно!")
+        archives, _ = QFileDialog.getOpenFileNames(
+            self, "Выберите RAR архивы", str(Path.home() / "Downloads"),
+            "RAR архивы (*.rar);;Все файлы (*)"
+        )
+        for archive in archives:
+            self._install_rar(script_path, archive)
+    
+    def _install_rar(self, script_path, archive):
+        """Queue extraction of a RAR game into its own SteamRip directory"""
+        extract_dir = Path.home() / "Games" / "SteamRip" / Path(archive).stem
+        self._queue_install(
+            script_path, ["extract", archive, str(extract_dir)], f"RAR: {Path(archive).name}"
+        )
+    
+    def refresh_found(self, rescan=None):
+        """Update the list of game files from the game index in the background
+        
+        Args:
+            rescan: Re-read changed directories first; None - only when the
+                    game watcher is not running (it keeps the index current)
+        """
+        def _find():
+            scan = rescan
+            if scan is None:
+                scan = not is_running()
+                if scan:
+                    ensure_running()
+            index = get_index()
+            cache = steamdeck_gamescript.get_cache()
+            found = []
+            for game in index.find("sh", rescan=scan):
+                try:
+                    info = steamdeck_gamescript.analyze(game.path, cache=cache, save=False)
+                    title = info.display_name
+                except OSError:
+                    title = Path(game.path).stem
+                found.append((game, title))
+            cache.save()
+            return found + [(game, None) for game in index.find("rar", rescan=scan)]
+        
+        def _job():
+            try:
+                self._found.emit(_find())
+            except Exception as e:
+                self._found.emit(e)
+        
+        self.refresh_btn.setEnabled(False)
+        get_scheduler().submit(_job, name="games index", priority=PRIORITY_LOW,
+                               key="games-index")
+    
+    def _on_found(self, found):
+        """Show the game files found by the index"""
+        self.refresh_btn.setEnabled(True)
+        if isinstance(found, Exception):
+            self.found_label.setText(f"Найденные игры: ошибка поиска ({found})")
+            return
+        
+        self.found_list.clear()
+        for game, title in found:
+            if game.kind == "sh":
+                text = f"📋 {title}" if title == Path(game.path).stem else f"📋 {title} ({game.name})"
             else:
-                self.output.append(f"❌ Ошибка: {result.stderr}")
-                
-            self.output.append(result.stdout)
-            
-        except subprocess.TimeoutExpired:
-            self.output.append("❌ Таймаут выполнения")
-        except Exception as e:
-            self.output.append(f"❌ Ошибка: {str(e)}")
+                text = f"📦 {game.name} ({steamdeck_probe.format_bytes(game.size)})"
+            item = QListWidgetItem(text)
+            item.setToolTip(game.path)
+            item.setData(Qt.ItemDataRole.UserRole, (game.kind, game.path, title))
+            self.found_list.addItem(item)
+        self.found_label.setText(f"Найденные игры: {len(found)}")
+    
+    def _install_found(self, item):
+        """Install a game picked from the found list"""
+        kind, path, title = item.data(Qt.ItemDataRole.UserRole)
+        scripts_dir = self.project_root / "scripts"
+        if kind == "sh":
+            self._install_sh(scripts_dir / "steamdeck_native_games.sh", path, title)
+        else:
+            self._install_rar(scripts_dir / "steamdeck_steamrip.sh", path)
+    
+    def cancel_selected(self):
+        """Cancel the selected queued or running install"""
+        item = self.jobs_list.currentItem()
+        if item is None:
+            return
+        job = self.items[item.data(Qt.ItemDataRole.UserRole)][2]
+        if job.done():
+            return
+        
+        if job.state == JOB_RUNNING:
+            reply = QMessageBox.question(
+                self,
+                "Подтверждение",
+                "Прервать установку? Распакованные файлы могут остаться неполными.",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+        
+        self.runner.cancel(job.id)
+    
+    def _queue_install(self, script_path, args, title):
+        """Queue an install job and add it to the job list"""
+        job = self.runner.run_script_async(
+            str(script_path),
+            args,
+            resource=RESOURCE_DISK,
+            key=" ".join([script_path.name] + args),
+            cwd=str(self.project_root)
+        )
+        if job is None:
+            self.output.append(f"❌ Не удалось запустить: {title}")
+            return
+        if job.id in self.items:
+            self.output.append(f"⏳ {title}: уже в очереди")
+            return
+        
+        item = QListWidgetItem()
+        item.setData(Qt.ItemDataRole.UserRole, job.id)
+        self.items[job.id] = (item, title, job)
+        self.jobs_list.addItem(item)
+        self.jobs_list.setCurrentItem(item)
+        self._set_item_state(job.id, STATE_ICONS.get(job.state, "⏳"))
+        self.output.append(f"⏳ В очереди: {title}")
+    
+    def _set_item_state(self, job_id, icon):
+        entry = self.items.get(job_id)
+        if entry is not None:
+            item, title, _ = entry
+            item.setText(f"{icon} {title}")
+    
+    def _update_cancel_button(self, *args):
+        item = self.jobs_list.currentItem()
+        active = (item is not None and
+                  not self.items[item.data(Qt.ItemDataRole.UserRole)][2].done())
+        self.cancel_btn.setEnabled(active)
+    
+    def _on_job_started(self, job_id):
+        """Handle start of a queued install"""
+        if job_id not in self.items:
+            return
+        self._set_item_state(job_id, STATE_ICONS[JOB_RUNNING])
+        self.output.append(f"\n=== {self.items[job_id][1]} ===")
+        self.progress.setRange(0, 0)
+        self.progress.setFormat("")
+        self.progress.setVisible(True)
+        self._update_cancel_button()
+    
+    def _on_job_output(self, job_id, line):
+        """Stream output of an install"""
+        if job_id in self.items:
+            self.output.append(line)
+    
+    def _on_job_progress(self, job_id, fraction, label):
+        """Show progress events of an install"""
+        if job_id not in self.items:
+            return
+        if fraction < 0:
+            self.progress.setRange(0, 0)
+        else:
+            self.progress.setRange(0, 1000)
+            self.progress.setValue(int(fraction * 1000))
+        self.progress.setFormat(label)
+    
+    def _on_job_finished(self, job_id, success, output):
+        """Handle completion of an install"""
+        if job_id not in self.items:
+            return
+        _, title, job = self.items[job_id]
+        
+        if success:
+            self._set_item_state(job_id, "✅")
+            self.output.append(f"✅ Игра установлена успешно: {title}")
+        elif job.state == JOB_CANCELLED:
+            self._set_item_state(job_id, "⏹")
+            self.output.append(f"⏹ Отменено: {title}")
+        else:
+            self._set_item_state(job_id, "❌")
+            self.output.append(f"❌ Ошибка установки: {title}")
+        
+        if not self.runner.running:
+            self.progress.setVisible(False)
+        self._update_cancel_button()
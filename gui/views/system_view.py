@@ -7,15 +7,22 @@ Version: 1.0
 
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel
 from PyQt6.QtCore import Qt
+import socket
 import sys
-import subprocess
 from pathlib import Path
 
 # Import our widgets
-import sys
-from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
 from widgets.status_card import StatusCard
+from utils.probe_runner import ProbeRunner
+from core.config import config
+import steamdeck_probe
+from steamdeck_snapshot import get_snapshot
+
+# Host and port used to check connectivity (public DNS over TCP)
+NETWORK_CHECK_ADDRESS = ("8.8.8.8", 53)
+NETWORK_CHECK_TIMEOUT = 2.0
 
 
 class SystemView(QWidget):
@@ -23,8 +30,25 @@ class SystemView(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.project_root = Path(__file__).parent.parent.parent
         self._setup_ui()
+        
+        # Probes run in the background; cards show the last stored values
+        # (or placeholders) until they finish
+        self.probes = ProbeRunner(self, cache=get_snapshot(), cache_prefix="system")
+        self.probes.add_probe("version", self._probe_version)
+        self.probes.add_probe("os", self._probe_os)
+        self.probes.add_probe("storage", self._probe_storage)
+        self.probes.add_probe("network", self._probe_network,
+                              timeout=NETWORK_CHECK_TIMEOUT + 1)
+        self.probes.probe_started.connect(self._on_probe_started)
+        self.probes.probe_finished.connect(self._on_probe_finished)
         self._load_system_info()
+        
+        # Optional periodic refresh (seconds, 0 disables it)
+        interval = config.get("system_refresh_interval", 0)
+        if interval:
+            self.probes.start_refresh(int(interval * 1000))
     
     def _setup_ui(self):
         """Setup the UI"""
@@ -61,59 +85,54 @@ class SystemView(QWidget):
         layout.addStretch()
     
     def _load_system_info(self):
-        """Load system information"""
-        # Version
-        project_root = Path(__file__).parent.parent.parent
-        version_file = project_root / "VERSION"
-        if version_file.exists():
-            version = version_file.read_text().strip()
-            self.version_card.set_value(version)
-        
-        # OS
-        try:
-            result = subprocess.run(
-                ["cat", "/etc/os-release"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            for line in result.stdout.split('\n'):
-                if line.startswith("PRETTY_NAME="):
-                    os_name = line.split('=')[1].strip('"')
-                    self.os_card.set_value(os_name)
-                    break
-        except:
-            self.os_card.set_value("Unknown")
-        
-        # Storage
-        try:
-            result = subprocess.run(
-                ["df", "-h", "/"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            lines = result.stdout.split('\n')
-            if len(lines) > 1:
-                parts = lines[1].split()
-                if len(parts) >= 5:
-                    used = parts[2]
-                    total = parts[1]
-                    self.storage_card.set_value(f"{used} / {total}")
-        except:
-            self.storage_card.set_value("N/A")
+        """Load system information
         
-        # Network
+        Cached values are shown at once; probes with an expired TTL run
+        concurrently in the background.
+        """
+        self.probes.show_cached()
+        self.probes.run_all(stale_only=True)
+    
+    def _card(self, name):
+        return {
+            "version": self.version_card,
+            "os": self.os_card,
+            "storage": self.storage_card,
+            "network": self.network_card,
+        }[name]
+    
+    def _on_probe_started(self, name):
+        """Mark a card as being refreshed"""
+        self._card(name).set_refreshing(True)
+    
+    def _on_probe_finished(self, name, value, status):
+        """Apply a probe result to its card"""
+        card = self._card(name)
+        card.set_value(value, status)
+        card.set_refreshing(name in self.probes.pending)
+    
+    # Probes run on the job pool and return (value, status)
+    
+    def _probe_version(self):
+        version_file = self.project_root / "VERSION"
+        if version_file.exists():
+            return version_file.read_text().strip(), "info"
+        return "Unknown", "warning"
+    
+    def _probe_os(self):
+        return steamdeck_probe.os_release() or "Unknown", "info"
+    
+    def _probe_storage(self):
+        disk = steamdeck_probe.disk_usage("/")
+        if not disk:
+            return "N/A", "warning"
+        used = steamdeck_probe.format_bytes(disk["used"])
+        total = steamdeck_probe.format_bytes(disk["total"])
+        return f"{used} / {total}", "info"
+    
+    def _probe_network(self):
         try:
-            result = subprocess.run(
-                ["ping", "-c", "1", "-W", "2", "8.8.8.8"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                self.network_card.set_value("Online", "success")
-            else:
-                self.network_card.set_value("Offline", "error")
-        except:
-            self.network_card.set_value("Unknown", "warning")
+            with socket.create_connection(NETWORK_CHECK_ADDRESS, NETWORK_CHECK_TIMEOUT):
+                return "Online", "success"
+        except OSError:
+            return "Offline", "error"
@@ -7,49 +7,28 @@ Version: 1.0
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-    QPushButton, QTextEdit, QProgressBar, QMessageBox
+    QPushButton, QProgressBar, QMessageBox
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtCore import Qt
 from pathlib import Path
-import subprocess
-import threading
+import sys
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.script_runner import ScriptRunner
+from widgets.console import ConsoleWidget
+from core.config import config
+from steamdeck_snapshot import get_snapshot
 
-class UpdateWorker(QThread):
-    """Worker thread for update operations"""
-    finished = pyqtSignal(bool, str)
-    output = pyqtSignal(str)
-    
-    def __init__(self, script_path, args):
-        super().__init__()
-        self.script_path = script_path
-        self.args = args
-    
-    def run(self):
-        """Run the update script"""
-        try:
-            process = subprocess.Popen(
-                ["bash", str(self.script_path)] + self.args,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
-            )
-            
-            output_lines = []
-            for line in process.stdout:
-                line = line.rstrip()
-                output_lines.append(line)
-                self.output.emit(line)
-            
-            return_code = process.wait()
-            output = "\n".join(output_lines)
-            
-            self.finished.emit(return_code == 0, output)
-            
-        except Exception as e:
-            self.finished.emit(False, str(e))
+
+def _update_available(output):
+    """Whether the output of "steamdeck_update.sh check" reports an update"""
+    return "Доступно обновление" in output or "update available" in output.lower()
+
+
+def _version_from(success, output):
+    """Version printed by get_current_version ("" if the call failed)"""
+    lines = output.splitlines()
+    return lines[-1].strip() if success and lines else ""
 
 
 class UpdateView(QWidget):
@@ -58,8 +37,20 @@ class UpdateView(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.project_root = Path(__file__).parent.parent.parent
-        self.worker = None
+        self.job_id = None
+        self._finished_handler = None
+        self.snapshot = get_snapshot()
+        
+        # Script results arrive through queued Qt signals
+        self.runner = ScriptRunner(parent=self)
+        self.runner.job_output.connect(self._on_job_output)
+        self.runner.job_progress.connect(self._on_job_progress)
+        self.runner.job_finished.connect(self._on_job_finished)
+        self.runner.call_finished.connect(self._on_version_loaded)
+        
         self._setup_ui()
+        self._load_version()
+        self._load_update_status()
     
     def _setup_ui(self):
         """Setup the UI"""
@@ -77,6 +68,16 @@ class UpdateView(QWidget):
         desc.setStyleSheet("font-size: 12pt; color: #b0b0b0;")
         layout.addWidget(desc)
         
+        # Current version
+        self.version_label = QLabel("Текущая версия: …")
+        self.version_label.setStyleSheet("font-size: 12pt;")
+        layout.addWidget(self.version_label)
+        
+        # Result of the last update check
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("font-size: 12pt; color: #b0b0b0;")
+        layout.addWidget(self.status_label)
+        
         # Buttons
         buttons_layout = QHBoxLayout()
         buttons_layout.setSpacing(15)
@@ -104,11 +105,59 @@ class UpdateView(QWidget):
         layout.addWidget(self.progress)
         
         # Output area
-        self.output = QTextEdit()
-        self.output.setReadOnly(True)
+        self.output = ConsoleWidget()
         self.output.setPlaceholderText("Вывод команд будет здесь...")
         layout.addWidget(self.output)
     
+    def _load_version(self):
+        """Show the cached version, then refresh it from steamdeck_update.sh (bash worker)"""
+        self.version_call = None
+        cached = self.snapshot.get("update.version")
+        if cached is not None:
+            if self.snapshot.is_fresh("update.version"):
+                self.version_label.setText(f"Текущая версия: {cached.value}")
+                return
+            self.version_label.setText(f"Текущая версия: {cached.value} ⟳")
+        
+        self.version_call = self.runner.call_function_async(
+            str(self.project_root / "scripts" / "steamdeck_update.sh"),
+            "get_current_version",
+            callback=self._store_version
+        )
+    
+    def _store_version(self, success, output):
+        """Save the loaded version to the snapshot (pool thread, off the GUI thread)"""
+        version = _version_from(success, output)
+        if version:
+            self.snapshot.set("update.version", version)
+    
+    def _load_update_status(self):
+        """Show the last update check result and re-check it once its TTL expires"""
+        cached = self.snapshot.get("update_status")
+        # As in the Tk GUI, a result stored for another version is stale
+        current = (cached is not None and isinstance(cached.value, dict)
+                   and cached.value.get("version") == self.runner.get_version(self.project_root))
+        if current:
+            available = cached.value.get("available")
+            text = "Доступно обновление" if available else "Установлена последняя версия"
+            self.status_label.setText(f"{text} (проверено {cached.updated_text()})")
+            self.update_btn.setEnabled(bool(available))
+        
+        fresh = current and self.snapshot.is_fresh("update_status")
+        if not fresh and config.get("auto_check_updates", True):
+            self.status_label.setText(f"{self.status_label.text()} ⟳".strip())
+            self.check_updates()
+    
+    def _on_version_loaded(self, call_id, success, output):
+        """Show the current version"""
+        if call_id != self.version_call:
+            return
+        version = _version_from(success, output)
+        if not version:
+            # Fall back to the VERSION file if the script is unavailable
+            version = self.runner.get_version(self.project_root)
+        self.version_label.setText(f"Текущая версия: {version}")
+    
     def check_updates(self):
         """Check for updates"""
         self.output.clear()
@@ -125,11 +174,18 @@ class UpdateView(QWidget):
         self.update_btn.setEnabled(False)
         self.progress.setVisible(True)
         
-        # Run in thread
-        self.worker = UpdateWorker(script_path, ["check"])
-        self.worker.output.connect(self.on_output)
-        self.worker.finished.connect(self.on_check_finished)
-        self.worker.start()
+        # Run on the process engine
+        job = self.runner.check_updates(self.project_root, callback=self._store_update_status)
+        self._watch(job, self.on_check_finished)
+    
+    def _store_update_status(self, success, output):
+        """Save the check result to the snapshot (engine thread, off the GUI thread)"""
+        if success:
+            # Same snapshot field as the Tk GUI; the status belongs to the current version
+            self.snapshot.set("update_status", {
+                "version": self.runner.get_version(self.project_root),
+                "available": _update_available(output),
+            })
     
     def apply_update(self):
         """Apply updates"""
@@ -146,18 +202,51 @@ class UpdateView(QWidget):
         self.output.clear()
         self.output.append("=== Установка обновления ===")
         
-        script_path = self.project_root / "scripts" / "steamdeck_update.sh"
-        
         # Disable buttons
         self.check_btn.setEnabled(False)
         self.update_btn.setEnabled(False)
         self.progress.setVisible(True)
         
-        # Run in thread
-        self.worker = UpdateWorker(script_path, ["update"])
-        self.worker.output.connect(self.on_output)
-        self.worker.finished.connect(self.on_update_finished)
-        self.worker.start()
+        # Run on the process engine
+        job = self.runner.apply_update(self.project_root)
+        self._watch(job, self.on_update_finished)
+    
+    def _watch(self, job, finished_handler):
+        """Route signals of the given job to a finish handler"""
+        if job is None:
+            finished_handler(False, "Script not found")
+            return
+        self.job_id = job.id
+        self._finished_handler = finished_handler
+        
+        # Busy indicator until the script reports measurable progress
+        self.progress.setRange(0, 0)
+        self.progress.setFormat("")
+    
+    def _on_job_output(self, job_id, line):
+        """Handle output of the watched job"""
+        if job_id == self.job_id:
+            self.on_output(line)
+    
+    def _on_job_progress(self, job_id, fraction, label):
+        """Show progress events of the watched job"""
+        if job_id != self.job_id:
+            return
+        if fraction < 0:
+            self.progress.setRange(0, 0)
+        else:
+            self.progress.setRange(0, 1000)
+            self.progress.setValue(int(fraction * 1000))
+        self.progress.setFormat(label)
+    
+    def _on_job_finished(self, job_id, success, output):
+        """Handle completion of the watched job"""
+        if job_id != self.job_id:
+            return
+        handler = self._finished_handler
+        self.job_id = None
+        self._finished_handler = None
+        handler(success, output)
     
     def on_output(self, line):
         """Handle output line"""
@@ -169,12 +258,16 @@ class UpdateView(QWidget):
         self.check_btn.setEnabled(True)
         
         if success:
-            if "Доступно обновление" in output or "update available" in output.lower():
+            available = _update_available(output)
+            # The result was saved to the snapshot by _store_update_status
+            self._load_update_status()
+            if available:
                 self.update_btn.setEnabled(True)
                 self.output.append("\n✅ Обновление доступно!")
             else:
                 self.output.append("\n✅ Установлена последняя версия")
         else:
+            self.status_label.setText(self.status_label.text().rstrip(" ⟳"))
             self.output.append("\n❌ Ошибка проверки обновлений")
     
     def on_update_finished(self, success, output):
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Console Widget for Steam Deck Enhancement Pack GUI
+Author: @ncux11
+Version: 1.0
+"""
+
+from collections import deque
+
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPlainTextEdit,
+    QLineEdit, QPushButton, QLabel
+)
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QFont, QKeySequence, QShortcut, QTextCursor, QTextDocument
+
+# Lines kept in the console; older lines are dropped from the top
+MAX_BLOCKS = 5000
+
+# Interval between batched appends (ms)
+FLUSH_INTERVAL_MS = 50
+
+# Distance from the bottom (px) that still counts as "following" the output
+FOLLOW_THRESHOLD = 4
+
+
+class ConsoleWidget(QWidget):
+    """Read-only output console with a line limit, batched appends and search
+    
+    append() only queues lines; a timer inserts them in one edit per
+    interval. The view follows new output while it is scrolled to the
+    bottom and stays put once the user scrolls up.
+    """
+    
+    def __init__(self, max_blocks=MAX_BLOCKS, flush_interval=FLUSH_INTERVAL_MS,
+                 parent=None):
+        super().__init__(parent)
+        self.max_blocks = max_blocks
+        # Lines beyond the block limit would be trimmed right away anyway
+        self._pending = deque(maxlen=max_blocks)
+        
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(flush_interval)
+        self._timer.timeout.connect(self.flush)
+        
+        self._setup_ui()
+    
+    def _setup_ui(self):
+        """Setup the UI"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(5)
+        
+        # Search bar
+        search_layout = QHBoxLayout()
+        search_layout.setSpacing(5)
+        
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Поиск в выводе (Ctrl+F)")
+        self.search_edit.returnPressed.connect(self.find_next)
+        self.search_edit.textChanged.connect(lambda: self.search_status.clear())
+        search_layout.addWidget(self.search_edit)
+        
+        prev_btn = QPushButton("▲")
+        prev_btn.setFixedWidth(40)
+        prev_btn.clicked.connect(self.find_previous)
+        search_layout.addWidget(prev_btn)
+        
+        next_btn = QPushButton("▼")
+        next_btn.setFixedWidth(40)
+        next_btn.clicked.connect(self.find_next)
+        search_layout.addWidget(next_btn)
+        
+        self.search_status = QLabel()
+        self.search_status.setStyleSheet("color: #b0b0b0;")
+        search_layout.addWidget(self.search_status)
+        
+        layout.addLayout(search_layout)
+        
+        # Output view: plain text blocks, no rich-text layout, no undo history
+        self.view = QPlainTextEdit()
+        self.view.setReadOnly(True)
+        self.view.setUndoRedoEnabled(False)
+        self.view.setMaximumBlockCount(self.max_blocks)
+        self.view.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.view.setFont(QFont("monospace"))
+        layout.addWidget(self.view)
+        
+        QShortcut(QKeySequence.StandardKey.Find, self, self._focus_search)
+        QShortcut(QKeySequence("Shift+Return"), self.search_edit, self.find_previous)
+    
+    def append(self, text):
+        """Queue text (one or more lines) for the next batched insert"""
+        self._pending.extend(str(text).split("\n"))
+        if not self._timer.isActive():
+            self._timer.start()
+    
+    def flush(self):
+        """Insert all queued lines in a single edit"""
+        self._timer.stop()
+        if not self._pending:
+            return
+        
+        lines = list(self._pending)
+        self._pending.clear()
+        
+        scrollbar = self.view.verticalScrollBar()
+        follow = scrollbar.value() >= scrollbar.maximum() - FOLLOW_THRESHOLD
+        position = scrollbar.value()
+        
+        # Append at the end without moving the user's cursor or selection
+        cursor = QTextCursor(self.view.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        if not self.view.document().isEmpty():
+            cursor.insertBlock()
+        cursor.insertText("\n".join(lines))
+        cursor.endEditBlock()
+        
+        if follow:
+            scrollbar.setValue(scrollbar.maximum())
+        else:
+            scrollbar.setValue(min(position, scrollbar.maximum()))
+    
+    def clear(self):
+        """Drop the console contents and any queued lines"""
+        self._pending.clear()
+        self._timer.stop()
+        self.view.clear()
+        self.search_status.clear()
+    
+    def setPlaceholderText(self, text):
+        """Placeholder shown while the console is empty"""
+        self.view.setPlaceholderText(text)
+    
+    def toPlainText(self):
+        """Full console text, including lines not inserted yet"""
+        self.flush()
+        return self.view.toPlainText()
+    
+    def find_next(self):
+        """Select the next match of the search text"""
+        self._find(backward=False)
+    
+    def find_previous(self):
+        """Select the previous match of the search text"""
+        self._find(backward=True)
+    
+    def _find(self, backward):
+        text = self.search_edit.text()
+        if not text:
+            return
+        self.flush()
+        
+        flags = QTextDocument.FindFlag(0)
+        if backward:
+            flags |= QTextDocument.FindFlag.FindBackward
+        
+        found = self.view.find(text, flags)
+        if not found:
+            # Wrap around from the other end
+            cursor = self.view.textCursor()
+            cursor.movePosition(
+                QTextCursor.MoveOperation.End if backward
+                else QTextCursor.MoveOperation.Start
+            )
+            self.view.setTextCursor(cursor)
+            found = self.view.find(text, flags)
+        
+        self.search_status.setText("" if found else "Не найдено")
+    
+    def _focus_search(self):
+        self.search_edit.setFocus()
+        self.search_edit.selectAll()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Lazy Tab Widget for Steam Deck Enhancement Pack GUI
+Author: @ncux11
+Version: 1.0
+"""
+
+import importlib
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout
+
+
+def view_factory(module_name, class_name):
+    """Factory that imports the view module only when the tab is built"""
+    def factory():
+        module = importlib.import_module(module_name)
+        return getattr(module, class_name)()
+    return factory
+
+
+class LazyTab(QWidget):
+    """Tab page that builds its view the first time it is shown
+    
+    QTabWidget only shows the current page, so views of tabs the user
+    never opens are not constructed (and do not run their loaders).
+    """
+    
+    def __init__(self, factory, parent=None):
+        """
+        Args:
+            factory: Callable returning the view widget (e.g. the view class)
+        """
+        super().__init__(parent)
+        self._factory = factory
+        self.view = None
+        
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+    
+    def ensure_built(self):
+        """Build the view if it does not exist yet"""
+        if self.view is None:
+            self.view = self._factory()
+            self._layout.addWidget(self.view)
+        return self.view
+    
+    def showEvent(self, event):
+        self.ensure_built()
+        super().showEvent(event)
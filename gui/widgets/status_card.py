@@ -88,12 +88,18 @@ class StatusCard(QFrame):
             color: {color};
         """)
     
-    def set_value(self, value):
-        """Update the value"""
+    def set_value(self, value, status=None):
+        """Update the value (and the status color, if given)"""
         self.value = value
         self.value_label.setText(str(value))
+        if status is not None and status != self.status:
+            self.set_status(status)
     
     def set_title(self, title):
         """Update the title"""
         self.title = title
         self.title_label.setText(title)
+    
+    def set_refreshing(self, refreshing):
+        """Mark the value as being refreshed (it may be out of date)"""
+        self.title_label.setText(f"{self.title} ⟳" if refreshing else self.title)
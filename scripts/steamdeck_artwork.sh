@@ -419,5 +419,7 @@ main() {
     esac
 }
 
-# Запуск
-main "$@"
+# Запуск (фоновый обработчик steamdeck_worker.sh только подключает функции)
+if [[ -z "${STEAMDECK_WORKER:-}" ]]; then
+    main "$@"
+fi
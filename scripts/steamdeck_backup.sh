@@ -25,6 +25,9 @@ print_success() { echo -e "${GREEN}[SUCCESS]${NC} $1"; }
 print_warning() { echo -e "${YELLOW}[WARNING]${NC} $1"; }
 print_error() { echo -e "${RED}[ERROR]${NC} $1"; }
 
+# Протокол прогресса для GUI
+source "$(dirname "$(readlink -f "${BASH_SOURCE[0]}")")/steamdeck_progress.sh"
+
 # Создание директории для бэкапов
 create_backup_dir() {
     if [[ ! -d "$BACKUP_DIR" ]]; then
@@ -129,7 +132,9 @@ create_archive() {
     
     local archive_path="$BACKUP_DIR/$BACKUP_NAME.tar.gz"
     
-    if tar -czf "$archive_path" -C "$BACKUP_DIR" "$BACKUP_NAME"; then
+    progress_phase archive "Упаковка архива"
+    progress_tar_args archive "$BACKUP_DIR/$BACKUP_NAME"
+    if tar "${PROGRESS_TAR_ARGS[@]}" -czf "$archive_path" -C "$BACKUP_DIR" "$BACKUP_NAME"; then
         print_success "Архив создан: $archive_path"
         
         # Удаление временной директории
@@ -253,10 +258,15 @@ main() {
     case "${1:-backup}" in
         "backup")
             create_backup_dir
+            progress_items backup 0 4 "Сохранения игр"
             backup_game_saves
+            progress_items backup 1 4 "Конфигурации"
             backup_configs
+            progress_items backup 2 4 "Список пакетов"
             backup_packages
+            progress_items backup 3 4 "Создание архива"
             create_archive
+            progress_items backup 4 4 "Готово"
             print_success "Бэкап завершен успешно!"
             ;;
         "restore")
@@ -284,5 +294,7 @@ main() {
     esac
 }
 
-# Запуск
-main "$@"
+# Запуск (фоновый обработчик steamdeck_worker.sh только подключает функции)
+if [[ -z "${STEAMDECK_WORKER:-}" ]]; then
+    main "$@"
+fi
@@ -23,6 +23,12 @@ print_success() { echo -e "${GREEN}[SUCCESS]${NC} $1"; }
 print_warning() { echo -e "${YELLOW}[WARNING]${NC} $1"; }
 print_error() { echo -e "${RED}[ERROR]${NC} $1"; }
 
+# Протокол прогресса для GUI
+source "$(dirname "$(readlink -f "${BASH_SOURCE[0]}")")/steamdeck_progress.sh"
+
+# Параллельный обход каталогов (подсчёт занятого места)
+SCAN_PY="$(dirname "$(readlink -f "${BASH_SOURCE[0]}")")/steamdeck_scan.py"
+
 # Функция для подсчета освобожденного места
 calculate_freed_space() {
     local path="$1"
@@ -263,9 +269,13 @@ show_disk_usage() {
     df -h /
     echo
     
-    # Топ-10 самых больших директорий
+    # Топ-10 самых больших директорий (параллельный обход по устройствам)
     print_message "Топ-10 самых больших директорий в домашней папке:"
-    du -h "$HOME" 2>/dev/null | sort -hr | head -10
+    if command -v python3 &> /dev/null; then
+        python3 "$SCAN_PY" top "$HOME" 10
+    else
+        du -h "$HOME" 2>/dev/null | sort -hr | head -10
+    fi
     echo
     
     # Размер Steam
@@ -275,18 +285,31 @@ show_disk_usage() {
     fi
 }
 
+# Выполнение шагов очистки с событиями прогресса
+run_cleanup_steps() {
+    local steps=("$@")
+    local i
+    
+    for i in "${!steps[@]}"; do
+        progress_items cleanup "$i" "${#steps[@]}" "${steps[$i]}"
+        "${steps[$i]}"
+    done
+    progress_items cleanup "${#steps[@]}" "${#steps[@]}"
+}
+
 # Полная очистка
 full_cleanup() {
     print_message "=== НАЧАЛО ПОЛНОЙ ОЧИСТКИ ==="
     echo
     
-    cleanup_pacman_cache
-    cleanup_flatpak_cache
-    cleanup_steam_cache
-    cleanup_temp_files
-    cleanup_system_logs
-    cleanup_browser_cache
-    cleanup_old_kernels
+    run_cleanup_steps \
+        cleanup_pacman_cache \
+        cleanup_flatpak_cache \
+        cleanup_steam_cache \
+        cleanup_temp_files \
+        cleanup_system_logs \
+        cleanup_browser_cache \
+        cleanup_old_kernels
     
     echo
     print_success "=== ОЧИСТКА ЗАВЕРШЕНА ==="
@@ -298,10 +321,11 @@ safe_cleanup() {
     print_message "=== БЕЗОПАСНАЯ ОЧИСТКА ==="
     echo
     
-    cleanup_pacman_cache
-    cleanup_flatpak_cache
-    cleanup_temp_files
-    cleanup_browser_cache
+    run_cleanup_steps \
+        cleanup_pacman_cache \
+        cleanup_flatpak_cache \
+        cleanup_temp_files \
+        cleanup_browser_cache
     
     echo
     print_success "=== БЕЗОПАСНАЯ ОЧИСТКА ЗАВЕРШЕНА ==="
@@ -583,5 +607,7 @@ main() {
     esac
 }
 
-# Запуск
-main "$@"
+# Запуск (фоновый обработчик steamdeck_worker.sh только подключает функции)
+if [[ -z "${STEAMDECK_WORKER:-}" ]]; then
+    main "$@"
+fi
@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+"""
+Steam Deck Enhancement Pack - Индекс файлов игр
+Общий для скриптов поиска и обоих GUI индекс файлов-кандидатов (.sh игры
+и RAR-архивы SteamRip) в SQLite: путь, размер, mtime и устройство. При
+повторном поиске каталоги с неизменным mtime не перечитываются: для них
+проверяются только уже известные файлы и подкаталоги.
+Автор: @ncux11
+Версия: динамическая (читается из VERSION)
+"""
+
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from steamdeck_scan import DEFAULT_PRUNE, map_roots, outermost
+
+INDEX_FILE = Path.home() / ".steamdeck_gui" / "game_index.db"
+
+# Ожидание блокировки базы другим процессом (секунды)
+BUSY_TIMEOUT = 10.0
+
+HOME = Path.home()
+SD_CARD_DIR = Path("/run/media/mmcblk0p1")
+MEDIA_DIR = Path("/run/media")
+
+# Расширения файлов каждого вида
+GAME_KINDS = {"sh": ".sh", "rar": ".rar"}
+
+# Каталог, изменённый меньше этого времени назад (секунды), перечитывается
+# и при следующем поиске: грубый mtime (FAT/exFAT) может не заметить
+# изменение в ту же секунду
+RECENT_MTIME = 2.0
+
+# Глубина поиска .sh игр от корня (как `find -maxdepth 3`)
+SH_MAX_DEPTH = 3
+
+# Служебные скрипты, которые не считаются играми
+EXCLUDED_SH = re.compile(r"^(setup|install|config|start|run|steamdeck)")
+
+# Версия схемы: индекс - кэш, базу старой версии проще пересоздать
+SCHEMA_VERSION = 2
+
+# complete = 0: каталог прочитан обходом с ограничением глубины, и его
+# подкаталоги в индекс не записаны
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    mtime_ns INTEGER NOT NULL,
+    device INTEGER NOT NULL,
+    complete INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS dirs_parent ON dirs (parent);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    dir TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    device INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_dir ON files (dir);
+CREATE INDEX IF NOT EXISTS files_kind ON files (kind, path);
+"""
+
+
+class GameFile(NamedTuple):
+    """Найденный файл игры"""
+    path: str
+    kind: str
+    size: int
+    mtime_ns: int
+    device: int
+    
+    @property
+    def name(self) -> str:
+        """Имя игры (имя файла без расширения)"""
+        return Path(self.path).name[:-len(GAME_KINDS[self.kind])]
+
+
+class ScanStats(NamedTuple):
+    """Итог обновления индекса"""
+    dirs: int      # каталогов проверено
+    listed: int    # из них перечитано (mtime изменился или каталог новый)
+    files: int     # файлов-кандидатов в индексе по этим корням
+
+
+class _RootScan(NamedTuple):
+    # Результат обхода одного корня, записываемый в базу одной транзакцией
+    seen: Set[str]
+    listed: List[Tuple[str, int, int, bool, List]]    # перечитанные каталоги с файлами
+    refreshed: List[Tuple[str, Optional[os.stat_result]]]  # файлы неизменных каталогов
+    gone: List[str]                                   # исчезнувшие каталоги
+
+
+def search_roots(kind: str) -> List[Path]:
+    """Каталоги поиска файлов вида kind (как в скриптах поиска)"""
+    if kind == "sh":
+        roots = [HOME / "Games", HOME / "Downloads", HOME / "Desktop",
+                 SD_CARD_DIR / "Games", SD_CARD_DIR]
+    elif kind == "rar":
+        roots = [HOME / "Downloads", HOME / "Games" / "SteamRip", HOME / "Games",
+                 SD_CARD_DIR / "Downloads", SD_CARD_DIR / "Games"]
+    else:
+        raise ValueError(f"Неизвестный вид файлов: {kind}")
+    
+    # Все флешки и SD карты
+    try:
+        roots.extend(sorted(entry for entry in MEDIA_DIR.iterdir() if entry.is_dir()))
+    except OSError:
+        pass
+    return roots
+
+
+def is_candidate(kind: str, name: str) -> bool:
+    """Может ли файл с таким именем быть игрой вида kind"""
+    if not name.endswith(GAME_KINDS[kind]) or name.startswith("."):
+        return False
+    return kind != "sh" or not EXCLUDED_SH.match(name)
+
+
+def _subtree(root: str) -> Tuple[str, str]:
+    # Диапазон путей внутри root: '0' следует за '/' в порядке сортировки
+    prefix = root.rstrip("/")
+    return prefix + "/", prefix + "0"
+
+
+def _file_kind(name: str) -> Optional[str]:
+    for kind in GAME_KINDS:
+        if is_candidate(kind, name):
+            return kind
+    return None
+
+
+class GameIndex:
+    """
+    Индекс файлов игр
+    
+    scan() обходит корни: каталог, mtime и устройство которого совпадают
+    с записанными, не перечитывается (добавление, удаление и
+    переименование файлов меняют mtime каталога), а известные в нём файлы
+    проверяются через stat - так видно и докачивающиеся архивы. Записи
+    отключённых носителей сохраняются и снова используются, когда носитель
+    вставлен, но в результаты find() не попадают.
+    """
+    
+    def __init__(self, path=INDEX_FILE):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+    
+    def scan(self, roots: Iterable, on_root: Optional[Callable[[int, int, str], None]] = None,
+             max_depth: Optional[int] = None) -> ScanStats:
+        """
+        Обновление индекса по корням
+        
+        Корни на разных устройствах (встроенный диск, SD карта, флешка)
+        обходятся параллельно, на одном устройстве - в пределах его лимита
+        (steamdeck_scan.map_roots). Каталоги compatdata, shadercache и .git
+        не обходятся.
+        
+        С max_depth читаются только каталоги, файлы которых лежат не глубже
+        max_depth уровней от какого-либо из корней (как `find -maxdepth`);
+        записи более глубоких каталогов не проверяются и не удаляются.
+        
+        Args:
+            roots: Каталоги поиска (несуществующие пропускаются)
+            on_root: Вызывается в начале и после каждого корня: (готово, всего, путь)
+            max_depth: Глубина обхода от каждого корня (None - без ограничения)
+        """
+        limits = None
+        if max_depth is not None:
+            # Вложенный корень продлевает глубину обхода внешнего
+            limits = {os.path.abspath(str(root)): max_depth for root in roots
+                      if os.path.isdir(root)}
+        roots = outermost(roots)
+        total = ScanStats(0, 0, 0)
+        if on_root is not None:
+            on_root(0, len(roots), "")
+        with self._lock:
+            conn = self._connect()
+            known = {root: self._load_known(conn, root, self._max_slashes(root, limits))
+                     for root in roots}
+            
+            done = []
+            progress_lock = threading.Lock()
+            
+            def walk(root):
+                result = self._walk_root(root, *known[root], limits)
+                if on_root is not None:
+                    with progress_lock:
+                        done.append(root)
+                        on_root(len(done), len(roots), root)
+                return result
+            
+            # Обход без базы в потоках устройств, запись - здесь, по корню на транзакцию
+            for root, result in map_roots(walk, roots).items():
+                with conn:
+                    stats = self._apply(conn, root, result)
+                total = ScanStats(*(a + b for a, b in zip(total, stats)))
+        return total
+    
+    def find(self, kind: str, roots: Optional[Iterable] = None,
+             max_depth: Optional[int] = None, rescan: bool = True,
+             on_root: Optional[Callable[[int, int, str], None]] = None) -> List[GameFile]:
+        """
+        Файлы игр вида kind, отсортированные по пути
+        
+        Args:
+            kind: sh или rar
+            roots: Каталоги поиска (по умолчанию search_roots(kind))
+            max_depth: Глубина от корня (по умолчанию 3 для sh, без ограничения для rar)
+            rescan: Сначала обновить индекс (только изменившиеся каталоги)
+        """
+        if kind not in GAME_KINDS:
+            raise ValueError(f"Неизвестный вид файлов: {kind}")
+        roots = [os.path.abspath(str(root)) for root in (roots or search_roots(kind))
+                 if os.path.isdir(root)]
+        if max_depth is None and kind == "sh":
+            max_depth = SH_MAX_DEPTH
+        if rescan:
+            self.scan(roots, on_root, max_depth)
+        
+        found: Dict[str, GameFile] = {}
+        with self._lock:
+            conn = self._connect()
+            for root in roots:
+                low, high = _subtree(root)
+                rows = conn.execute(
+                    "SELECT path, kind, size, mtime_ns, device FROM files"
+                    " WHERE kind = ? AND path >= ? AND path < ?",
+                    (kind, low, high)
+                )
+                for row in rows:
+                    if max_depth is not None and row[0][len(low):].count("/") >= max_depth:
+                        continue
+                    found[row[0]] = GameFile(*row)
+        return [found[path] for path in sorted(found)]
+    
+    def clear(self):
+        """Удаление всех записей (следующий поиск перечитает каталоги)"""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM files")
+                conn.execute("DELETE FROM dirs")
+    
+    def close(self):
+        """Закрытие соединения"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    def _connect(self) -> sqlite3.Connection:
+        # Одно соединение на индекс, используется под self._lock
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=BUSY_TIMEOUT,
+                                   check_same_thread=False)
+            # Скрипты и GUI могут искать одновременно
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                with conn:
+                    conn.execute("DROP TABLE IF EXISTS dirs")
+                    conn.execute("DROP TABLE IF EXISTS files")
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+    
+    @staticmethod
+    def _max_slashes(root: str, limits: Optional[Dict[str, int]]) -> Optional[int]:
+        # Самый глубокий уровень (число '/' в пути), который затронет обход root
+        if limits is None:
+            return None
+        return max(path.count("/") + depth for path, depth in limits.items()
+                   if path == root or path.startswith(root.rstrip("/") + "/"))
+    
+    @staticmethod
+    def _load_known(conn: sqlite3.Connection, root: str, max_slashes: Optional[int] = None):
+        # Записанные каталоги (mtime, устройство, полнота), их подкаталоги и файлы под root
+        low, high = _subtree(root)
+        where = "path >= ? AND path < ?"
+        params: Tuple = (low, high)
+        if max_slashes is not None:
+            where += " AND length(path) - length(replace(path, '/', '')) <= ?"
+            params += (max_slashes,)
+        known_dirs: Dict[str, Tuple[int, int, int]] = {}
+        children: Dict[str, List[str]] = {}
+        for path, parent, mtime_ns, device, complete in conn.execute(
+                "SELECT path, parent, mtime_ns, device, complete FROM dirs"
+                f" WHERE path = ? OR ({where})", (root,) + params):
+            known_dirs[path] = (mtime_ns, device, complete)
+            children.setdefault(parent, []).append(path)
+        known_files: Dict[str, List[str]] = {}
+        for path, directory in conn.execute(f"SELECT path, dir FROM files WHERE {where}", params):
+            known_files.setdefault(directory, []).append(path)
+        return known_dirs, children, known_files
+    
+    @staticmethod
+    def _walk_root(root: str, known_dirs, children, known_files,
+                   limits: Optional[Dict[str, int]] = None) -> "_RootScan":
+        # Только файловая система: выполняется в потоке устройства.
+        # levels - сколько уровней, включая текущий, ещё можно читать
+        # (None - без ограничения)
+        def child_levels(path: str, levels: Optional[int]) -> Optional[int]:
+            if levels is None:
+                return None
+            return max(levels - 1, limits.get(path, 0))
+        
+        result = _RootScan(set(), [], [], [])
+        stack = [(root, limits[root] if limits is not None else None)]
+        while stack:
+            directory, levels = stack.pop()
+            try:
+                stat = os.stat(directory) if directory == root else os.lstat(directory)
+            except OSError:
+                result.gone.append(directory)
+                continue
+            result.seen.add(directory)
+            descend = levels is None or levels > 1
+            
+            known = known_dirs.get(directory)
+            if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_dev) \
+                    and (known[2] or not descend):
+                # Состав каталога не менялся: проверяем только известные файлы
+                for path in known_files.get(directory, ()):
+                    try:
+                        result.refreshed.append((path, os.lstat(path)))
+                    except OSError:
+                        result.refreshed.append((path, None))
+                if descend:
+                    stack.extend((path, child_levels(path, levels))
+                                 for path in children.get(directory, ())
+                                 if os.path.basename(path) not in DEFAULT_PRUNE)
+                continue
+            
+            try:
+                subdirs, files = GameIndex._list_dir(directory)
+            except OSError:
+                # Недоступный каталог не записываем: попробуем в следующий раз
+                result.seen.discard(directory)
+                result.gone.append(directory)
+                continue
+            # mtime до чтения: изменения во время обхода увидит следующий поиск
+            mtime_ns = stat.st_mtime_ns
+            if time.time() - mtime_ns / 1e9 < RECENT_MTIME:
+                mtime_ns = 0
+            result.listed.append((directory, mtime_ns, stat.st_dev, descend, files))
+            present = set(subdirs)
+            result.gone.extend(path for path in children.get(directory, ())
+                               if path not in present)
+            if descend:
+                stack.extend((path, child_levels(path, levels)) for path in subdirs)
+        return result
+    
+    @staticmethod
+    def _apply(conn: sqlite3.Connection, root: str, result: "_RootScan") -> ScanStats:
+        for directory, mtime_ns, device, complete, files in result.listed:
+            conn.execute("DELETE FROM files WHERE dir = ?", (directory,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO files (path, dir, kind, size, mtime_ns, device)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [(path, directory, kind, entry.st_size, entry.st_mtime_ns, entry.st_dev)
+                 for path, kind, entry in files]
+            )
+            # Родитель записывается и у корня: корень может оказаться
+            # подкаталогом при обходе от более внешнего корня. Неполное
+            # чтение не сбрасывает полноту, если состав каталога не менялся
+            conn.execute(
+                "INSERT INTO dirs (path, parent, mtime_ns, device, complete) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (path) DO UPDATE SET mtime_ns = excluded.mtime_ns,"
+                " device = excluded.device, complete = CASE"
+                " WHEN mtime_ns = excluded.mtime_ns AND device = excluded.device"
+                " AND excluded.mtime_ns != 0 THEN max(complete, excluded.complete)"
+                " ELSE excluded.complete END",
+                (directory, os.path.dirname(directory), mtime_ns, device, int(complete))
+            )
+        
+        for path, stat in result.refreshed:
+            if stat is None:
+                conn.execute("DELETE FROM files WHERE path = ?", (path,))
+                continue
+            conn.execute(
+                "UPDATE files SET size = ?, mtime_ns = ?, device = ?"
+                " WHERE path = ? AND (size != ? OR mtime_ns != ? OR device != ?)",
+                (stat.st_size, stat.st_mtime_ns, stat.st_dev,
+                 path, stat.st_size, stat.st_mtime_ns, stat.st_dev)
+            )
+        
+        # Удалённые каталоги вместе с записями вложенных: их обход мог быть
+        # ограничен глубиной
+        for path in result.gone:
+            low, high = _subtree(path)
+            conn.execute("DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)",
+                         (path, low, high))
+            conn.execute("DELETE FROM files WHERE path >= ? AND path < ?", (low, high))
+        
+        low, high = _subtree(root)
+        count = conn.execute(
+            "SELECT COUNT(*) FROM files WHERE path >= ? AND path < ?", (low, high)
+        ).fetchone()[0]
+        return ScanStats(len(result.seen), len(result.listed), count)
+    
+    @staticmethod
+    def _list_dir(directory: str) -> Tuple[List[str], List[Tuple[str, str, os.stat_result]]]:
+        # Как find без -L: символические ссылки не открываются
+        subdirs = []
+        files = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in DEFAULT_PRUNE:
+                            subdirs.append(entry.path)
+                        continue
+                    kind = _file_kind(entry.name)
+                    if kind is not None and entry.is_file(follow_symlinks=False):
+                        files.append((entry.path, kind, entry.stat(follow_symlinks=False)))
+                except OSError:
+                    continue
+        return subdirs, files
+
+_index: Optional[GameIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> GameIndex:
+    """Общий индекс процесса"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = GameIndex()
+        return _index
+
+
+def _progress_reporter(phase: str) -> Optional[Callable[[int, int, str], None]]:
+    # События протокола steamdeck_progress.sh, если GUI передал канал
+    fd = os.environ.get("STEAMDECK_PROGRESS_FD", "")
+    if not fd.isdigit():
+        return None
+    
+    def report(done: int, total: int, root: str):
+        fields = [f"phase={phase}", f"items={done}/{total}"]
+        if root:
+            fields.append(f"message={root}")
+        try:
+            os.write(int(fd), ("\t".join(fields) + "\n").encode("utf-8"))
+        except OSError:
+            pass
+    
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Индекс файлов игр Steam Deck")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    find_parser = commands.add_parser("find", help="Найти файлы игр (с обновлением индекса)")
+    find_parser.add_argument("kind", choices=sorted(GAME_KINDS))
+    find_parser.add_argument("roots", nargs="*", help="Каталоги поиска вместо стандартных")
+    find_parser.add_argument("-0", "--null", action="store_true",
+                             help="Разделять пути символом NUL")
+    find_parser.add_argument("--no-scan", action="store_true",
+                             help="Только запрос к индексу, без обновления")
+    find_parser.add_argument("--progress", metavar="PHASE",
+                             help="Фаза событий прогресса для GUI")
+    
+    commands.add_parser("scan", help="Обновить индекс по всем каталогам поиска")
+    commands.add_parser("clear", help="Очистить индекс")
+    
+    args = parser.parse_args(argv)
+    index = get_index()
+    try:
+        if args.command == "find":
+            files = index.find(args.kind, args.roots or None, rescan=not args.no_scan,
+                               on_root=_progress_reporter(args.progress) if args.progress else None)
+            end = "\0" if args.null else "\n"
+            for item in files:
+                print(item.path, end=end)
+        elif args.command == "scan":
+            roots = search_roots("sh") + search_roots("rar")
+            stats = index.scan(roots)
+            print(f"Каталогов: {stats.dirs}, перечитано: {stats.listed}, файлов: {stats.files}")
+        elif args.command == "clear":
+            index.clear()
+    except (OSError, sqlite3.Error) as e:
+        print(f"Ошибка индекса игр: {e}", file=sys.stderr)
+        return 1
+    finally:
+        index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,26 @@
+#!/bin/bash
+
+# Steam Deck Game Index
+# Поиск файлов игр через общий индекс (steamdeck_gameindex.py)
+# Автор: @ncux11
+# Версия: 0.1 (Октябрь 2025)
+#
+# Индекс хранится в ~/.steamdeck_gui/game_index.db и обновляется при
+# каждом поиске: перечитываются только каталоги, изменившиеся с прошлого
+# раза, поэтому повторный поиск по SD карте не обходит её заново.
+
+_GAME_INDEX_PY="$(dirname "$(readlink -f "${BASH_SOURCE[0]}")")/steamdeck_gameindex.py"
+
+# Пути найденных файлов, разделённые NUL: game_index_find <sh|rar> [фаза прогресса]
+# .sh игры ищутся на глубину 3 без служебных скриптов (setup, install, ...),
+# RAR - на любую глубину; каталоги поиска - search_roots() в steamdeck_gameindex.py.
+game_index_find() {
+    local kind="$1"
+    local phase="${2:-}"
+    
+    if ! command -v python3 &> /dev/null; then
+        echo "Для поиска игр нужен python3" >&2
+        return 1
+    fi
+    python3 "$_GAME_INDEX_PY" find "$kind" --null ${phase:+--progress "$phase"}
+}
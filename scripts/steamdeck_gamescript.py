@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Steam Deck Enhancement Pack - Анализ .sh скриптов игр
+Читает только текстовый заголовок установщика (makeself/MojoSetup
+архивы - это сотни мегабайт данных после короткого скрипта) и за один
+проход определяет формат, название, версию, зависимости и исполняемые
+файлы. Результаты кэшируются по (inode, размер, mtime).
+Автор: @ncux11
+Версия: динамическая (читается из VERSION)
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+CACHE_FILE = Path.home() / ".steamdeck_gui" / "gamescript_cache.json"
+CACHE_VERSION = 1
+
+# Записей в кэше (при переполнении удаляются давно не запрашиваемые)
+CACHE_LIMIT = 500
+
+# Максимальный размер читаемого заголовка
+HEADER_LIMIT = 256 * 1024
+
+# Строк в каждой секции отчёта (как head -5 в прежней версии)
+SECTION_LINES = 5
+
+STANDARD_SHEBANGS = ("#!/bin/bash", "#!/bin/sh")
+
+# Форматы скриптов
+FORMAT_MOJOSETUP = "mojosetup"
+FORMAT_MAKESELF = "makeself"
+FORMAT_SCRIPT = "script"
+
+FORMAT_NAMES = {
+    FORMAT_MOJOSETUP: "MojoSetup (makeself)",
+    FORMAT_MAKESELF: "makeself",
+    FORMAT_SCRIPT: "shell скрипт",
+}
+
+_INFO_RE = re.compile(r"game|title|name|version", re.IGNORECASE)
+_DEPENDENCY_RE = re.compile(r"apt|yum|pacman|flatpak|wine|steam", re.IGNORECASE)
+_DEPENDENCY_WORD_RE = re.compile(r"\b(apt-get|apt|yum|dnf|pacman|flatpak|wine|steam)\b",
+                                 re.IGNORECASE)
+_EXECUTABLE_RE = re.compile(r"\.(exe|bin|app|run)$")
+
+_MAKESELF_RE = re.compile(r"\bMakeself\b", re.IGNORECASE)
+_MAKESELF_VARS = ("label", "script", "targetdir", "filesizes")
+_ASSIGN_RE = re.compile(r"""^\s*(?:export\s+)?([A-Za-z_][A-Za-z0-9_]*)=(["']?)([^"'\n]*)\2\s*$""")
+_COMMENT_FIELD_RE = re.compile(r"^#+\s*(game|title|name|version)\s*:\s*(.+?)\s*$",
+                               re.IGNORECASE)
+_TITLE_VARS = ("GAME_NAME", "GAMENAME", "GAME_TITLE", "TITLE", "APP_NAME", "NAME")
+_VERSION_VARS = ("GAME_VERSION", "VERSION", "APP_VERSION", "VER")
+_GOG_SUFFIX_RE = re.compile(r"\s*\(GOG\.com\)\s*$", re.IGNORECASE)
+_FILENAME_VERSION_RE = re.compile(r"[_-]v?(\d+(?:[._]\d+)+)")
+
+# Конец скрипта makeself: дальше идёт архив
+_MAKESELF_END = "eval $finish; exit $res"
+
+
+class ScriptInfo(NamedTuple):
+    """Результат анализа скрипта"""
+    path: str
+    format: str
+    shebang: str
+    title: str
+    version: str
+    dependencies: List[str]
+    info_lines: List[str]
+    dependency_lines: List[str]
+    executables: List[str]
+    header_bytes: int
+    
+    @property
+    def standard_shebang(self) -> bool:
+        """Shebang bash или sh"""
+        return self.shebang in STANDARD_SHEBANGS
+    
+    @property
+    def display_name(self) -> str:
+        """Название для списков: из скрипта или по имени файла"""
+        return self.title or Path(self.path).stem
+
+
+def read_header(path, limit: int = HEADER_LIMIT) -> bytes:
+    """
+    Текстовый заголовок файла: не больше limit байт, до первого NUL
+    байта (начало двоичных данных); неполная последняя строка отбрасывается
+    """
+    with open(path, "rb") as f:
+        data = f.read(limit)
+    binary = data.find(b"\0")
+    if binary >= 0:
+        data = data[:binary]
+    elif len(data) < limit:
+        return data
+    # Обрезанный на границе чтения или двоичных данных хвост
+    newline = data.rfind(b"\n")
+    return data[:newline + 1] if newline >= 0 else data
+
+
+def parse_header(path: str, header: bytes) -> ScriptInfo:
+    """Разбор заголовка за один проход по строкам"""
+    text = header.decode("utf-8", errors="replace")
+    lines = text.splitlines()
+    shebang = lines[0].strip() if lines else ""
+    
+    info_lines: List[str] = []
+    dependency_lines: List[str] = []
+    executables: List[str] = []
+    dependencies: Dict[str, None] = {}
+    assignments: Dict[str, str] = {}
+    comment_fields: Dict[str, str] = {}
+    makeself = False
+    
+    for line in lines:
+        if _INFO_RE.search(line) and len(info_lines) < SECTION_LINES:
+            info_lines.append(line)
+        if _DEPENDENCY_RE.search(line):
+            if len(dependency_lines) < SECTION_LINES:
+                dependency_lines.append(line)
+            if not line.lstrip().startswith("#"):
+                for match in _DEPENDENCY_WORD_RE.finditer(line):
+                    dependencies.setdefault(match.group(1).lower(), None)
+        if _EXECUTABLE_RE.search(line) and len(executables) < SECTION_LINES:
+            executables.append(line)
+        
+        if line.startswith("#"):
+            if _MAKESELF_RE.search(line):
+                makeself = True
+                continue
+            match = _COMMENT_FIELD_RE.match(line)
+            if match:
+                comment_fields.setdefault(match.group(1).lower(), match.group(2))
+            continue
+        match = _ASSIGN_RE.match(line)
+        if match:
+            # Первое присваивание - значение по умолчанию, дальше обычно ветвления
+            assignments.setdefault(match.group(1), match.group(3).strip())
+        elif line.strip() == _MAKESELF_END:
+            break
+    
+    if not makeself and all(name in assignments for name in _MAKESELF_VARS):
+        makeself = True
+    
+    if makeself:
+        script = assignments.get("script", "")
+        mojo = "mojo" in script.lower() or assignments.get("targetdir", "").lower() == "mojosetup"
+        script_format = FORMAT_MOJOSETUP if mojo else FORMAT_MAKESELF
+        title = _GOG_SUFFIX_RE.sub("", assignments.get("label", ""))
+        version = ""
+    else:
+        script_format = FORMAT_SCRIPT
+        title = _first(assignments, _TITLE_VARS) or comment_fields.get("title") \
+            or comment_fields.get("game") or comment_fields.get("name", "")
+        version = _first(assignments, _VERSION_VARS) or comment_fields.get("version", "")
+    
+    if "$" in title:
+        title = ""
+    if not version or "$" in version:
+        # Версия установщиков GOG есть только в имени файла (game_1_2_3_45678.sh)
+        matches = _FILENAME_VERSION_RE.findall(Path(path).stem)
+        version = matches[-1].replace("_", ".") if matches else ""
+    
+    return ScriptInfo(str(path), script_format, shebang, title, version,
+                      list(dependencies), info_lines, dependency_lines,
+                      executables, len(header))
+
+
+def _first(assignments: Dict[str, str], names) -> str:
+    for name in names:
+        value = assignments.get(name)
+        if value:
+            return value
+    return ""
+
+
+class ScriptCache:
+    """
+    Кэш результатов анализа в JSON файле
+    
+    Запись действительна, пока у файла те же inode, размер и mtime.
+    Сохранение объединяется с текущим содержимым файла, как у снимка
+    панелей, поэтому bash скрипты и оба GUI пользуются одним кэшем.
+    """
+    
+    def __init__(self, path=CACHE_FILE, limit: int = CACHE_LIMIT):
+        self.path = Path(path)
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._dirty: Dict[str, Dict] = {}
+    
+    def get(self, path: str, st: os.stat_result) -> Optional[ScriptInfo]:
+        """Результат для файла с данным stat (None - нет или устарел)"""
+        with self._lock:
+            entry = self._load().get(path)
+            if entry is None or entry.get("key") != _stat_key(st):
+                return None
+            try:
+                info = ScriptInfo(**entry["info"])
+            except (KeyError, TypeError):
+                return None
+            entry["used"] = time.time()
+            return info
+    
+    def put(self, info: ScriptInfo, st: os.stat_result):
+        """Запомнить результат (записывается в файл вызовом save())"""
+        entry = {"key": _stat_key(st), "info": info._asdict(), "used": time.time()}
+        with self._lock:
+            self._load()[info.path] = entry
+            self._dirty[info.path] = entry
+    
+    def save(self):
+        """Запись новых результатов в файл кэша"""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = self._read()
+            entries.update(self._dirty)
+            if len(entries) > self.limit:
+                recent = sorted(entries, key=lambda key: entries[key].get("used", 0))
+                for key in recent[:len(entries) - self.limit]:
+                    del entries[key]
+            self._entries = entries
+            self._dirty = {}
+            self._write(entries)
+    
+    def clear(self):
+        """Удаление кэша"""
+        with self._lock:
+            self._entries = {}
+            self._dirty = {}
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+    
+    def _load(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            self._entries = self._read()
+        return self._entries
+    
+    def _read(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return {}
+        entries = data.get("entries")
+        return entries if isinstance(entries, dict) else {}
+    
+    def _write(self, entries: Dict[str, Dict]):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=str(self.path.parent), prefix=".gamescript-")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "entries": entries}, f,
+                          ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except (OSError, TypeError, ValueError):
+            os.unlink(tmp_path)
+
+
+def _stat_key(st: os.stat_result) -> List[int]:
+    return [st.st_ino, st.st_size, st.st_mtime_ns]
+
+
+_cache: Optional[ScriptCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> ScriptCache:
+    """Общий кэш анализа для процесса"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ScriptCache()
+        return _cache
+
+
+def analyze(path, cache: Optional[ScriptCache] = None, save: bool = True) -> ScriptInfo:
+    """
+    Анализ скрипта игры (с кэшем)
+    
+    Args:
+        path: Путь к скрипту
+        cache: Кэш результатов (None - общий кэш процесса)
+        save: Сразу записать новый результат в файл кэша; при анализе
+              множества файлов удобнее один cache.save() в конце
+    
+    Raises:
+        OSError: Файл недоступен
+    """
+    path = os.path.abspath(path)
+    cache = cache or get_cache()
+    st = os.stat(path)
+    info = cache.get(path, st)
+    if info is not None:
+        return info
+    
+    info = parse_header(path, read_header(path))
+    cache.put(info, st)
+    if save:
+        cache.save()
+    return info
+
+
+def format_report(info: ScriptInfo) -> List[str]:
+    """Строки отчёта для вывода в терминал"""
+    report = [f"Формат: {FORMAT_NAMES.get(info.format, info.format)}"]
+    if info.title:
+        report.append(f"Название: {info.title}")
+    if info.version:
+        report.append(f"Версия: {info.version}")
+    if info.standard_shebang:
+        report.append(f"Shebang: {info.shebang}")
+    else:
+        report.append(f"Нестандартный shebang: {info.shebang}")
+    for caption, lines in (("Информация об игре:", info.info_lines),
+                           ("Возможные зависимости:", info.dependency_lines),
+                           ("Исполняемые файлы:", info.executables)):
+        if lines:
+            report.append(caption)
+            report.extend(f"  {line}" for line in lines)
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Анализ .sh скриптов игр")
+    sub = parser.add_subparsers(dest="command", required=True)
+    
+    analyze_parser = sub.add_parser("analyze", help="Формат, название и зависимости скрипта")
+    analyze_parser.add_argument("paths", nargs="+")
+    analyze_parser.add_argument("--json", action="store_true", help="Вывод в JSON")
+    analyze_parser.add_argument("--no-cache", action="store_true",
+                                help="Не использовать кэш результатов")
+    
+    sub.add_parser("clear", help="Удалить кэш результатов")
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == "clear":
+        get_cache().clear()
+        return 0
+    
+    cache = ScriptCache(path=os.devnull) if args.no_cache else get_cache()
+    status = 0
+    results = []
+    for path in args.paths:
+        try:
+            info = analyze(path, cache=cache, save=False)
+        except OSError as e:
+            print(f"{path}: {e.strerror or e}", file=sys.stderr)
+            status = 1
+            continue
+        if args.json:
+            results.append(info._asdict())
+        else:
+            if len(args.paths) > 1:
+                print(f"{info.path}:")
+            print("\n".join(format_report(info)))
+    if not args.no_cache:
+        cache.save()
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
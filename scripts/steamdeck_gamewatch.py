@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+Steam Deck Enhancement Pack - Отслеживание новых файлов игр
+Фоновый процесс следит через inotify за каталогами поиска игр (Загрузки,
+Games, Рабочий стол, SD карта и носители в /run/media) и обновляет индекс
+игр, когда .sh или .rar файл появился или дописан. События одной пачки
+(распаковка, копирование) объединяются в одно обновление, после которого
+GUI получают уведомление и перечитывают индекс без поиска по диску.
+Автор: @ncux11
+Версия: динамическая (читается из VERSION)
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import json
+import os
+import select
+import struct
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set
+
+from steamdeck_gameindex import GAME_KINDS, GameIndex, get_index, search_roots
+from steamdeck_scan import is_under, outermost
+
+STATE_DIR = Path.home() / ".steamdeck_gui"
+
+# Файл-отметка изменения индекса: GUI следят за его заменой
+CHANGE_STAMP = STATE_DIR / "game_index.changed"
+
+# Блокировка единственного экземпляра процесса отслеживания
+LOCK_FILE = STATE_DIR / "gamewatch.lock"
+
+# Тишина после последнего события перед обновлением индекса (секунды)
+SETTLE_DELAY = 1.0
+
+# Максимальная задержка обновления при непрерывном потоке событий (секунды)
+MAX_BATCH_DELAY = 5.0
+
+# Глубина отслеживаемых каталогов от корня (файлы глубже находит поиск)
+WATCH_DEPTH = 3
+
+MOUNTS_FILE = "/proc/self/mounts"
+
+# Флаги inotify (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_UNMOUNT = 0x00002000
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# События каталогов поиска: файл дописан, перемещён, создан или удалён
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+              IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyEvent(NamedTuple):
+    """Событие inotify"""
+    wd: int
+    mask: int
+    cookie: int
+    name: str
+
+
+class Inotify:
+    """Минимальная обёртка над inotify(7) через libc"""
+    
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._add = libc.inotify_add_watch
+        self._add.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm = libc.inotify_rm_watch
+        self._rm.argtypes = [ctypes.c_int, ctypes.c_int]
+        
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+    
+    def fileno(self) -> int:
+        return self.fd
+    
+    def add_watch(self, path: str, mask: int) -> int:
+        """Добавление наблюдения; возвращает дескриптор наблюдения"""
+        wd = self._add(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+    
+    def remove_watch(self, wd: int):
+        """Снятие наблюдения (ошибка для уже снятого игнорируется)"""
+        self._rm(self.fd, wd)
+    
+    def read(self) -> List[InotifyEvent]:
+        """Все накопленные события (без ожидания)"""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            events.append(InotifyEvent(wd, mask, cookie, os.fsdecode(name)))
+        return events
+    
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def watch_roots() -> List[str]:
+    """Корни отслеживания: все каталоги поиска .sh и .rar"""
+    return outermost(search_roots("sh") + search_roots("rar"))
+
+
+def _is_game_file(name: str) -> bool:
+    return not name.startswith(".") and name.endswith(tuple(GAME_KINDS.values()))
+
+
+def _wait(fds: Iterable, timeout: Optional[float]) -> Set[int]:
+    # Готовые дескрипторы; без таймаута процесс спит до события
+    poller = select.poll()
+    for fd, flags in fds:
+        poller.register(fd, flags)
+    try:
+        ready = poller.poll(None if timeout is None else max(0, int(timeout * 1000)))
+    except InterruptedError:
+        return set()
+    return {fd for fd, _ in ready}
+
+
+class GameWatcher:
+    """
+    Отслеживание каталогов поиска и обновление индекса игр
+    
+    Каталоги отслеживаются на глубину WATCH_DEPTH, новые подкаталоги
+    добавляются по мере создания. Смена точек монтирования (вставлена или
+    извлечена SD карта, флешка) отслеживается через poll() на
+    /proc/self/mounts. Изменившиеся каталоги копятся до SETTLE_DELAY тишины
+    (не дольше MAX_BATCH_DELAY) и обновляются одним GameIndex.scan().
+    """
+    
+    def __init__(self, index: Optional[GameIndex] = None,
+                 roots: Optional[Callable[[], List[str]]] = None,
+                 on_change: Optional[Callable[[List[str]], None]] = None,
+                 settle: float = SETTLE_DELAY, max_delay: float = MAX_BATCH_DELAY):
+        """
+        Args:
+            index: Индекс игр (по умолчанию общий)
+            roots: Функция, возвращающая текущие корни (по умолчанию watch_roots)
+            on_change: Вызывается после обновления индекса со списком каталогов
+                       (по умолчанию - запись отметки для GUI)
+        """
+        self.index = index or get_index()
+        self.roots = roots or watch_roots
+        self.on_change = on_change or notify_changed
+        self.settle = settle
+        self.max_delay = max_delay
+        
+        self._inotify: Optional[Inotify] = None
+        self._watches: Dict[int, str] = {}
+        self._paths: Dict[str, int] = {}
+        self._current_roots: List[str] = []
+        self._dirty: Set[str] = set()
+        self._first_event: Optional[float] = None
+        self._last_event = 0.0
+        self._stop_read, self._stop_write = os.pipe()
+    
+    def run(self):
+        """Цикл отслеживания до вызова stop()"""
+        self._inotify = Inotify()
+        try:
+            with open(MOUNTS_FILE, "rb") as mounts:
+                mounts.read()
+                # При запуске индекс по всем корням обновляется сразу
+                self._sync_roots()
+                self._flush()
+                self._loop(mounts)
+        finally:
+            self._inotify.close()
+            self._watches.clear()
+            self._paths.clear()
+    
+    def stop(self):
+        """Остановка цикла (из другого потока или обработчика сигнала)"""
+        try:
+            os.write(self._stop_write, b"x")
+        except OSError:
+            pass
+    
+    def _loop(self, mounts):
+        fds = [
+            (self._inotify.fileno(), select.POLLIN),
+            # Изменение таблицы монтирования отмечается POLLPRI/POLLERR
+            (mounts.fileno(), select.POLLPRI | select.POLLERR),
+            (self._stop_read, select.POLLIN),
+        ]
+        while True:
+            ready = _wait(fds, self._timeout())
+            if self._stop_read in ready:
+                return
+            if mounts.fileno() in ready:
+                mounts.seek(0)
+                mounts.read()
+                self._sync_roots()
+            if self._inotify.fileno() in ready:
+                self._handle(self._inotify.read())
+            if self._due():
+                self._flush()
+    
+    def _timeout(self) -> Optional[float]:
+        if self._first_event is None:
+            return None
+        now = time.monotonic()
+        return min(self._last_event + self.settle, self._first_event + self.max_delay) - now
+    
+    def _due(self) -> bool:
+        return self._first_event is not None and self._timeout() <= 0
+    
+    def _mark(self, directory: str):
+        self._dirty.add(directory)
+        now = time.monotonic()
+        self._last_event = now
+        if self._first_event is None:
+            self._first_event = now
+    
+    def _flush(self):
+        dirty = outermost(self._dirty)
+        self._dirty.clear()
+        self._first_event = None
+        if not dirty:
+            return
+        try:
+            self.index.scan(dirty)
+        except Exception as e:
+            print(f"Ошибка обновления индекса игр: {e}", file=sys.stderr)
+            return
+        self.on_change(dirty)
+    
+    def _sync_roots(self):
+        """Приведение наблюдений к текущим корням (носители подключены или извлечены)"""
+        roots = self.roots()
+        for root in self._current_roots:
+            if root not in roots:
+                self._unwatch_tree(root)
+        for root in roots:
+            if root not in self._current_roots or root not in self._paths:
+                self._watch_tree(root, root)
+                # Новый носитель (или первый запуск) - обновить индекс по корню
+                self._mark(root)
+        self._current_roots = roots
+    
+    def _root_of(self, path: str) -> Optional[str]:
+        for root in self._current_roots:
+            if is_under(path, root):
+                return root
+        return None
+    
+    def _watch_tree(self, directory: str, root: str):
+        depth = 0 if directory == root else directory[len(root):].count("/")
+        stack = [(directory, depth)]
+        while stack:
+            path, depth = stack.pop()
+            if path in self._paths:
+                continue
+            try:
+                wd = self._inotify.add_watch(path, WATCH_MASK)
+            except OSError as e:
+                if e.errno == errno.ENOSPC:
+                    print(f"Достигнут лимит наблюдений inotify: {path}", file=sys.stderr)
+                    return
+                continue
+            self._watches[wd] = path
+            self._paths[path] = wd
+            if depth + 1 >= WATCH_DEPTH:
+                continue
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append((entry.path, depth + 1))
+            except OSError:
+                continue
+    
+    def _unwatch_tree(self, directory: str):
+        for path in [path for path in self._paths if is_under(path, directory)]:
+            wd = self._paths.pop(path)
+            self._watches.pop(wd, None)
+            self._inotify.remove_watch(wd)
+    
+    def _forget(self, wd: int):
+        path = self._watches.pop(wd, None)
+        if path is not None and self._paths.get(path) == wd:
+            del self._paths[path]
+    
+    def _handle(self, events: List[InotifyEvent]):
+        for event in events:
+            if event.mask & IN_Q_OVERFLOW:
+                # События потеряны: обновить всё (только изменившиеся каталоги)
+                for root in self._current_roots:
+                    self._mark(root)
+                continue
+            if event.mask & IN_IGNORED:
+                self._forget(event.wd)
+                continue
+            directory = self._watches.get(event.wd)
+            if directory is None:
+                continue
+            if event.mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_UNMOUNT):
+                # Каталог удалён или перемещён - его содержимое обновит родитель
+                self._mark(os.path.dirname(directory))
+                continue
+            
+            path = os.path.join(directory, event.name)
+            if event.mask & IN_ISDIR:
+                if event.mask & IN_MOVED_FROM:
+                    self._unwatch_tree(path)
+                elif event.mask & (IN_CREATE | IN_MOVED_TO):
+                    root = self._root_of(path)
+                    if root is not None:
+                        self._watch_tree(path, root)
+                # Новый, удалённый или перемещённый каталог игры
+                self._mark(directory)
+            elif _is_game_file(event.name):
+                # IN_CREATE пустого файла не ждём: обновим по IN_CLOSE_WRITE
+                if not event.mask & IN_CREATE:
+                    self._mark(directory)
+
+
+def notify_changed(directories: List[str], stamp: Path = CHANGE_STAMP):
+    """Отметка изменения индекса для GUI (атомарная замена файла)"""
+    try:
+        stamp.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = stamp.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"time": time.time(), "dirs": directories},
+                                       ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, stamp)
+    except OSError:
+        pass
+
+
+class ChangeListener:
+    """
+    Уведомления GUI об изменении индекса игр
+    
+    Поток ждёт замены файла-отметки через inotify (без периодических
+    пробуждений) и вызывает callback() из своего потока: Tk передаёт вызов
+    через UIDispatcher, Qt - через сигнал с QueuedConnection.
+    """
+    
+    def __init__(self, callback: Callable[[], None], stamp: Path = CHANGE_STAMP):
+        self.callback = callback
+        self.stamp = Path(stamp)
+        self._thread: Optional[threading.Thread] = None
+        self._stop_read: Optional[int] = None
+        self._stop_write: Optional[int] = None
+    
+    def start(self) -> bool:
+        """Запуск потока; False, если inotify недоступен"""
+        if self._thread is not None:
+            return True
+        try:
+            self.stamp.parent.mkdir(parents=True, exist_ok=True)
+            inotify = Inotify()
+            inotify.add_watch(str(self.stamp.parent), IN_MOVED_TO | IN_CLOSE_WRITE | IN_ONLYDIR)
+        except (OSError, AttributeError):
+            return False
+        self._stop_read, self._stop_write = os.pipe()
+        self._thread = threading.Thread(target=self._run, args=(inotify,),
+                                        name="game-index-listener", daemon=True)
+        self._thread.start()
+        return True
+    
+    def stop(self):
+        """Остановка потока"""
+        if self._thread is None:
+            return
+        os.write(self._stop_write, b"x")
+        self._thread.join(timeout=2)
+        self._thread = None
+        os.close(self._stop_read)
+        os.close(self._stop_write)
+    
+    def _run(self, inotify: Inotify):
+        fds = [(inotify.fileno(), select.POLLIN), (self._stop_read, select.POLLIN)]
+        try:
+            while True:
+                ready = _wait(fds, None)
+                if self._stop_read in ready:
+                    return
+                if any(event.name == self.stamp.name for event in inotify.read()):
+                    self.callback()
+        finally:
+            inotify.close()
+
+
+def is_running(lock_file: Path = LOCK_FILE) -> bool:
+    """Запущен ли процесс отслеживания (его блокировка занята)"""
+    import fcntl
+    try:
+        with open(lock_file, "a") as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return True
+            fcntl.flock(f, fcntl.LOCK_UN)
+    except OSError:
+        return False
+    return False
+
+
+def ensure_running() -> bool:
+    """
+    Запуск процесса отслеживания в фоне, если он ещё не запущен
+    
+    Процесс не зависит от запустившего его GUI и продолжает работать
+    после его закрытия. Returns: True, если процесс запущен или уже работал
+    """
+    if is_running():
+        return True
+    try:
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve())],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+    except OSError:
+        return False
+    return True
+
+
+def main() -> int:
+    import fcntl
+    import signal
+    
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+    lock = open(LOCK_FILE, "a")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        print("Отслеживание файлов игр уже запущено")
+        return 0
+    
+    watcher = GameWatcher()
+    signal.signal(signal.SIGTERM, lambda *args: watcher.stop())
+    signal.signal(signal.SIGINT, lambda *args: watcher.stop())
+    try:
+        watcher.run()
+    finally:
+        watcher.index.close()
+        lock.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,16 +7,17 @@ Steam Deck Enhancement Pack GUI
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog, scrolledtext, simpledialog
+from tkinter import ttk, messagebox, scrolledtext
 import subprocess
 import threading
 import os
 import sys
 import time
-import queue
-import getpass
+from collections import deque
 from pathlib import Path
-from datetime import datetime
+
+# Момент запуска (если время процесса недоступно из /proc)
+STARTED_AT = time.perf_counter()
 
 # Импорт системы логирования
 import sys
@@ -25,17 +26,37 @@ scripts_dir = Path(__file__).parent
 if str(scripts_dir) not in sys.path:
     sys.path.insert(0, str(scripts_dir))
 
-try:
-    from steamdeck_logger import SteamDeckLogger  # type: ignore
-except ImportError:
-    # Fallback если модуль логирования недоступен
-    class SteamDeckLogger:
-        def log_operation(self, operation, status, details=""): pass
-        def log_success(self, operation, details=""): pass
-        def log_error(self, operation, details=""): pass
-        def log_warning(self, operation, details=""): pass
-        def log_info(self, operation, details=""): pass
-        def get_log_path(self): return ""
+
+# Fallback если модуль логирования недоступен
+class NullLogger:
+    store = None
+    
+    def log_operation(self, operation, status, details="", **fields): pass
+    def log_success(self, operation, details="", **fields): pass
+    def log_error(self, operation, details="", **fields): pass
+    def log_warning(self, operation, details="", **fields): pass
+    def log_info(self, operation, details="", **fields): pass
+    def get_log_path(self): return ""
+    def export_logs(self, path): return False
+    def flush(self, timeout=None): return True
+    def shutdown(self): pass
+
+
+def create_logger():
+    """Создание логгера (модуль logging загружается только при первом обращении)"""
+    try:
+        from steamdeck_logger import get_logger  # type: ignore
+    except ImportError:
+        return NullLogger()
+    return get_logger()
+
+from steamdeck_scheduler import (  # type: ignore
+    get_scheduler, PRIORITY_NORMAL, PRIORITY_LOW,
+    RESOURCE_DISK, RESOURCE_NETWORK, RESOURCE_PRIVILEGED
+)
+from steamdeck_progress import ProgressTracker, run_with_progress  # type: ignore
+import steamdeck_probe  # type: ignore
+from steamdeck_snapshot import get_snapshot  # type: ignore
 
 
 # Специфичные исключения для Steam Deck Enhancement Pack
@@ -71,6 +92,218 @@ class ConfigurationError(SteamDeckError):
         self.config_file = config_file
         super().__init__(f"Ошибка конфигурации: {config_file}")
 
+
+# Параметры конвейера вывода скриптов
+OUTPUT_FLUSH_FPS = 20       # Частота отрисовки накопленного вывода (кадров в секунду)
+OUTPUT_MAX_LINES = 5000     # Максимум строк, хранимых в каждой консоли
+
+# Строк на странице просмотра лога операций
+LOG_PAGE_LINES = 200
+
+# Период сводки по операциям на вкладке "Логи" (секунды)
+OPERATION_STATS_PERIOD = 7 * 24 * 3600
+
+# Записей системного журнала, добавляемых в консоль за один кадр
+JOURNAL_DRAIN_LIMIT = 500
+
+# Источники вкладки "Логи" перед логами операций по дням
+LOG_SOURCES = ["Система (journalctl)", "Операции: сводка за неделю"]
+
+# Классы ресурсов скриптов: тяжёлые задачи одного класса выполняются по одной
+SCRIPT_RESOURCES = {
+    "steamdeck_cleanup.sh": RESOURCE_DISK,
+    "steamdeck_backup.sh": RESOURCE_DISK,
+    "steamdeck_steamrip.sh": RESOURCE_DISK,
+    "steamdeck_native_games.sh": RESOURCE_DISK,
+    "steamdeck_install_apps.sh": RESOURCE_NETWORK,
+    "steamdeck_update.sh": RESOURCE_NETWORK,
+    "steamdeck_steamgriddb.sh": RESOURCE_NETWORK,
+    "steamdeck_setup.sh": RESOURCE_PRIVILEGED,
+}
+
+
+class UIDispatcher:
+    """
+    Передача вызовов из рабочих потоков в главный поток Tk.
+    
+    Цикл Tk просыпается только когда есть сообщения: рабочий поток кладёт
+    вызов в очередь и пишет байт в self-pipe, за которым следит
+    createfilehandler. Вызовы с ключом (post) объединяются: из пачки
+    сообщений прогресса выполняется только последнее.
+    """
+    
+    def __init__(self, root, fallback_interval_ms=100):
+        """
+        Args:
+            root: Корневое окно Tk
+            fallback_interval_ms: Период опроса, если createfilehandler недоступен
+        """
+        self.root = root
+        self.fallback_interval_ms = fallback_interval_ms
+        self._pending = deque()
+        self._latest = {}
+        self._lock = threading.Lock()
+        self._signalled = False
+        self._read_fd, self._write_fd = os.pipe()
+        os.set_blocking(self._read_fd, False)
+        os.set_blocking(self._write_fd, False)
+        
+        try:
+            self.root.tk.createfilehandler(self._read_fd, tk.READABLE, self._on_readable)
+            self._polling = False
+        except (AttributeError, tk.TclError):
+            # Tk без поддержки файловых обработчиков (не Unix): редкий опрос
+            self._polling = True
+            self.root.after(self.fallback_interval_ms, self._poll)
+    
+    def call(self, func, *args):
+        """Выполнить func(*args) в главном потоке (безопасно из любого потока)"""
+        with self._lock:
+            self._pending.append([func, args])
+            # Объединение не должно переставлять сообщения через этот вызов
+            self._latest.clear()
+            wake = self._mark_signalled()
+        if wake:
+            self._wake()
+    
+    def post(self, key, func, *args):
+        """
+        Выполнить func(*args) в главном потоке, заменяя ещё не выполненный
+        вызов с тем же ключом (для частых обновлений прогресса)
+        """
+        with self._lock:
+            entry = self._latest.get(key)
+            if entry is not None:
+                entry[0], entry[1] = func, args
+                return
+            entry = [func, args]
+            self._latest[key] = entry
+            self._pending.append(entry)
+            wake = self._mark_signalled()
+        if wake:
+            self._wake()
+    
+    def close(self):
+        """Снять обработчик и закрыть self-pipe"""
+        if not self._polling:
+            try:
+                self.root.tk.deletefilehandler(self._read_fd)
+            except tk.TclError:
+                pass
+        for fd in (self._read_fd, self._write_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+    
+    def _mark_signalled(self):
+        """Нужно ли будить цикл Tk (под блокировкой)"""
+        if self._signalled:
+            return False
+        self._signalled = True
+        return not self._polling
+    
+    def _wake(self):
+        try:
+            os.write(self._write_fd, b"\0")
+        except (BlockingIOError, OSError):
+            pass
+    
+    def _on_readable(self, fd, mask):
+        try:
+            while os.read(self._read_fd, 4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+        self._drain()
+    
+    def _poll(self):
+        self._drain()
+        self.root.after(self.fallback_interval_ms, self._poll)
+    
+    def _drain(self):
+        """Выполнение накопленных вызовов (главный поток)"""
+        with self._lock:
+            pending, self._pending = self._pending, deque()
+            self._latest.clear()
+            self._signalled = False
+        
+        for func, args in pending:
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"Ошибка обработчика GUI: {e}")
+
+
+class OutputBuffer:
+    """
+    Общий буфер вывода скриптов.
+    
+    Рабочие потоки только добавляют строки под блокировкой. Главный поток Tk
+    не чаще OUTPUT_FLUSH_FPS раз в секунду забирает накопленное и вставляет
+    его одним блоком в активную консоль, обрезая её до max_lines строк.
+    """
+    
+    def __init__(self, root, dispatcher, get_console, fps=OUTPUT_FLUSH_FPS,
+                 max_lines=OUTPUT_MAX_LINES):
+        """
+        Args:
+            root: Корневое окно Tk
+            dispatcher: UIDispatcher для передачи сброса в главный поток
+            get_console: Функция, возвращающая текущую активную консоль (или None)
+            fps: Частота сброса буфера в консоль
+            max_lines: Лимит строк в каждой консоли
+        """
+        self.root = root
+        self.dispatcher = dispatcher
+        self.get_console = get_console
+        self.interval_ms = max(1, int(1000 / fps))
+        self.max_lines = max_lines
+        # Всё, что старше max_lines, всё равно будет обрезано в консоли
+        self._pending = deque(maxlen=max_lines)
+        self._lock = threading.Lock()
+        self._scheduled = False
+    
+    def write(self, text):
+        """Добавить строку в буфер (безопасно из любого потока)"""
+        with self._lock:
+            self._pending.append(text)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        # Один отложенный сброс на кадр, а не по callback на строку
+        self.dispatcher.call(self._schedule_flush)
+    
+    def _schedule_flush(self):
+        """Отложенный сброс (главный поток: root.after вызывается только из него)"""
+        self.root.after(self.interval_ms, self.flush)
+    
+    def flush(self):
+        """Сброс накопленных строк в активную консоль (главный поток)"""
+        with self._lock:
+            lines = list(self._pending)
+            self._pending.clear()
+            self._scheduled = False
+        
+        if not lines:
+            return
+        
+        console = self.get_console()
+        if console is None or not console.winfo_exists():
+            return
+        
+        console.insert(tk.END, "\n".join(lines) + "\n")
+        self.trim(console)
+        console.see(tk.END)
+    
+    def trim(self, widget):
+        """Обрезка консоли до max_lines последних строк"""
+        line_count = int(widget.index('end-1c').split('.')[0]) - 1
+        excess = line_count - self.max_lines
+        if excess > 0:
+            widget.delete('1.0', f'{excess + 1}.0')
+
+
 class SteamDeckGUI:
     def __init__(self, root):
         self.root = root
@@ -96,26 +329,97 @@ class SteamDeckGUI:
         self.project_root = Path(__file__).parent.parent
         self.output_text = None
         self.running_process = None
-        self.progress_queue = queue.Queue()
         self.progress_bar = None
         self.progress_label = None
-        self.sudo_password = None
-        self.sudo_authenticated = False
         
-        # Инициализация логгера
-        self.logger = SteamDeckLogger()
+        # Привилегированный помощник: sudo один раз за сеанс (создаётся при первом запросе)
+        self.privileged = None
+        
+        # Фоновое чтение системного журнала для вкладки "Логи"
+        self.journal = None
+        
+        # Уведомления об изменении индекса игр (вкладка "Игры" создаётся при открытии)
+        self.game_watch = None
+        self.games_info = None
+        
+        # Логгер создаётся при первом обращении (после первой отрисовки)
+        self._logger = None
+        
+        # Передача вызовов из рабочих потоков в главный поток
+        self.dispatcher = UIDispatcher(self.root)
+        
+        # Буфер вывода скриптов и консоли вкладок
+        self.notebook = None
+        self.tab_builders = {}
+        self.utilities_tab = None
+        self.consoles = {}
+        self.output_buffer = OutputBuffer(self.root, self.dispatcher, self.get_active_console)
+        
+        # Общий планировщик запуска скриптов
+        self.scheduler = get_scheduler()
+        
+        # Снимок полей панелей: показывается сразу, обновляется в фоне по TTL
+        self.snapshot = get_snapshot()
         
         # Получаем версию из файла VERSION
         self.version = self.get_version()
         
         self.create_widgets()
         
-        # Запускаем обработчик прогресса
-        self.root.after(100, self.process_progress_queue)
+        # Время до первой отрисовки окна (важно при запуске из игрового режима Steam)
+        self.root.bind("<Expose>", self.report_first_paint)
         
         # Автоматическая проверка обновлений при запуске (через 2 секунды)
         self.root.after(2000, self.auto_check_updates)
     
+    @property
+    def logger(self):
+        """Логгер операций"""
+        if self._logger is None:
+            self._logger = create_logger()
+        return self._logger
+    
+    def report_first_paint(self, event=None):
+        """Отчёт о времени от запуска процесса до первой отрисовки окна"""
+        self.root.unbind("<Expose>")
+        self.root.update_idletasks()
+        
+        elapsed = steamdeck_probe.process_age()
+        if elapsed is None:
+            elapsed = time.perf_counter() - STARTED_AT
+        message = f"Время до первой отрисовки: {elapsed:.2f} с"
+        print(f"⏱ {message}")
+        self.logger.log_info("Запуск GUI", message)
+        
+        # Отслеживание новых файлов игр - после первой отрисовки, в фоне
+        self.scheduler.submit(self.start_game_watch, name="game watch",
+                              priority=PRIORITY_LOW, key="game-watch")
+    
+    def start_game_watch(self):
+        """Запуск процесса отслеживания файлов игр и подписка на изменения индекса"""
+        from steamdeck_gamewatch import ChangeListener, ensure_running  # type: ignore
+        
+        if self.game_watch is not None:
+            return
+        ensure_running()
+        listener = ChangeListener(
+            lambda: self.dispatcher.post("games-changed", self.on_games_changed)
+        )
+        if listener.start():
+            self.game_watch = listener
+    
+    def stop_game_watch(self):
+        """Отписка от изменений индекса (процесс отслеживания продолжает работать)"""
+        if self.game_watch is not None:
+            self.game_watch.stop()
+            self.game_watch = None
+    
+    def on_games_changed(self):
+        """Индекс игр обновлён: перечитываем информацию вкладки "Игры" (главный поток)"""
+        if self.games_info is not None and self.games_info.winfo_exists():
+            self.load_cached_field("games_info", self.games_info,
+                                   self.compute_games_info, force=True)
+    
     def get_version(self):
         """Получение версии из файла VERSION"""
         try:
@@ -149,28 +453,36 @@ class SteamDeckGUI:
         # Создание вкладок
         notebook = ttk.Notebook(self.root)
         notebook.pack(fill='both', expand=True, padx=10, pady=10)
-        
-        # Вкладка "Система"
-        self.create_system_tab(notebook)
-        
-        # Вкладка "Игры"
-        self.create_games_tab(notebook)
-        
-        # Вкладка "Оптимизация"
-        self.create_optimization_tab(notebook)
-        
-        # Вкладка "Утилиты"
-        self.create_utilities_tab(notebook)
-        
-        # Вкладка "Offline"
-        self.create_offline_tab(notebook)
-        
-        # Вкладка "Обложки"
-        self.create_artwork_tab(notebook)
-        
-        # Вкладка "Логи"
-        self.create_logs_tab(notebook)
-        
+        self.notebook = notebook
+        
+        # Содержимое вкладки строится при первом открытии (при запуске - только первой)
+        tabs = [
+            ("Система", self.create_system_tab),
+            ("Игры", self.create_games_tab),
+            ("Оптимизация", self.create_optimization_tab),
+            ("Утилиты", self.create_utilities_tab),
+            ("Offline", self.create_offline_tab),
+            ("🎨 Обложки", self.create_artwork_tab),
+            ("Логи", self.create_logs_tab),
+        ]
+        for title, builder in tabs:
+            frame = ttk.Frame(notebook)
+            notebook.add(frame, text=title)
+            self.tab_builders[str(frame)] = (frame, builder)
+            if builder == self.create_utilities_tab:
+                self.utilities_tab = str(frame)
+        
+        self.build_tab(notebook.select())
+        notebook.bind("<<NotebookTabChanged>>",
+                      lambda event: self.build_tab(notebook.select()))
+        
+    def build_tab(self, tab_id):
+        """Построение содержимого вкладки при первом открытии"""
+        entry = self.tab_builders.pop(tab_id, None)
+        if entry is not None:
+            frame, builder = entry
+            builder(frame)
+    
     def create_menu(self):
         menubar = tk.Menu(self.root)
         self.root.config(menu=menubar)
@@ -186,10 +498,8 @@ class SteamDeckGUI:
         help_menu.add_command(label="О программе", command=self.show_about)
         help_menu.add_command(label="Документация", command=self.open_documentation)
         
-    def create_system_tab(self, notebook):
+    def create_system_tab(self, system_frame):
         # Вкладка "Система"
-        system_frame = ttk.Frame(notebook)
-        notebook.add(system_frame, text="Система")
         
         # Заголовок
         title_label = ttk.Label(system_frame, text="Управление системой Steam Deck", 
@@ -225,7 +535,7 @@ class SteamDeckGUI:
                   width=20).pack(side='left', padx=5)
         
         ttk.Button(row2, text="Статус системы", 
-                  command=lambda: self.run_script("steamdeck_setup.sh", "status"),
+                  command=lambda: self.run_script_function("steamdeck_setup.sh", "show_status"),
                   width=20).pack(side='left', padx=5)
         
         ttk.Button(row2, text="Сброс sudo", 
@@ -283,14 +593,13 @@ class SteamDeckGUI:
         self.system_info = scrolledtext.ScrolledText(info_frame, height=10, 
                                                    bg='#1e1e1e', fg='white')
         self.system_info.pack(fill='both', expand=True, padx=5, pady=5)
+        self.register_console(system_frame, self.system_info)
         
         # Загружаем информацию о системе
         self.load_system_info()
         
-    def create_games_tab(self, notebook):
+    def create_games_tab(self, games_frame):
         # Вкладка "Игры"
-        games_frame = ttk.Frame(notebook)
-        notebook.add(games_frame, text="Игры")
         
         # Заголовок
         title_label = ttk.Label(games_frame, text="Управление играми", 
@@ -396,14 +705,13 @@ class SteamDeckGUI:
         self.games_info = scrolledtext.ScrolledText(info_frame, height=8, 
                                                   bg='#1e1e1e', fg='white')
         self.games_info.pack(fill='both', expand=True, padx=5, pady=5)
+        self.register_console(games_frame, self.games_info)
         
         # Загружаем информацию о играх
         self.load_games_info()
         
-    def create_optimization_tab(self, notebook):
+    def create_optimization_tab(self, opt_frame):
         # Вкладка "Оптимизация"
-        opt_frame = ttk.Frame(notebook)
-        notebook.add(opt_frame, text="Оптимизация")
         
         # Заголовок
         title_label = ttk.Label(opt_frame, text="Оптимизация производительности", 
@@ -418,11 +726,11 @@ class SteamDeckGUI:
         profiles_buttons.pack(pady=10)
         
         ttk.Button(profiles_buttons, text="Производительность", 
-                  command=lambda: self.run_script_with_sudo("steamdeck_optimizer.sh", "performance"),
+                  command=lambda: self.run_optimizer("performance"),
                   width=20).pack(side='left', padx=5)
         
         ttk.Button(profiles_buttons, text="Баланс", 
-                  command=lambda: self.run_script_with_sudo("steamdeck_optimizer.sh", "profile BALANCED"),
+                  command=lambda: self.run_optimizer("profile BALANCED"),
                   width=20).pack(side='left', padx=5)
         
         ttk.Button(profiles_buttons, text="Экономия батареи", 
@@ -437,15 +745,15 @@ class SteamDeckGUI:
         tdp_buttons.pack(pady=10)
         
         ttk.Button(tdp_buttons, text="3W (Макс. батарея)", 
-                  command=lambda: self.run_script_with_sudo("steamdeck_optimizer.sh", "profile BATTERY_SAVER"),
+                  command=lambda: self.run_optimizer("profile BATTERY_SAVER"),
                   width=20).pack(side='left', padx=5)
         
         ttk.Button(tdp_buttons, text="10W (Баланс)", 
-                  command=lambda: self.run_script_with_sudo("steamdeck_optimizer.sh", "profile BALANCED"),
+                  command=lambda: self.run_optimizer("profile BALANCED"),
                   width=20).pack(side='left', padx=5)
         
         ttk.Button(tdp_buttons, text="15W (Макс. производительность)", 
-                  command=lambda: self.run_script_with_sudo("steamdeck_optimizer.sh", "profile PERFORMANCE"),
+                  command=lambda: self.run_optimizer("profile PERFORMANCE"),
                   width=20).pack(side='left', padx=5)
         
         # Оптимизация для игр
@@ -456,15 +764,15 @@ class SteamDeckGUI:
         games_opt_buttons.pack(pady=10)
         
         ttk.Button(games_opt_buttons, text="Cyberpunk 2077", 
-                  command=lambda: self.run_script("steamdeck_optimizer.sh", "game cyberpunk"),
+                  command=lambda: self.run_optimizer("game cyberpunk"),
                   width=20).pack(side='left', padx=5)
         
         ttk.Button(games_opt_buttons, text="Elden Ring", 
-                  command=lambda: self.run_script("steamdeck_optimizer.sh", "game elden"),
+                  command=lambda: self.run_optimizer("game elden"),
                   width=20).pack(side='left', padx=5)
         
         ttk.Button(games_opt_buttons, text="Инди-игры", 
-                  command=lambda: self.run_script("steamdeck_optimizer.sh", "game indie"),
+                  command=lambda: self.run_optimizer("game indie"),
                   width=20).pack(side='left', padx=5)
         
         # Мониторинг
@@ -475,7 +783,7 @@ class SteamDeckGUI:
         monitor_buttons.pack(pady=10)
         
         ttk.Button(monitor_buttons, text="Показать статус", 
-                  command=lambda: self.run_script("steamdeck_optimizer.sh", "status"),
+                  command=lambda: self.run_script_function("steamdeck_optimizer.sh", "show_current_settings"),
                   width=20).pack(side='left', padx=5)
         
         ttk.Button(monitor_buttons, text="Мониторинг в реальном времени", 
@@ -486,11 +794,10 @@ class SteamDeckGUI:
         self.opt_output = scrolledtext.ScrolledText(monitor_frame, height=8, 
                                                   bg='#1e1e1e', fg='white')
         self.opt_output.pack(fill='both', expand=True, padx=5, pady=5)
+        self.register_console(opt_frame, self.opt_output)
         
-    def create_utilities_tab(self, notebook):
+    def create_utilities_tab(self, utils_frame):
         # Вкладка "Утилиты"
-        utils_frame = ttk.Frame(notebook)
-        notebook.add(utils_frame, text="Утилиты")
         
         # Заголовок
         title_label = ttk.Label(utils_frame, text="Дополнительные утилиты", 
@@ -546,7 +853,7 @@ class SteamDeckGUI:
                   width=20).pack(side='left', padx=5)
         
         ttk.Button(row3, text="Сброс настроек", 
-                  command=lambda: self.run_script_with_sudo("steamdeck_optimizer.sh", "reset"),
+                  command=lambda: self.run_optimizer("reset"),
                   width=20).pack(side='left', padx=5)
         
         # Область вывода
@@ -560,17 +867,19 @@ class SteamDeckGUI:
         self.progress_label = ttk.Label(progress_frame, text="Готов к работе")
         self.progress_label.pack(side='left')
         
+        ttk.Button(progress_frame, text="⏹ Остановить",
+                  command=self.stop_running_process).pack(side='right', padx=(10, 0))
+        
         self.progress_bar = ttk.Progressbar(progress_frame, mode='indeterminate')
         self.progress_bar.pack(side='right', fill='x', expand=True, padx=(10, 0))
         
         self.utils_output = scrolledtext.ScrolledText(output_frame, height=10, 
                                                     bg='#1e1e1e', fg='white')
         self.utils_output.pack(fill='both', expand=True, padx=5, pady=5)
+        self.register_console(utils_frame, self.utils_output)
         
-    def create_offline_tab(self, notebook):
+    def create_offline_tab(self, offline_frame):
         # Вкладка "Offline"
-        offline_frame = ttk.Frame(notebook)
-        notebook.add(offline_frame, text="Offline")
         
         # Заголовок
         title_label = ttk.Label(offline_frame, text="Offline-режим и трюки", 
@@ -672,10 +981,8 @@ class SteamDeckGUI:
         # Загружаем информацию о offline-режиме
         self.load_offline_info()
         
-    def create_logs_tab(self, notebook):
+    def create_logs_tab(self, logs_frame):
         # Вкладка "Логи"
-        logs_frame = ttk.Frame(notebook)
-        notebook.add(logs_frame, text="Логи")
         
         # Заголовок
         title_label = ttk.Label(logs_frame, text="Логи и мониторинг", 
@@ -698,10 +1005,46 @@ class SteamDeckGUI:
                   command=self.save_logs,
                   width=20).pack(side='left', padx=5)
         
+        # Источник и фильтры: системный журнал или лог операций утилиты за день
+        filter_frame = ttk.Frame(logs_frame)
+        filter_frame.pack(fill='x', padx=10)
+        
+        ttk.Label(filter_frame, text="Источник:").pack(side='left')
+        self.logs_source = ttk.Combobox(filter_frame, state='readonly', width=22)
+        self.logs_source.pack(side='left', padx=5)
+        self.logs_source.bind("<<ComboboxSelected>>", lambda event: self.refresh_logs())
+        
+        ttk.Label(filter_frame, text="Уровень:").pack(side='left')
+        self.logs_level = ttk.Combobox(filter_frame, state='readonly', width=9,
+                                       values=["Все", "ERROR", "WARNING", "INFO"])
+        self.logs_level.current(0)
+        self.logs_level.pack(side='left', padx=5)
+        self.logs_level.bind("<<ComboboxSelected>>", lambda event: self.refresh_logs())
+        
+        ttk.Label(filter_frame, text="Операция / юнит:").pack(side='left')
+        self.logs_operation = ttk.Entry(filter_frame, width=14)
+        self.logs_operation.pack(side='left', padx=5)
+        self.logs_operation.bind("<Return>", lambda event: self.refresh_logs())
+        
+        ttk.Label(filter_frame, text="Время (ЧЧ:ММ):").pack(side='left')
+        self.logs_time = ttk.Entry(filter_frame, width=6)
+        self.logs_time.pack(side='left', padx=5)
+        self.logs_time.bind("<Return>", self.jump_logs_to_time)
+        
+        ttk.Button(filter_frame, text="▶", width=3,
+                  command=self.show_newer_logs).pack(side='right')
+        ttk.Button(filter_frame, text="◀", width=3,
+                  command=self.show_older_logs).pack(side='right', padx=5)
+        
+        self.log_files = []
+        self.logs_page = (None, None)
+        self.logs_request = 0
+        
         # Область логов
         self.logs_text = scrolledtext.ScrolledText(logs_frame, height=20, 
                                                   bg='#1e1e1e', fg='white')
         self.logs_text.pack(fill='both', expand=True, padx=10, pady=10)
+        self.register_console(logs_frame, self.logs_text)
         
         # Загружаем начальные логи
         self.refresh_logs()
@@ -709,6 +1052,7 @@ class SteamDeckGUI:
     def run_script(self, script_name, args=""):
         """Запуск скрипта в отдельном потоке"""
         def run():
+            tracker = ProgressTracker()
             try:
                 script_path = self.scripts_dir / script_name
                 if not script_path.exists():
@@ -726,114 +1070,156 @@ class SteamDeckGUI:
                 
                 self.append_output(f"Запуск: {' '.join(cmd)}")
                 
-                # Определяем, нужен ли прогресс-бар для этой операции
-                long_operations = [
-                    "steamdeck_setup.sh setup",
-                    "steamdeck_steamrip.sh extract",
-                    "steamdeck_steamrip.sh batch",
-                    "steamdeck_install_apps.sh quick",
-                    "steamdeck_cleanup.sh full",
-                    "steamdeck_backup.sh backup"
-                ]
-                
-                operation_key = f"{script_name} {args}".strip()
-                show_progress = any(op in operation_key for op in long_operations)
+                # Прогресс-бар появляется с первым событием прогресса от скрипта
+                def on_progress(event):
+                    if tracker.event is None:
+                        self.dispatcher.call(self.show_progress)
+                    tracker.update(event)
+                    self.put_progress(tracker)
                 
-                if show_progress:
-                    self.progress_queue.put("SHOW_PROGRESS")
-                    self.progress_queue.put(f"UPDATE:Выполняется {script_name}...")
+                def on_start(process):
+                    self.running_process = process
                 
-                # Запускаем процесс
-                process = subprocess.Popen(
+                started = time.monotonic()
+                returncode = run_with_progress(
                     cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1,
-                    universal_newlines=True
+                    on_line=self.append_output,
+                    on_progress=on_progress,
+                    on_start=on_start
+                )
+                self.append_output(f"Команда завершена с кодом: {returncode}")
+                self.logger.log_operation(
+                    f"Скрипт {script_name}", "success" if returncode == 0 else "error", args,
+                    duration=time.monotonic() - started, exit_code=returncode, script=script_name
                 )
                 
-                self.running_process = process
-                
-                # Читаем вывод в реальном времени
-                for line in iter(process.stdout.readline, ''):
-                    if line:
-                        self.append_output(line.rstrip())
-                        # Обновляем прогресс для длительных операций
-                        if show_progress and "установка" in line.lower():
-                            self.progress_queue.put(f"UPDATE:Установка пакетов...")
-                        elif show_progress and "распаковка" in line.lower():
-                            self.progress_queue.put(f"UPDATE:Распаковка файлов...")
-                        elif show_progress and "очистка" in line.lower():
-                            self.progress_queue.put(f"UPDATE:Очистка системы...")
-                
-                process.wait()
-                self.append_output(f"Команда завершена с кодом: {process.returncode}")
-                
-                if show_progress:
-                    self.progress_queue.put("HIDE_PROGRESS")
+                if tracker.event is not None:
+                    self.dispatcher.call(self.hide_progress)
                 
             except Exception as e:
                 self.append_output(f"Ошибка: {str(e)}")
-                if show_progress:
-                    self.progress_queue.put("HIDE_PROGRESS")
+                if tracker.event is not None:
+                    self.dispatcher.call(self.hide_progress)
             finally:
                 self.running_process = None
         
-        # Запускаем в отдельном потоке
-        thread = threading.Thread(target=run)
-        thread.daemon = True
-        thread.start()
+        # Ставим в очередь общего планировщика
+        self.submit_job(run, f"{script_name} {args}".strip(),
+                        resource=SCRIPT_RESOURCES.get(Path(script_name).name))
+    
+    def run_script_function(self, script_name, func, *args):
+        """
+        Быстрый запрос статуса через фоновый bash-обработчик скрипта
         
+        Скрипт подключается один раз за сеанс GUI (steamdeck_worker.py),
+        поэтому повторная проверка не запускает bash и не разбирает скрипт
+        заново. Вывод функции показывается после её завершения.
+        """
+        def run():
+            from steamdeck_worker import get_worker, WorkerError  # type: ignore
+            
+            self.append_output(f"Запуск: {script_name} {func}")
+            started = time.monotonic()
+            try:
+                returncode, output = get_worker(self.scripts_dir / script_name).call(func, *args)
+            except WorkerError as e:
+                self.append_output(f"Ошибка: {e}")
+                return
+            for line in output.rstrip("\n").splitlines():
+                self.append_output(line)
+            self.append_output(f"Команда завершена с кодом: {returncode}")
+            self.logger.log_operation(
+                f"Скрипт {script_name}", "success" if returncode == 0 else "error", func,
+                duration=time.monotonic() - started, exit_code=returncode, script=script_name
+            )
+        
+        self.submit_job(run, f"{script_name} {func}")
+        
+    def submit_job(self, func, name, resource=None, priority=PRIORITY_NORMAL, key=None):
+        """
+        Постановка задачи в общий планировщик
+        
+        Повторный запуск той же операции (двойной клик) не создаёт вторую
+        задачу, пока первая ждёт в очереди или выполняется.
+        """
+        key = key or name
+        if self.scheduler.find(key) is not None:
+            self.append_output(f"⏳ {name}: уже выполняется или ожидает в очереди")
+            return None
+        
+        if not self.scheduler.has_capacity(resource):
+            self.append_output(f"⏳ {name}: ожидает освобождения ресурса ({resource})")
+        
+        return self.scheduler.submit(func, name=name, priority=priority,
+                                     resource=resource, key=key)
+    
+    def register_console(self, tab_frame, console):
+        """Привязка консоли вывода к вкладке"""
+        self.consoles[str(tab_frame)] = console
+    
+    def get_active_console(self):
+        """Консоль активной вкладки (или общий вывод утилит)"""
+        if self.notebook is None:
+            return None
+        console = self.consoles.get(self.notebook.select())
+        if console is None:
+            # Общий вывод находится на вкладке "Утилиты": строим её, если ещё не открывали
+            self.build_tab(self.utilities_tab)
+            console = self.utils_output
+        return console
+    
     def append_output(self, text):
-        """Добавление текста в область вывода"""
-        def update():
-            # Находим активную вкладку и добавляем текст
-            for widget in [self.system_info, self.games_info, self.opt_output, 
-                          self.utils_output, self.logs_text]:
-                if widget.winfo_exists():
-                    widget.insert(tk.END, text + "\n")
-                    widget.see(tk.END)
-        
-        # Обновляем UI в главном потоке
-        self.root.after(0, update)
+        """Добавление текста в область вывода (безопасно из любого потока)"""
+        self.output_buffer.write(text)
     
     def show_progress(self, message="Выполняется операция..."):
         """Показать прогресс-бар"""
         if self.progress_bar and self.progress_label:
             self.progress_label.config(text=message)
+            self.progress_bar.config(mode='indeterminate', value=0)
             self.progress_bar.start(10)
     
     def hide_progress(self, message="Готов к работе"):
         """Скрыть прогресс-бар"""
         if self.progress_bar and self.progress_label:
             self.progress_bar.stop()
+            self.progress_bar.config(mode='indeterminate', value=0)
             self.progress_label.config(text=message)
     
+    def set_progress(self, percent, message):
+        """Определённый прогресс: процент выполнения и подпись"""
+        if self.progress_bar and self.progress_label:
+            if str(self.progress_bar.cget('mode')) != 'determinate':
+                self.progress_bar.stop()
+                self.progress_bar.config(mode='determinate', maximum=100)
+            self.progress_bar.config(value=percent)
+            self.progress_label.config(text=message)
+    
+    def put_progress(self, tracker):
+        """
+        Передача состояния ProgressTracker в прогресс-бар (из любого потока)
+        
+        Пачка событий, пришедшая до перерисовки, сводится к последнему.
+        """
+        fraction = tracker.fraction
+        if fraction is None:
+            self.dispatcher.post("progress", self.update_progress, tracker.label())
+        else:
+            self.dispatcher.post("progress", self.set_progress, fraction * 100, tracker.label())
+    
     def update_progress(self, message):
         """Обновить сообщение прогресса"""
         if self.progress_label:
             self.progress_label.config(text=message)
     
-    def process_progress_queue(self):
-        """Обработка очереди прогресса"""
-        try:
-            while True:
-                message = self.progress_queue.get_nowait()
-                if message == "SHOW_PROGRESS":
-                    self.show_progress()
-                elif message == "HIDE_PROGRESS":
-                    self.hide_progress()
-                elif message.startswith("UPDATE:"):
-                    self.update_progress(message[7:])
-        except queue.Empty:
-            pass
-        finally:
-            self.root.after(100, self.process_progress_queue)
-    
     def request_sudo_password(self):
-        """Запрос пароля sudo у пользователя"""
-        if self.sudo_authenticated and self.sudo_password:
+        """Запрос пароля sudo и запуск привилегированного помощника"""
+        from tkinter import simpledialog
+        from steamdeck_privileged import PrivilegedHelper, PrivilegedError  # type: ignore
+        
+        if self.privileged is None:
+            self.privileged = PrivilegedHelper()
+        if self.privileged.alive:
             return True
             
         # Показываем диалог ввода пароля
@@ -847,96 +1233,119 @@ class SteamDeckGUI:
             self.append_output("❌ Пароль не введен. Операция отменена.")
             return False
             
-        # Проверяем пароль
-        if self.verify_sudo_password(password):
-            self.sudo_password = password
-            self.sudo_authenticated = True
+        # Пароль передаётся sudo один раз и не сохраняется
+        try:
+            started = self.privileged.start(password)
+        except PrivilegedError as e:
+            self.append_output(f"❌ Ошибка проверки пароля: {e}")
+            return False
+        
+        if started:
             self.append_output("✅ Пароль sudo принят")
             return True
         else:
             self.append_output("❌ Неверный пароль sudo")
             return False
     
-    def verify_sudo_password(self, password):
-        """Проверка пароля sudo"""
-        try:
-            # Создаем временный процесс для проверки пароля
-            process = subprocess.Popen(
-                ['sudo', '-S', 'echo', 'test'],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            stdout, stderr = process.communicate(input=password + '\n')
-            return process.returncode == 0
-        except Exception as e:
-            self.append_output(f"❌ Ошибка проверки пароля: {e}")
-            return False
-    
-    def run_script_with_sudo(self, script_name, args=""):
-        """Запуск скрипта с sudo"""
+    def run_script_with_sudo(self, script_name, action):
+        """Разрешённое действие скрипта от root через привилегированный помощник"""
         if not self.request_sudo_password():
             return
             
         def run():
             try:
-                script_path = self.scripts_dir / script_name
-                if not script_path.exists():
-                    self.append_output(f"Ошибка: Скрипт {script_name} не найден")
-                    return
-                
-                # Делаем скрипт исполняемым
-                os.chmod(script_path, 0o755)
+                self.append_output(f"Запуск с sudo: {script_name} {action}")
                 
-                # Формируем команду с sudo
-                if args:
-                    cmd = ['sudo', '-S', str(script_path), args]
-                else:
-                    cmd = ['sudo', '-S', str(script_path)]
-                
-                self.append_output(f"Запуск с sudo: {' '.join(cmd)}")
-                
-                # Запускаем процесс
-                process = subprocess.Popen(
-                    cmd,
-                    stdin=subprocess.PIPE,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1,
-                    universal_newlines=True
+                started = time.monotonic()
+                results = self.privileged.run(
+                    [{"op": "script", "name": script_name, "action": action}],
+                    on_line=self.append_output,
+                    on_start=self.set_running_process
+                )
+                self.append_output(f"Команда завершена: {results[0]['message']}")
+                self.logger.log_operation(
+                    f"Скрипт {script_name} (sudo)", "success" if results[0]["ok"] else "error",
+                    f"{action} {results[0]['message']}",
+                    duration=time.monotonic() - started, script=script_name
                 )
-                
-                self.running_process = process
-                
-                # Отправляем пароль в stdin
-                process.stdin.write(self.sudo_password + '\n')
-                process.stdin.flush()
-                
-                # Читаем вывод в реальном времени
-                for line in iter(process.stdout.readline, ''):
-                    if line:
-                        self.append_output(line.rstrip())
-                
-                process.wait()
-                self.append_output(f"Команда завершена с кодом: {process.returncode}")
                 
             except Exception as e:
                 self.append_output(f"Ошибка: {str(e)}")
             finally:
                 self.running_process = None
         
-        # Запускаем в отдельном потоке
-        thread = threading.Thread(target=run)
-        thread.daemon = True
-        thread.start()
+        # Ставим в очередь общего планировщика
+        self.submit_job(run, f"sudo {script_name} {action}",
+                        resource=RESOURCE_PRIVILEGED)
+    
+    def run_optimizer(self, args):
+        """
+        Профиль оптимизатора: скрипт работает от пользователя и собирает
+        записи в sysfs, помощник выполняет их одним пакетом
+        """
+        if not self.request_sudo_password():
+            return
+        
+        def run():
+            import tempfile
+            from steamdeck_privileged import parse_sysfs_batch  # type: ignore
+            
+            started = time.monotonic()
+            fd, batch_path = tempfile.mkstemp(prefix="steamdeck-sysfs-")
+            os.close(fd)
+            try:
+                script_path = self.scripts_dir / "steamdeck_optimizer.sh"
+                self.append_output(f"Запуск: {script_path.name} {args}")
+                returncode = run_with_progress(
+                    ["bash", str(script_path)] + args.split(),
+                    on_line=self.append_output,
+                    on_start=self.set_running_process,
+                    env=dict(os.environ, STEAMDECK_SYSFS_BATCH=batch_path)
+                )
+                with open(batch_path, encoding="utf-8") as f:
+                    ops = parse_sysfs_batch(f.read())
+                
+                ok = returncode == 0
+                if ok and ops:
+                    results = self.privileged.run(ops, on_line=self.append_output,
+                                                  stop_on_error=False,
+                                                  on_start=self.set_running_process)
+                    failed = [op["path"] for op, result in zip(ops, results) if not result["ok"]]
+                    ok = len(results) == len(ops) and not failed
+                    for path in failed:
+                        self.append_output(f"⚠️ Не удалось записать: {path}")
+                    self.append_output(f"Записано параметров sysfs: {len(ops) - len(failed)}")
+                self.append_output(f"Команда завершена с кодом: {returncode}")
+                self.logger.log_operation(
+                    "Скрипт steamdeck_optimizer.sh", "success" if ok else "error", args,
+                    duration=time.monotonic() - started, exit_code=returncode,
+                    script="steamdeck_optimizer.sh"
+                )
+            except Exception as e:
+                self.append_output(f"Ошибка: {str(e)}")
+            finally:
+                self.running_process = None
+                os.unlink(batch_path)
+        
+        self.submit_job(run, f"steamdeck_optimizer.sh {args}", resource=RESOURCE_PRIVILEGED)
+    
+    def set_running_process(self, process):
+        """Процесс (или пакет помощника), который останавливает кнопка «Остановить»"""
+        self.running_process = process
+    
+    def stop_running_process(self):
+        """Остановка выполняемой команды"""
+        process = self.running_process
+        if process is None or process.poll() is not None:
+            self.append_output("ℹ️ Нет выполняемых команд")
+            return
+        process.terminate()
+        self.append_output("⏹ Команда остановлена")
     
     def reset_sudo_auth(self):
         """Сброс sudo аутентификации"""
-        self.sudo_password = None
-        self.sudo_authenticated = False
+        if self.privileged is not None:
+            self.privileged.close()
         self.append_output("🔐 Sudo аутентификация сброшена")
     
     def open_microsd_menu(self):
@@ -960,11 +1369,11 @@ class SteamDeckGUI:
         row1.pack(pady=5)
         
         ttk.Button(row1, text="Проверить карты", 
-                  command=lambda: self.run_script("steamdeck_microsd.sh", "check"),
+                  command=lambda: self.run_script_function("steamdeck_microsd.sh", "check_microsd"),
                   width=20).pack(side='left', padx=5)
         
         ttk.Button(row1, text="Информация о монтировании", 
-                  command=lambda: self.run_script("steamdeck_microsd.sh", "mount-info"),
+                  command=lambda: self.run_script_function("steamdeck_microsd.sh", "get_mount_info"),
                   width=20).pack(side='left', padx=5)
         
         # Вторая строка
@@ -1013,42 +1422,114 @@ class SteamDeckGUI:
         # Сохраняем ссылку на область вывода для этого диалога
         dialog.microsd_output = microsd_output
         
+    def load_cached_field(self, field, widget, compute, force=False):
+        """
+        Показ поля из снимка и фоновое обновление по TTL
+        
+        Сохранённое значение выводится сразу (серым, пока идёт обновление);
+        compute() выполняется в планировщике, если значения нет, его TTL
+        истёк или force, и возвращает новый текст поля.
+        """
+        cached = self.snapshot.get(field)
+        if not force and self.snapshot.is_fresh(field):
+            self.show_field(widget, cached.value)
+            return
+        
+        if cached is not None:
+            self.show_field(widget, cached.value, f"⟳ Обновление (данные от {cached.updated_text()})...")
+        else:
+            self.show_field(widget, "", "⟳ Загрузка...")
+        
+        def refresh():
+            try:
+                text = compute()
+            except Exception as e:
+                text = f"Ошибка загрузки информации: {e}\n"
+            else:
+                self.snapshot.set(field, text)
+            self.dispatcher.call(self.show_field, widget, text)
+        
+        self.scheduler.submit(refresh, name=f"refresh {field}", key=f"refresh {field}")
+    
+    def show_field(self, widget, text, refreshing=None):
+        """Вывод поля в начало текстовой области (вывод скриптов ниже не затрагивается)"""
+        if not widget.winfo_exists():
+            return
+        ranges = widget.tag_ranges("snapshot")
+        if ranges:
+            widget.delete(ranges[0], ranges[-1])
+        
+        widget.tag_configure("refreshing", foreground='#8a8a8a')
+        if refreshing:
+            widget.insert("1.0", f"{text}{refreshing}\n", ("snapshot", "refreshing"))
+        else:
+            widget.insert("1.0", text, ("snapshot",))
+    
     def load_system_info(self):
         """Загрузка информации о системе"""
-        try:
-            # Получаем информацию о системе
-            import platform
-            import psutil
-            
-            info = f"Система: {platform.system()} {platform.release()}\n"
-            info += f"Процессор: {platform.processor()}\n"
-            info += f"Память: {psutil.virtual_memory().total // (1024**3)} GB\n"
-            info += f"Диск: {psutil.disk_usage('/').total // (1024**3)} GB\n"
-            
-            self.system_info.insert(tk.END, info)
-            
-        except ImportError:
-            self.system_info.insert(tk.END, "psutil не установлен. Установите: pip install psutil")
-        except Exception as e:
-            self.system_info.insert(tk.END, f"Ошибка загрузки информации: {e}")
+        self.load_cached_field("system_info", self.system_info, self.compute_system_info)
+    
+    def compute_system_info(self):
+        """Текст информации о системе (выполняется в фоне)"""
+        # Чтение /proc, /sys и statvfs без запуска внешних команд
+        cpu = steamdeck_probe.cpu_info()
+        memory = steamdeck_probe.memory_info()
+        disk = steamdeck_probe.disk_usage("/")
+        
+        info = f"Система: {steamdeck_probe.os_release() or 'Linux'} ({steamdeck_probe.kernel_release()})\n"
+        info += f"Процессор: {cpu['model'] or 'N/A'}, ядер: {cpu['cores']}\n"
+        info += f"Память: {steamdeck_probe.format_bytes(memory.get('MemTotal'))}\n"
+        info += f"Диск: {steamdeck_probe.format_bytes(disk['total'] if disk else None)}\n"
+        return info
             
     def load_games_info(self):
         """Загрузка информации о играх"""
+        self.load_cached_field("games_info", self.games_info, self.compute_games_info)
+    
+    def compute_games_info(self):
+        """Текст информации о играх (выполняется в фоне)"""
+        # Проверяем установленные Flatpak приложения
         try:
-            # Проверяем установленные Flatpak приложения
             result = subprocess.run(['flatpak', 'list', '--app'], 
                                   capture_output=True, text=True)
-            if result.returncode == 0:
-                apps = result.stdout.strip().split('\n')
-                self.games_info.insert(tk.END, f"Установлено Flatpak приложений: {len(apps)}\n")
-            else:
-                self.games_info.insert(tk.END, "Flatpak не доступен\n")
-                
-        except Exception as e:
-            self.games_info.insert(tk.END, f"Ошибка загрузки информации о играх: {e}")
+        except FileNotFoundError:
+            result = None
+        if result is not None and result.returncode == 0:
+            apps = result.stdout.strip().split('\n')
+            info = f"Установлено Flatpak приложений: {len(apps)}\n"
+        else:
+            info = "Flatpak не доступен\n"
+        
+        # Файлы игр из общего индекса (перечитываются только изменившиеся каталоги);
+        # при работающем отслеживании индекс уже актуален и поиск не нужен
+        from steamdeck_gameindex import get_index  # type: ignore
+        from steamdeck_gamewatch import is_running  # type: ignore
+        index = get_index()
+        rescan = not is_running()
+        sh_games = index.find("sh", rescan=rescan)
+        rar_files = index.find("rar", rescan=rescan)
+        info += f"Найдено .sh игр: {len(sh_games)}\n"
+        info += f"Найдено RAR архивов: {len(rar_files)}"
+        if rar_files:
+            total = sum(item.size for item in rar_files)
+            info += f" ({steamdeck_probe.format_bytes(total)})"
+        
+        # Игры Steam всех библиотек по манифестам (разобранные кэшируются по mtime)
+        from steamdeck_steamlib import get_libraries  # type: ignore
+        libraries = get_libraries().load()
+        steam_games = sum(len(library.apps) for library in libraries)
+        steam_size = sum(library.size_on_disk for library in libraries)
+        info += f"\nУстановлено игр Steam: {steam_games} ({steamdeck_probe.format_bytes(steam_size)})"
+        if len(libraries) > 1:
+            for library in libraries:
+                info += (f"\n  {library.device_name}: {len(library.apps)} "
+                         f"({steamdeck_probe.format_bytes(library.size_on_disk)})")
+        return info + "\n"
             
     def restore_backup(self):
         """Диалог восстановления из резервной копии"""
+        from tkinter import filedialog
+        
         file_path = filedialog.askopenfilename(
             title="Выберите файл резервной копии",
             filetypes=[("Tar archives", "*.tar.gz"), ("All files", "*.*")]
@@ -1059,9 +1540,6 @@ class SteamDeckGUI:
     
     def check_updates(self):
         """Проверка обновлений утилиты"""
-        import subprocess
-        import threading
-        
         def check_updates_thread():
             try:
                 # Запускаем проверку обновлений
@@ -1073,24 +1551,31 @@ class SteamDeckGUI:
                     cwd=str(self.project_root)
                 )
                 
+                self.store_update_status(result)
+                
                 # Создаем диалог с результатом
-                self.root.after(0, lambda: self.show_update_result(result))
+                self.dispatcher.call(self.show_update_result, result)
                 
             except Exception as e:
-                self.root.after(0, lambda: self.show_update_error(str(e)))
+                self.dispatcher.call(self.show_update_error, str(e))
         
-        # Запускаем в отдельном потоке
-        thread = threading.Thread(target=check_updates_thread)
-        thread.daemon = True
-        thread.start()
+        # Ставим в очередь общего планировщика
+        job = self.submit_job(check_updates_thread, "steamdeck_update.sh check",
+                              resource=RESOURCE_NETWORK)
         
         # Показываем индикатор загрузки
-        self.show_progress("Проверка обновлений...")
+        if job is not None:
+            self.show_progress("Проверка обновлений...")
     
     def auto_check_updates(self):
         """Автоматическая проверка обновлений при запуске (тихая, без показа прогресса)"""
-        import subprocess
-        import threading
+        # Свежий результат прошлой проверки для этой версии: сеть не нужна
+        cached = self.snapshot.get("update_status")
+        if (self.snapshot.is_fresh("update_status") and isinstance(cached.value, dict)
+                and cached.value.get("version") == self.version):
+            if cached.value.get("available"):
+                self.show_auto_update_notification(None)
+            return
         
         def auto_check_thread():
             try:
@@ -1103,18 +1588,29 @@ class SteamDeckGUI:
                     cwd=str(self.project_root)
                 )
                 
+                self.store_update_status(result)
+                
                 # Показываем результат только если есть обновление
                 if result.returncode == 0 and "Доступно обновление" in result.stdout:
-                    self.root.after(0, lambda: self.show_auto_update_notification(result))
+                    self.dispatcher.call(self.show_auto_update_notification, result)
                 
             except Exception as e:
                 # Автопроверка не должна прерывать работу
                 pass
         
-        # Запускаем в отдельном потоке
-        thread = threading.Thread(target=auto_check_thread)
-        thread.daemon = True
-        thread.start()
+        # Фоновая проверка с низким приоритетом, не мешает ручной проверке
+        self.scheduler.submit(auto_check_thread, name="auto update check",
+                              priority=PRIORITY_LOW, resource=RESOURCE_NETWORK,
+                              key="auto update check")
+    
+    def store_update_status(self, result):
+        """Сохранение результата проверки обновлений в снимок"""
+        if result.returncode == 0:
+            # Статус относится к текущей версии: после обновления он устаревает
+            self.snapshot.set("update_status", {
+                "version": self.version,
+                "available": "Доступно обновление" in result.stdout,
+            })
     
     def show_auto_update_notification(self, result):
         """Показать уведомление об обновлении"""
@@ -1370,6 +1866,7 @@ rm -f "{restart_script}"
                 text=True,
                 cwd=str(self.project_root)
             )
+            self.store_update_status(check_result)
             
             # Проверяем, есть ли обновления
             if check_result.returncode == 0 and "Доступно обновление" in check_result.stdout:
@@ -1672,13 +2169,15 @@ STEAMDECK_INSTALL_DIR={install_dir}
     
     def export_logs(self):
         """Экспорт логов для отправки разработчику"""
+        from tkinter import filedialog
+        
         try:
             # Выбираем файл для экспорта
             file_path = filedialog.asksaveasfilename(
                 title="Экспорт логов",
                 defaultextension=".log",
                 filetypes=[("Log files", "*.log"), ("All files", "*.*")],
-                initialname=f"steamdeck_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+                initialname=f"steamdeck_logs_{time.strftime('%Y%m%d_%H%M%S')}.log"
             )
             
             if not file_path:
@@ -1749,18 +2248,15 @@ STEAMDECK_INSTALL_DIR={install_dir}
     
     def run_update_with_dialog(self, script_name, args="", message=""):
         """Запуск скрипта обновления с диалогом результата"""
-        import subprocess
-        import threading
-        
         def run_update_thread():
             try:
                 script_path = self.scripts_dir / script_name
                 if not script_path.exists():
-                    self.root.after(0, lambda: self.show_update_error(f"Скрипт {script_name} не найден"))
+                    self.dispatcher.call(self.show_update_error, f"Скрипт {script_name} не найден")
                     return
                 
                 # Показываем прогресс
-                self.root.after(0, lambda: self.show_progress(message or f"Выполнение {script_name}..."))
+                self.dispatcher.call(self.show_progress, message or f"Выполнение {script_name}...")
                 
                 # Запускаем скрипт
                 result = subprocess.run(
@@ -1771,76 +2267,65 @@ STEAMDECK_INSTALL_DIR={install_dir}
                 )
                 
                 # Скрываем прогресс
-                self.root.after(0, self.hide_progress)
+                self.dispatcher.call(self.hide_progress)
                 
                 # Показываем результат в диалоге
-                self.root.after(0, lambda: self.show_update_result(result, args))
+                self.dispatcher.call(self.show_update_result, result, args)
                 
             except Exception as e:
-                self.root.after(0, self.hide_progress)
-                self.root.after(0, lambda: self.show_update_error(str(e)))
+                self.dispatcher.call(self.hide_progress)
+                self.dispatcher.call(self.show_update_error, str(e))
         
-        # Запускаем в отдельном потоке
-        thread = threading.Thread(target=run_update_thread)
-        thread.daemon = True
-        thread.start()
+        # Ставим в очередь общего планировщика
+        self.submit_job(run_update_thread, f"{script_name} {args}".strip(),
+                        resource=RESOURCE_NETWORK)
     
     def run_script_with_progress(self, script_name, args="", message=""):
         """Запуск скрипта с прогресс-баром и детальным выводом"""
-        import subprocess
-        import threading
-        
-        def run_with_progress():
+        def run_progress_thread():
             try:
                 script_path = self.scripts_dir / script_name
                 if not script_path.exists():
-                    self.root.after(0, lambda: self.append_output(f"Ошибка: Скрипт {script_name} не найден"))
+                    self.append_output(f"Ошибка: Скрипт {script_name} не найден")
                     return
                 
                 # Показываем прогресс
-                self.root.after(0, lambda: self.show_progress(message or f"Выполнение {script_name}..."))
+                self.dispatcher.call(self.show_progress, message or f"Выполнение {script_name}...")
                 
-                # Запускаем скрипт
-                process = subprocess.Popen(
-                    ["bash", str(script_path), args] if args else ["bash", str(script_path)],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1,
-                    universal_newlines=True
-                )
+                # Запускаем скрипт; события прогресса уточняют прогресс-бар
+                tracker = ProgressTracker()
                 
-                # Читаем вывод в реальном времени
-                while True:
-                    output = process.stdout.readline()
-                    if output == '' and process.poll() is not None:
-                        break
-                    if output:
-                        self.root.after(0, lambda o=output: self.append_output(o.strip()))
+                def on_progress(event):
+                    tracker.update(event)
+                    self.put_progress(tracker)
                 
-                # Получаем код возврата
-                return_code = process.poll()
+                return_code = run_with_progress(
+                    ["bash", str(script_path), args] if args else ["bash", str(script_path)],
+                    on_line=lambda line: self.append_output(line.strip()),
+                    on_progress=on_progress
+                )
                 
                 # Скрываем прогресс
-                self.root.after(0, self.hide_progress)
+                self.dispatcher.call(self.hide_progress)
                 
                 # Показываем результат
                 if return_code == 0:
-                    self.root.after(0, lambda: self.append_output(f"✅ {script_name} выполнен успешно"))
+                    self.append_output(f"✅ {script_name} выполнен успешно")
                 else:
-                    self.root.after(0, lambda: self.append_output(f"❌ {script_name} завершился с ошибкой (код: {return_code})"))
+                    self.append_output(f"❌ {script_name} завершился с ошибкой (код: {return_code})")
                 
             except Exception as e:
-                self.root.after(0, self.hide_progress)
-                self.root.after(0, lambda: self.append_output(f"Ошибка выполнения {script_name}: {e}"))
+                self.dispatcher.call(self.hide_progress)
+                self.append_output(f"Ошибка выполнения {script_name}: {e}")
         
-        # Запускаем в отдельном потоке
-        thread = threading.Thread(target=run_with_progress)
-        thread.daemon = True
-        thread.start()
+        # Ставим в очередь общего планировщика
+        self.submit_job(run_progress_thread, f"{script_name} {args}".strip(),
+                        resource=SCRIPT_RESOURCES.get(script_name))
             
     def add_to_steam_dialog(self):
         """Диалог добавления приложения в Steam"""
+        from tkinter import filedialog
+        
         dialog = tk.Toplevel(self.root)
         dialog.title("Добавить в Steam")
         dialog.geometry("400x200")
@@ -1886,25 +2371,239 @@ STEAMDECK_INSTALL_DIR={install_dir}
         
     def refresh_logs(self):
         """Обновление логов"""
+        self.update_log_sources()
+        if self.logs_source.current() > 0:
+            self.stop_journal()
+        if self.logs_source.current() == 1:
+            self.show_operation_stats()
+            return
+        if self.selected_log_file() is not None:
+            self.show_operation_log()
+            return
+        
+        # Системный журнал читается в фоне, в консоль добавляются только новые записи
+        self.follow_journal()
+    
+    def follow_journal(self):
+        """Запуск чтения системного журнала (перезапуск - только при смене фильтров)"""
+        from steamdeck_journal import JournalFollower, CURSOR_FILE, PRIORITIES
+        
+        priority = {
+            "ERROR": PRIORITIES["err"],
+            "WARNING": PRIORITIES["warning"],
+            "INFO": PRIORITIES["info"],
+        }.get(self.logs_level.get())
+        units = self.logs_operation.get().split()
+        
+        follower = self.journal
+        if (follower is not None and follower.running
+                and follower.units == units and follower.priority == priority):
+            return
+        
+        self.stop_journal()
         self.logs_text.delete(1.0, tk.END)
+        self.journal = JournalFollower(
+            lambda: self.dispatcher.post("journal", self.drain_journal),
+            units=units,
+            priority=priority,
+            # С сохранённого курсора продолжается только основной вид без фильтров
+            cursor_file=None if units or priority is not None else CURSOR_FILE
+        )
+        self.journal.start()
+    
+    def stop_journal(self):
+        """Остановка чтения системного журнала"""
+        if self.journal is not None:
+            self.journal.stop()
+            self.journal = None
+    
+    def drain_journal(self):
+        """Добавление новых записей журнала во вкладку "Логи" (главный поток)"""
+        follower = self.journal
+        if follower is None:
+            return
         
-        # Получаем логи системы
-        try:
-            result = subprocess.run(['journalctl', '--no-pager', '-n', '50'], 
-                                  capture_output=True, text=True)
-            if result.returncode == 0:
-                self.logs_text.insert(tk.END, result.stdout)
-            else:
-                self.logs_text.insert(tk.END, "Не удалось получить логи системы\n")
-        except Exception as e:
-            self.logs_text.insert(tk.END, f"Ошибка получения логов: {e}\n")
+        entries = follower.drain(JOURNAL_DRAIN_LIMIT)
+        lines = [entry.format() for entry in entries]
+        if follower.error:
+            lines.append(f"❌ {follower.error}")
+            follower.error = None
+        
+        if lines:
+            at_end = self.logs_text.yview()[1] >= 1.0
+            self.logs_text.insert(tk.END, "\n".join(lines) + "\n")
+            self.output_buffer.trim(self.logs_text)
+            if at_end:
+                self.logs_text.see(tk.END)
+        
+        # Остаток очереди - в следующем кадре, чтобы не блокировать интерфейс
+        if follower.pending:
+            self.root.after(self.output_buffer.interval_ms, self.drain_journal)
+    
+    def update_log_sources(self):
+        """Список источников: системный журнал и логи операций по дням"""
+        from steamdeck_logreader import log_files
+        
+        selected = max(0, self.logs_source.current())
+        current = self.selected_log_file()
+        
+        self.log_files = log_files()
+        names = list(LOG_SOURCES)
+        for path in self.log_files:
+            day = path.stem.rsplit("_", 1)[-1]
+            names.append(f"Операции {day[6:8]}.{day[4:6]}.{day[:4]}")
+        self.logs_source['values'] = names
+        
+        if current in self.log_files:
+            self.logs_source.current(self.log_files.index(current) + len(LOG_SOURCES))
+        else:
+            self.logs_source.current(min(selected, len(LOG_SOURCES) - 1))
+    
+    def selected_log_file(self):
+        """Файл лога операций, выбранный в источнике (или None)"""
+        selected = self.logs_source.current() - len(LOG_SOURCES)
+        if 0 <= selected < len(self.log_files):
+            return self.log_files[selected]
+        return None
+    
+    def submit_logs_read(self, read, name):
+        """
+        Фоновое чтение для вкладки "Логи"
+        
+        Чтения по индексу короткие, поэтому не занимают класс ресурса диска
+        (его держат долгие резервные копии и очистка) и не отбрасываются как
+        повторные: показывается результат последнего запроса, ответы на
+        прежние игнорируются по номеру запроса.
+        """
+        self.logs_request += 1
+        token = self.logs_request
+        self.scheduler.submit(read, token, name=name)
+    
+    def show_operation_stats(self):
+        """Сводка по операциям за неделю и последние записи из хранилища операций"""
+        status = {"ERROR": "error", "WARNING": "warning"}.get(self.logs_level.get())
+        text = self.logs_operation.get().strip()
+        since = time.time() - OPERATION_STATS_PERIOD
+        
+        def query(token):
+            # Хранилище, в которое пишет логгер (у него может быть свой каталог логов)
+            store = self.logger.store
+            if store is None:
+                self.dispatcher.call(self.show_log_text, token, "Хранилище операций недоступно\n")
+                return
+            self.logger.flush()
+            groups = store.stats(status=status, since=since, text=text)
+            records = store.query(status=status, since=since, text=text, limit=LOG_PAGE_LINES)
+            
+            lines = [f"{'Операция':32} {'Запусков':>8} {'Ошибок':>7} {'Средн., с':>10} {'Макс., с':>9}  Последний"]
+            for group in groups:
+                average = f"{group.avg_duration:.1f}" if group.avg_duration is not None else "-"
+                longest = f"{group.max_duration:.1f}" if group.max_duration is not None else "-"
+                last = time.strftime("%d.%m %H:%M", time.localtime(group.last_ts))
+                lines.append(f"{group.key[:32]:32} {group.count:8} {group.errors:7} "
+                             f"{average:>10} {longest:>9}  {last}")
+            
+            lines += ["", "Последние операции:"]
+            for record in records:
+                when = time.strftime("%d.%m %H:%M:%S", time.localtime(record.ts))
+                extra = []
+                if record.duration is not None:
+                    extra.append(f"{record.duration:.1f} с")
+                if record.exit_code is not None:
+                    extra.append(f"код {record.exit_code}")
+                suffix = f" ({', '.join(extra)})" if extra else ""
+                details = f" - {record.details}" if record.details else ""
+                lines.append(f"{when} {record.status:8} {record.operation}{details}{suffix}")
+            
+            self.dispatcher.call(self.show_log_text, token, "\n".join(lines) + "\n")
+        
+        self.logs_page = (None, None)
+        self.submit_logs_read(query, "Сводка операций")
+    
+    def show_log_text(self, token, text):
+        """Вывод текста во вкладку "Логи" (главный поток)"""
+        if token != self.logs_request:
+            return
+        self.logs_text.delete(1.0, tk.END)
+        self.logs_text.insert(tk.END, text)
+    
+    def show_operation_log(self, start=None, end=None, timestamp=None):
+        """
+        Страница лога операций выбранного дня
+        
+        Без аргументов - последние строки; start - вперёд от строки,
+        end - назад от строки, timestamp - вперёд от первой записи не раньше
+        этого времени. Файл читается в фоне через индекс, а не целиком.
+        """
+        path = self.selected_log_file()
+        levels = None if self.logs_level.current() <= 0 else [self.logs_level.get()]
+        operation = self.logs_operation.get().strip()
+        
+        def read_page(token):
+            from steamdeck_logreader import get_reader
             
+            # Записи из очереди логгера должны попасть в файл до чтения
+            self.logger.flush()
+            reader = get_reader(path)
+            first = start
+            if timestamp is not None:
+                first = reader.find_time(timestamp)
+            
+            if first is not None:
+                lines, following = reader.read(first, LOG_PAGE_LINES, levels, operation)
+                previous = lines[0].number if lines else first
+            else:
+                lines, previous = reader.read_before(end, LOG_PAGE_LINES, levels, operation)
+                following = lines[-1].number + 1 if lines and end is not None else None
+            self.dispatcher.call(self.show_log_page, token, lines, previous or None, following)
+        
+        self.submit_logs_read(read_page, "Чтение лога")
+    
+    def show_log_page(self, token, lines, previous, following):
+        """Вывод страницы лога операций (главный поток)"""
+        if token != self.logs_request:
+            return
+        self.logs_page = (previous, following)
+        self.logs_text.delete(1.0, tk.END)
+        if not lines:
+            self.logs_text.insert(tk.END, "Записей не найдено\n")
+            return
+        self.logs_text.insert(tk.END, "\n".join(line.text for line in lines) + "\n")
+        self.logs_text.see(tk.END if following is None else "1.0")
+    
+    def show_older_logs(self):
+        """Предыдущая страница лога операций"""
+        previous = self.logs_page[0]
+        if self.selected_log_file() is not None and previous is not None:
+            self.show_operation_log(end=previous)
+    
+    def show_newer_logs(self):
+        """Следующая страница лога операций"""
+        following = self.logs_page[1]
+        if self.selected_log_file() is not None and following is not None:
+            self.show_operation_log(start=following)
+    
+    def jump_logs_to_time(self, event=None):
+        """Переход к записям выбранного дня начиная с указанного времени"""
+        path = self.selected_log_file()
+        if path is None:
+            return
+        day = path.stem.rsplit("_", 1)[-1]
+        try:
+            timestamp = time.mktime(time.strptime(day + self.logs_time.get().strip(), "%Y%m%d%H:%M"))
+        except ValueError:
+            messagebox.showerror("Ошибка", "Укажите время в формате ЧЧ:ММ")
+            return
+        self.show_operation_log(timestamp=timestamp)
+    
     def clear_logs(self):
         """Очистка логов"""
         self.logs_text.delete(1.0, tk.END)
         
     def save_logs(self):
         """Сохранение логов в файл"""
+        from tkinter import filedialog
+        
         file_path = filedialog.asksaveasfilename(
             title="Сохранить логи",
             defaultextension=".txt",
@@ -2015,69 +2714,69 @@ Steam Deck Enhancement Pack GUI v{self.version}
     
     def load_offline_info(self):
         """Загрузка информации о offline-режиме"""
-        try:
-            info = "=== OFFLINE-РЕЖИМ STEAM DECK ===\n\n"
+        self.load_cached_field("offline_info", self.offline_info, self.compute_offline_info)
+    
+    def compute_offline_info(self):
+        """Текст информации о offline-режиме (выполняется в фоне)"""
+        info = "=== OFFLINE-РЕЖИМ STEAM DECK ===\n\n"
+        
+        # Проверяем наличие offline-утилит
+        offline_dir = Path.home() / "SteamDeck_Offline"
+        if offline_dir.exists():
+            info += "✅ Offline-утилиты установлены\n"
             
-            # Проверяем наличие offline-утилит
-            offline_dir = Path.home() / "SteamDeck_Offline"
-            if offline_dir.exists():
-                info += "✅ Offline-утилиты установлены\n"
-                
-                # Проверяем профили
-                profiles_dir = Path.home() / ".steamdeck_profiles"
-                if profiles_dir.exists():
-                    profiles = list(profiles_dir.glob("*.sh"))
-                    info += f"✅ Профили производительности: {len(profiles)}\n"
-                else:
-                    info += "❌ Профили производительности не найдены\n"
-                
-                # Проверяем медиа-библиотеку
-                media_dir = offline_dir / "Media"
-                if media_dir.exists():
-                    media_files = list(media_dir.rglob("*"))
-                    info += f"✅ Медиа-файлы: {len(media_files)}\n"
-                else:
-                    info += "❌ Медиа-библиотека не настроена\n"
-                
-                # Проверяем ROM-ы
-                roms_dir = offline_dir / "ROMs"
-                if roms_dir.exists():
-                    rom_files = list(roms_dir.rglob("*"))
-                    info += f"✅ ROM-файлы: {len(rom_files)}\n"
-                else:
-                    info += "❌ ROM-библиотека не настроена\n"
-                    
+            # Проверяем профили
+            profiles_dir = Path.home() / ".steamdeck_profiles"
+            if profiles_dir.exists():
+                profiles = list(profiles_dir.glob("*.sh"))
+                info += f"✅ Профили производительности: {len(profiles)}\n"
             else:
-                info += "❌ Offline-утилиты не установлены\n"
-                info += "Нажмите 'Настройка Offline' для установки\n"
+                info += "❌ Профили производительности не найдены\n"
             
-            # Проверяем Steam
-            steam_config = Path.home() / ".steam" / "steam" / "config" / "config.vdf"
-            if steam_config.exists():
-                with open(steam_config, 'r') as f:
-                    content = f.read()
-                    if "AutoUpdateBehavior=0" in content:
-                        info += "✅ Steam настроен для offline-режима\n"
-                    else:
-                        info += "⚠️ Steam не настроен для offline-режима\n"
+            # Проверяем медиа-библиотеку
+            media_dir = offline_dir / "Media"
+            if media_dir.exists():
+                media_files = list(media_dir.rglob("*"))
+                info += f"✅ Медиа-файлы: {len(media_files)}\n"
             else:
-                info += "❌ Steam не найден\n"
+                info += "❌ Медиа-библиотека не настроена\n"
             
-            # Проверяем сетевые интерфейсы
-            try:
-                result = subprocess.run(['rfkill', 'list'], capture_output=True, text=True)
-                if 'wifi' in result.stdout.lower():
-                    if 'blocked' in result.stdout.lower():
-                        info += "📶 Wi-Fi отключен (экономия батареи)\n"
-                    else:
-                        info += "📶 Wi-Fi включен\n"
-            except:
-                info += "❓ Статус Wi-Fi неизвестен\n"
-            
-            self.offline_info.insert(tk.END, info)
-            
-        except Exception as e:
-            self.offline_info.insert(tk.END, f"Ошибка загрузки информации: {e}")
+            # Проверяем ROM-ы
+            roms_dir = offline_dir / "ROMs"
+            if roms_dir.exists():
+                rom_files = list(roms_dir.rglob("*"))
+                info += f"✅ ROM-файлы: {len(rom_files)}\n"
+            else:
+                info += "❌ ROM-библиотека не настроена\n"
+                
+        else:
+            info += "❌ Offline-утилиты не установлены\n"
+            info += "Нажмите 'Настройка Offline' для установки\n"
+        
+        # Проверяем Steam
+        steam_config = Path.home() / ".steam" / "steam" / "config" / "config.vdf"
+        if steam_config.exists():
+            with open(steam_config, 'r') as f:
+                content = f.read()
+                if "AutoUpdateBehavior=0" in content:
+                    info += "✅ Steam настроен для offline-режима\n"
+                else:
+                    info += "⚠️ Steam не настроен для offline-режима\n"
+        else:
+            info += "❌ Steam не найден\n"
+        
+        # Проверяем сетевые интерфейсы
+        try:
+            result = subprocess.run(['rfkill', 'list'], capture_output=True, text=True)
+            if 'wifi' in result.stdout.lower():
+                if 'blocked' in result.stdout.lower():
+                    info += "📶 Wi-Fi отключен (экономия батареи)\n"
+                else:
+                    info += "📶 Wi-Fi включен\n"
+        except:
+            info += "❓ Статус Wi-Fi неизвестен\n"
+        
+        return info
     
     def run_offline_menu(self):
         """Запуск главного меню offline-утилит"""
@@ -2219,6 +2918,8 @@ Steam Deck Enhancement Pack GUI v{self.version}
     
     def run_game_with_sniper(self):
         """Запуск игры через SteamLinuxRuntime - Sniper"""
+        from tkinter import filedialog
+        
         game_path = filedialog.askopenfilename(
             title="Выберите игру для запуска через Sniper",
             filetypes=[("Executable files", "*.sh *.x86_64 *.bin"), ("All files", "*.*")]
@@ -2237,6 +2938,8 @@ Steam Deck Enhancement Pack GUI v{self.version}
     
     def diagnose_game(self):
         """Диагностика проблем с игрой"""
+        from tkinter import filedialog
+        
         game_path = filedialog.askopenfilename(
             title="Выберите игру для диагностики",
             filetypes=[("Executable files", "*.sh *.x86_64 *.bin"), ("All files", "*.*")]
@@ -2343,6 +3046,8 @@ Steam Deck Enhancement Pack GUI v{self.version}
     
     def extract_steamrip_rar(self):
         """Диалог распаковки RAR файла SteamRip"""
+        from tkinter import filedialog
+        
         rar_file = filedialog.askopenfilename(
             title="Выберите RAR файл SteamRip для распаковки",
             filetypes=[("RAR files", "*.rar"), ("All files", "*.*")]
@@ -2354,6 +3059,8 @@ Steam Deck Enhancement Pack GUI v{self.version}
     
     def analyze_steamrip_rar(self):
         """Диалог анализа RAR файла SteamRip"""
+        from tkinter import filedialog
+        
         rar_file = filedialog.askopenfilename(
             title="Выберите RAR файл SteamRip для анализа",
             filetypes=[("RAR files", "*.rar"), ("All files", "*.*")]
@@ -2363,10 +3070,8 @@ Steam Deck Enhancement Pack GUI v{self.version}
             self.show_progress(f"Анализ {os.path.basename(rar_file)}...")
             self.run_script("steamdeck_steamrip.sh", f"analyze \"{rar_file}\"")
 
-    def create_artwork_tab(self, notebook):
+    def create_artwork_tab(self, artwork_frame):
         """Создание вкладки 'Обложки'"""
-        artwork_frame = ttk.Frame(notebook)
-        notebook.add(artwork_frame, text="🎨 Обложки")
         
         # Заголовок
         title_label = ttk.Label(artwork_frame, text="Управление обложками Steam Deck", 
@@ -2479,6 +3184,8 @@ Steam Deck Enhancement Pack GUI v{self.version}
 
     def create_game_artwork(self):
         """Создание обложек для игры"""
+        from tkinter import simpledialog
+        
         game_name = simpledialog.askstring("Создание обложек", "Введите название игры:")
         if game_name:
             self.run_script("steamdeck_create_artwork.sh", f"create-game \"{game_name}\"", 
@@ -2486,6 +3193,8 @@ Steam Deck Enhancement Pack GUI v{self.version}
 
     def download_from_steamgriddb(self):
         """Скачивание обложек с Steam Grid DB"""
+        from tkinter import simpledialog
+        
         game_name = simpledialog.askstring("Steam Grid DB", "Введите название игры:")
         if game_name:
             self.run_script("steamdeck_steamgriddb.sh", f"install \"{game_name}\"", 
@@ -2539,18 +3248,12 @@ def check_dependencies():
     except ImportError:
         missing_deps.append("tkinter (python3-tk)")
     
-    try:
-        import psutil
-    except ImportError:
-        missing_deps.append("psutil")
-    
     if missing_deps:
         print("❌ Отсутствуют зависимости:")
         for dep in missing_deps:
             print(f"   - {dep}")
         print("\nУстановите зависимости:")
         print("   sudo pacman -S python3-tk")
-        print("   pip install psutil")
         return False
     
     return True
@@ -2770,6 +3473,16 @@ def main():
         root = tk.Tk()
         app = SteamDeckGUI(root)
         root.mainloop()
+        if app.privileged is not None:
+            app.privileged.close()
+        app.stop_journal()
+        app.stop_game_watch()
+        # Фоновые bash-обработчики есть, только если запросы статуса выполнялись
+        workers = sys.modules.get("steamdeck_worker")
+        if workers is not None:
+            workers.close_workers()
+        # Дописываем очередь лога на диск до выхода
+        app.logger.shutdown()
         
     except Exception as e:
         print(f"❌ Ошибка создания GUI: {e}")
@@ -22,6 +22,9 @@ print_warning() { echo -e "${YELLOW}[WARNING]${NC} $1"; }
 print_error() { echo -e "${RED}[ERROR]${NC} $1"; }
 print_header() { echo -e "${CYAN}=== $1 ===${NC}"; }
 
+# Протокол прогресса для GUI
+source "$(dirname "$(readlink -f "${BASH_SOURCE[0]}")")/steamdeck_progress.sh"
+
 # Массивы приложений
 declare -A EMULATORS
 declare -A LAUNCHERS
@@ -136,12 +139,16 @@ install_app() {
 install_multiple() {
     local -n apps_ref="$1"
     local selected_apps=("${@:2}")
+    local i
     
-    for app in "${selected_apps[@]}"; do
+    for i in "${!selected_apps[@]}"; do
+        local app="${selected_apps[$i]}"
+        progress_items install "$i" "${#selected_apps[@]}" "$app"
         if [[ -n "${apps_ref[$app]}" ]]; then
             install_app "$app" apps_ref
         fi
     done
+    progress_items install "${#selected_apps[@]}" "${#selected_apps[@]}"
 }
 
 # Функция для проверки установки
@@ -491,13 +498,19 @@ quick_install() {
             "Discord"
         )
         
-        for app in "${flatpak_apps[@]}"; do
-            install_app "$app" LAUNCHERS
+        # Flatpak-приложения плюс один шаг системных пакетов
+        local total=$(( ${#flatpak_apps[@]} + 1 ))
+        local i
+        for i in "${!flatpak_apps[@]}"; do
+            progress_items install "$i" "$total" "${flatpak_apps[$i]}"
+            install_app "${flatpak_apps[$i]}" LAUNCHERS
         done
         
         # Установка через pacman
         print_message "Установка системных пакетов..."
+        progress_items install "${#flatpak_apps[@]}" "$total" "pacman"
         sudo pacman -S unrar p7zip zip unzip --noconfirm
+        progress_items install "$total" "$total"
         
         print_success "Быстрая установка завершена!"
         read -p "Нажмите Enter для продолжения..."
@@ -652,5 +665,7 @@ main() {
     esac
 }
 
-# Запуск
-main "$@"
+# Запуск (фоновый обработчик steamdeck_worker.sh только подключает функции)
+if [[ -z "${STEAMDECK_WORKER:-}" ]]; then
+    main "$@"
+fi
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Steam Deck Enhancement Pack - Потоковое чтение системного журнала
+Фоновый поток читает `journalctl -f -o json` с сохранённого курсора и
+передаёт новые записи потребителю (вкладке "Логи") пачками. Очередь
+ограничена: пока потребитель не забрал записи, поток чтения ждёт, а
+journalctl останавливается на заполненном канале.
+Автор: @ncux11
+Версия: динамическая (читается из VERSION)
+"""
+
+import json
+import os
+import queue
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, NamedTuple, Optional, Sequence
+
+CURSOR_FILE = Path.home() / ".steamdeck_gui" / "journal.cursor"
+
+# Записей при первом запуске (курсор ещё не сохранён)
+JOURNAL_BACKLOG = 50
+
+# Записей в очереди до приостановки чтения
+JOURNAL_QUEUE_SIZE = 2000
+
+# Приоритеты syslog (journalctl -p)
+PRIORITIES = {
+    "emerg": 0, "alert": 1, "crit": 2, "err": 3,
+    "warning": 4, "notice": 5, "info": 6, "debug": 7,
+}
+
+
+class JournalEntry(NamedTuple):
+    """Запись системного журнала"""
+    timestamp: float
+    priority: int
+    identifier: str
+    pid: str
+    message: str
+    cursor: str
+    
+    def format(self) -> str:
+        """Строка в формате `journalctl -o short`"""
+        when = time.strftime("%b %d %H:%M:%S", time.localtime(self.timestamp))
+        pid = f"[{self.pid}]" if self.pid else ""
+        return f"{when} {self.identifier}{pid}: {self.message}"
+
+
+def parse_entry(line: str) -> Optional[JournalEntry]:
+    """Разбор строки `journalctl -o json` (None для некорректной строки)"""
+    try:
+        data = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or "__CURSOR" not in data:
+        return None
+    
+    message = data.get("MESSAGE", "")
+    if isinstance(message, list):
+        # Двоичные сообщения journald отдаёт массивом байтов
+        message = bytes(message).decode("utf-8", errors="replace")
+    try:
+        timestamp = int(data.get("__REALTIME_TIMESTAMP", 0)) / 1e6
+        priority = int(data.get("PRIORITY", 6))
+    except (TypeError, ValueError):
+        timestamp, priority = 0.0, 6
+    identifier = (data.get("SYSLOG_IDENTIFIER") or data.get("_SYSTEMD_UNIT")
+                  or data.get("_COMM") or "kernel")
+    return JournalEntry(timestamp, priority, str(identifier),
+                        str(data.get("_PID", "")), str(message), data["__CURSOR"])
+
+
+class JournalFollower:
+    """
+    Фоновое чтение системного журнала
+    
+    Поток чтения кладёт записи в ограниченную очередь и вызывает
+    on_ready() один раз до следующего опустошения очереди; потребитель
+    забирает записи вызовом drain() и, если pending ещё не 0, планирует
+    следующий drain() сам. Курсор последней переданной записи сохраняется,
+    поэтому следующий запуск продолжает с неё, а не перечитывает историю.
+    """
+    
+    def __init__(self, on_ready: Callable[[], None],
+                 units: Sequence[str] = (), priority: Optional[int] = None,
+                 cursor_file=CURSOR_FILE, backlog: int = JOURNAL_BACKLOG,
+                 queue_size: int = JOURNAL_QUEUE_SIZE):
+        """
+        Args:
+            on_ready: Вызывается из потока чтения, когда появились записи
+            units: Юниты systemd (journalctl -u), пусто - все
+            priority: Максимальный приоритет (0-7, journalctl -p), None - все
+            cursor_file: Файл сохранённого курсора (None - не сохранять)
+            backlog: Записей при запуске без сохранённого курсора
+        """
+        self.on_ready = on_ready
+        self.units = list(units)
+        self.priority = priority
+        self.cursor_file = Path(cursor_file) if cursor_file else None
+        self.backlog = backlog
+        self.error: Optional[str] = None
+        
+        self._queue: "queue.Queue[JournalEntry]" = queue.Queue(maxsize=queue_size)
+        self._process: Optional[subprocess.Popen] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._cursor: Optional[str] = None
+        self._notify_lock = threading.Lock()
+        self._notified = False
+    
+    @property
+    def running(self) -> bool:
+        """Поток чтения работает"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def command(self, cursor: Optional[str] = None) -> List[str]:
+        """Команда journalctl для текущих фильтров"""
+        cmd = ["journalctl", "--follow", "--output=json", "--no-pager"]
+        if cursor:
+            cmd.append(f"--after-cursor={cursor}")
+        else:
+            cmd.append(f"--lines={self.backlog}")
+        for unit in self.units:
+            cmd.append(f"--unit={unit}")
+        if self.priority is not None:
+            cmd.append(f"--priority={self.priority}")
+        return cmd
+    
+    def start(self):
+        """Запуск чтения с сохранённого курсора"""
+        if self.running:
+            return
+        self._stop.clear()
+        self.error = None
+        self._cursor = self._load_cursor()
+        self._thread = threading.Thread(target=self._run, name="journal-follow", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Остановка чтения и сохранение курсора"""
+        self._stop.set()
+        process = self._process
+        if process is not None and process.poll() is None:
+            process.terminate()
+        # Освобождаем место, если поток ждёт заполненной очереди
+        self._discard()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        self.save_cursor()
+    
+    def drain(self, limit: Optional[int] = None) -> List[JournalEntry]:
+        """Забрать накопленные записи (без ожидания)"""
+        entries = []
+        with self._notify_lock:
+            while limit is None or len(entries) < limit:
+                try:
+                    entries.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if self._queue.empty():
+                self._notified = False
+        if entries:
+            self._cursor = entries[-1].cursor
+        return entries
+    
+    @property
+    def pending(self) -> int:
+        """Записей в очереди"""
+        return self._queue.qsize()
+    
+    def save_cursor(self):
+        """Сохранение курсора последней переданной записи"""
+        if self.cursor_file is None or not self._cursor:
+            return
+        try:
+            self.cursor_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cursor_file.with_suffix(".tmp")
+            tmp_path.write_text(self._cursor, encoding="utf-8")
+            os.replace(tmp_path, self.cursor_file)
+        except OSError:
+            pass
+    
+    def _load_cursor(self) -> Optional[str]:
+        if self.cursor_file is None:
+            return None
+        try:
+            return self.cursor_file.read_text(encoding="utf-8").strip() or None
+        except OSError:
+            return None
+    
+    def _run(self):
+        try:
+            self._process = subprocess.Popen(
+                self.command(self._cursor),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                stdin=subprocess.DEVNULL,
+                text=True,
+                encoding="utf-8",
+                errors="replace"
+            )
+        except OSError as e:
+            self.error = f"journalctl недоступен: {e}"
+            self.on_ready()
+            return
+        
+        try:
+            for line in self._process.stdout:
+                entry = parse_entry(line)
+                if entry is None:
+                    continue
+                # Заполненная очередь приостанавливает чтение (и journalctl)
+                while not self._stop.is_set():
+                    try:
+                        self._queue.put(entry, timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+                if self._stop.is_set():
+                    break
+                self._notify()
+        finally:
+            if self._process.poll() is None:
+                self._process.terminate()
+            self._process.wait()
+            if not self._stop.is_set() and self._process.returncode not in (0, None):
+                self.error = f"journalctl завершился с кодом {self._process.returncode}"
+                self.on_ready()
+    
+    def _notify(self):
+        with self._notify_lock:
+            if self._notified:
+                return
+            self._notified = True
+        self.on_ready()
+    
+    def _discard(self):
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+
+if __name__ == "__main__":
+    import sys
+    
+    follower = JournalFollower(lambda: None, units=sys.argv[1:], cursor_file=None)
+    follower.start()
+    try:
+        while follower.running or follower.pending:
+            for item in follower.drain():
+                print(item.format())
+            time.sleep(0.2)
+        if follower.error:
+            print(follower.error)
+    except KeyboardInterrupt:
+        follower.stop()
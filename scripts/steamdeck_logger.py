@@ -6,11 +6,22 @@ Steam Deck Enhancement Pack - Система логирования
 """
 
 import os
+import atexit
 import logging
+import queue
+import threading
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
 
+# Максимум записей в очереди; при переполнении новые записи отбрасываются,
+# а не задерживают вызывающий поток
+LOG_QUEUE_SIZE = 10000
+
+# Время ожидания записи очереди на диск при flush()/shutdown() (секунды)
+LOG_FLUSH_TIMEOUT = 2.0
+
 
 def get_version():
     """Получение версии из файла VERSION"""
@@ -29,8 +40,98 @@ def get_version():
         return "0.1.3"  # Fallback версия
 
 
+class BufferedFileHandler(logging.FileHandler):
+    """Файловый обработчик без сброса на диск после каждой записи
+    
+    Буфер сбрасывает LogQueueListener, когда очередь опустела, поэтому
+    пачка записей уходит на диск одной операцией.
+    """
+    
+    def emit(self, record):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class LogQueueListener(QueueListener):
+    """Поток записи логов: обрабатывает очередь и сбрасывает буферы пачками"""
+    
+    def dequeue(self, block):
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            # Очередь опустела - пачка записана, сбрасываем её на диск
+            self.flush_handlers()
+            return self.queue.get(block)
+    
+    def handle(self, record):
+        if isinstance(record, threading.Event):
+            # Маркер flush(): всё, что было в очереди до него, уже записано
+            self.flush_handlers()
+            record.set()
+            return
+        super().handle(record)
+    
+    def enqueue_sentinel(self):
+        # Ждём места в очереди: маркер остановки не должен потеряться
+        self.queue.put(self._sentinel)
+    
+    @property
+    def running(self):
+        """Поток записи запущен"""
+        return self._thread is not None
+    
+    def flush_handlers(self):
+        for handler in self.handlers:
+            handler.flush()
+
+
+class LogQueueHandler(QueueHandler):
+    """Передача записей в очередь без блокировки вызывающего потока"""
+    
+    def __init__(self, log_queue, listener):
+        super().__init__(log_queue)
+        self.listener = listener
+        self.dropped = 0
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+    
+    def flush(self, timeout=LOG_FLUSH_TIMEOUT):
+        """Дождаться записи на диск всего, что уже в очереди"""
+        if not self.listener.running:
+            return True
+        marker = threading.Event()
+        try:
+            self.queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.wait(timeout)
+    
+    def close(self):
+        """Остановка потока записи и закрытие файлов"""
+        if self.listener.running:
+            self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+        super().close()
+
+
 class SteamDeckLogger:
-    """Класс для логирования операций Steam Deck Enhancement Pack"""
+    """
+    Класс для логирования операций Steam Deck Enhancement Pack
+    
+    Вызывающий поток (GUI, обработчики вывода скриптов) только кладёт
+    запись в ограниченную очередь; в файл и консоль пишет отдельный поток.
+    Перед чтением файла лога вызывайте flush(), при выходе - shutdown()
+    (также вызывается автоматически при завершении процесса).
+    """
     
     def __init__(self, log_dir: Optional[str] = None):
         """
@@ -55,11 +156,13 @@ class SteamDeckLogger:
         self.logger.setLevel(logging.INFO)
         
         # Удаляем существующие обработчики чтобы избежать дублирования
+        # (обработчик очереди предыдущего экземпляра дописывает и закрывает файл)
         for handler in self.logger.handlers[:]:
             self.logger.removeHandler(handler)
+            handler.close()
         
-        # Обработчик для записи в файл
-        file_handler = logging.FileHandler(self.log_file, encoding='utf-8')
+        # Обработчик для записи в файл (файл открывается потоком записи)
+        file_handler = BufferedFileHandler(self.log_file, encoding='utf-8', delay=True)
         file_handler.setLevel(logging.INFO)
         
         # Обработчик для вывода в консоль
@@ -75,10 +178,29 @@ class SteamDeckLogger:
         file_handler.setFormatter(formatter)
         console_handler.setFormatter(formatter)
         
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        # Структурированные записи операций (SQLite) для запросов и статистики
+        # рядом с журналами; общее хранилище процесса - для каталога по умолчанию
+        from steamdeck_opstore import STORE_FILE, OperationStore, OperationStoreHandler, get_store
+        store_file = self.log_dir / STORE_FILE.name
+        self.store = get_store() if store_file == STORE_FILE else OperationStore(store_file)
+        
+        # Запись в файл, консоль и хранилище операций выполняет отдельный поток
+        listener = LogQueueListener(
+            queue.Queue(maxsize=LOG_QUEUE_SIZE),
+            file_handler,
+            console_handler,
+            OperationStoreHandler(self.store),
+            respect_handler_level=True
+        )
+        self.queue_handler = LogQueueHandler(listener.queue, listener)
+        self.logger.addHandler(self.queue_handler)
+        listener.start()
+        
+        atexit.register(self.shutdown)
     
-    def log_operation(self, operation: str, status: str, details: str = ""):
+    def log_operation(self, operation: str, status: str, details: str = "",
+                      duration: Optional[float] = None, exit_code: Optional[int] = None,
+                      script: Optional[str] = None):
         """
         Логирование операции
         
@@ -86,6 +208,9 @@ class SteamDeckLogger:
             operation: Название операции
             status: Статус (success, error, warning, info)
             details: Дополнительные детали
+            duration: Длительность операции в секундах
+            exit_code: Код возврата скрипта
+            script: Имя выполненного скрипта
         """
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
@@ -105,24 +230,58 @@ class SteamDeckLogger:
         message = f"{status_icon} {operation}"
         if details:
             message += f" - {details}"
+        if duration is not None:
+            message += f" ({duration:.1f} с"
+            message += f", код {exit_code})" if exit_code is not None else ")"
+        elif exit_code is not None:
+            message += f" (код {exit_code})"
         
-        self.logger.log(level, message)
+        # Поля записи для хранилища операций (пишет поток логгера)
+        record = {
+            "operation": operation,
+            "status": status,
+            "details": details,
+            "duration": duration,
+            "exit_code": exit_code,
+            "script": script,
+        }
+        self.logger.log(level, message, extra={"operation_record": record})
     
-    def log_success(self, operation: str, details: str = ""):
+    def log_success(self, operation: str, details: str = "", **fields):
         """Логирование успешной операции"""
-        self.log_operation(operation, "success", details)
+        self.log_operation(operation, "success", details, **fields)
     
-    def log_error(self, operation: str, details: str = ""):
+    def log_error(self, operation: str, details: str = "", **fields):
         """Логирование ошибки"""
-        self.log_operation(operation, "error", details)
+        self.log_operation(operation, "error", details, **fields)
     
-    def log_warning(self, operation: str, details: str = ""):
+    def log_warning(self, operation: str, details: str = "", **fields):
         """Логирование предупреждения"""
-        self.log_operation(operation, "warning", details)
+        self.log_operation(operation, "warning", details, **fields)
     
-    def log_info(self, operation: str, details: str = ""):
+    def log_info(self, operation: str, details: str = "", **fields):
         """Логирование информационного сообщения"""
-        self.log_operation(operation, "info", details)
+        self.log_operation(operation, "info", details, **fields)
+    
+    @property
+    def dropped(self) -> int:
+        """Количество записей, отброшенных из-за переполнения очереди"""
+        return self.queue_handler.dropped
+    
+    def flush(self, timeout: float = LOG_FLUSH_TIMEOUT) -> bool:
+        """
+        Дождаться записи на диск всех уже поставленных в очередь записей
+        
+        Returns:
+            True если очередь записана за timeout секунд
+        """
+        return self.queue_handler.flush(timeout)
+    
+    def shutdown(self):
+        """Записать очередь, остановить поток записи и закрыть файл лога"""
+        if self.queue_handler in self.logger.handlers:
+            self.logger.removeHandler(self.queue_handler)
+        self.queue_handler.close()
     
     def get_log_path(self) -> str:
         """Получить путь к текущему файлу лога"""
@@ -138,14 +297,16 @@ class SteamDeckLogger:
         
         Args:
             lines: Количество строк для чтения
-            
+        
         Returns:
             Последние строки лога
         """
+        from steamdeck_logreader import tail_lines
+        
+        self.flush()
         try:
-            with open(self.log_file, 'r', encoding='utf-8') as f:
-                all_lines = f.readlines()
-                return ''.join(all_lines[-lines:])
+            # Файл читается блоками с конца, а не целиком
+            return ''.join(line + '\n' for line in tail_lines(self.log_file, lines))
         except FileNotFoundError:
             return "Лог файл не найден"
         except Exception as e:
@@ -157,12 +318,13 @@ class SteamDeckLogger:
         
         Args:
             export_path: Путь для экспорта
-            
+        
         Returns:
             True если успешно, False если ошибка
         """
         try:
             import shutil
+            self.flush()
             shutil.copy2(self.log_file, export_path)
             self.log_success("Log Export", f"Экспортировано в {export_path}")
             return True
@@ -183,19 +345,41 @@ class SteamDeckLogger:
             cutoff_time = current_time - (days * 24 * 60 * 60)
             
             deleted_count = 0
+            from steamdeck_logreader import remove_index
+            
             for log_file in self.log_dir.glob("steamdeck_*.log"):
                 if log_file.stat().st_mtime < cutoff_time:
                     log_file.unlink()
+                    remove_index(log_file)
                     deleted_count += 1
             
+            self.store.prune(cutoff_time)
+            
             if deleted_count > 0:
                 self.log_info("Log Cleanup", f"Удалено {deleted_count} старых логов")
         except Exception as e:
             self.log_error("Log Cleanup", f"Ошибка очистки: {e}")
 
 
-# Глобальный экземпляр логгера для использования в других модулях
-logger = SteamDeckLogger()
+_logger: Optional[SteamDeckLogger] = None
+_logger_lock = threading.Lock()
+
+
+def get_logger() -> SteamDeckLogger:
+    """Общий логгер процесса (создаётся при первом обращении)"""
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            _logger = SteamDeckLogger()
+        return _logger
+
+
+def __getattr__(name):
+    # Глобальный экземпляр логгера для использования в других модулях
+    # (создаётся при первом обращении к steamdeck_logger.logger, а не при импорте)
+    if name == "logger":
+        return get_logger()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
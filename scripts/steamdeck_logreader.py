@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Steam Deck Enhancement Pack - Чтение логов операций
+Хвост файла читается с конца блоками, без загрузки всего файла. Для
+постраничного просмотра, фильтра по уровню и операции и перехода ко
+времени строится разреженный индекс (смещение, время и уровни каждого
+INDEX_STEP-го блока строк), который сохраняется рядом с логами и
+дополняется по мере роста файла.
+Автор: @ncux11
+Версия: динамическая (читается из VERSION)
+"""
+
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+LOG_DIR = Path.home() / ".steamdeck_logs"
+INDEX_DIR_NAME = ".index"
+
+# Строк в блоке индекса (на каждый блок - одна контрольная точка)
+INDEX_STEP = 256
+
+# Размер блока при чтении файла с конца (байты)
+TAIL_BLOCK = 64 * 1024
+
+INDEX_VERSION = 1
+
+# Уровни logging -> биты маски уровней блока
+LEVEL_BITS = {"DEBUG": 1, "INFO": 2, "WARNING": 4, "ERROR": 8, "CRITICAL": 16}
+LEVELS = tuple(LEVEL_BITS)
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class LogLine(NamedTuple):
+    """Строка лога с разобранными полями"""
+    number: int
+    timestamp: Optional[float]
+    level: str
+    text: str
+
+
+def parse_line(text: str) -> Tuple[Optional[float], str]:
+    """
+    Время и уровень строки формата SteamDeckLogger
+    ("2025-10-01 12:00:00 - INFO - ...")
+    
+    Returns:
+        (timestamp, level) или (None, "") для строки-продолжения
+    """
+    if len(text) < 23 or text[19:22] != " - ":
+        return None, ""
+    timestamp = _parse_time(text[:19])
+    if timestamp is None:
+        return None, ""
+    level = text[22:].split(" - ", 1)[0].strip()
+    return timestamp, level if level in LEVEL_BITS else ""
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_time(text: str) -> Optional[float]:
+    # Соседние строки обычно записаны в одну секунду: разбор кэшируется
+    try:
+        return time.mktime(time.strptime(text, TIME_FORMAT))
+    except ValueError:
+        return None
+
+
+def tail_lines(path, count: int, block_size: int = TAIL_BLOCK) -> List[str]:
+    """Последние count строк файла (чтение блоками с конца)"""
+    if count <= 0:
+        return []
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        # count переводов строки + неполная строка в начале блока
+        while position > 0 and data.count(b"\n") <= count:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    lines = data.decode("utf-8", errors="replace").splitlines()
+    return lines[-count:]
+
+
+def log_files(log_dir=LOG_DIR) -> List[Path]:
+    """Файлы логов по дням, новые первыми"""
+    return sorted(Path(log_dir).glob("steamdeck_*.log"), reverse=True)
+
+
+class LogReader:
+    """
+    Постраничное чтение одного файла лога через разреженный индекс
+    
+    Номера строк начинаются с 0. Читаются только полные строки: строка,
+    которая ещё дописывается, появится при следующем обращении.
+    """
+    
+    def __init__(self, path, index_dir: Optional[Path] = None):
+        self.path = Path(path)
+        self.index_dir = Path(index_dir) if index_dir else self.path.parent / INDEX_DIR_NAME
+        self.index_path = self.index_dir / f"{self.path.name}.json"
+        self._lock = threading.Lock()
+        self._index: Optional[Dict] = None
+    
+    @property
+    def line_count(self) -> int:
+        """Количество полных строк в файле"""
+        with self._lock:
+            return self._update_index()["lines"]
+    
+    def read(self, start: int = 0, count: int = 100,
+             levels: Optional[Iterable[str]] = None,
+             operation: str = "") -> Tuple[List[LogLine], Optional[int]]:
+        """
+        Строки начиная с номера start (вперёд)
+        
+        Args:
+            start: Номер первой строки
+            count: Максимум строк в ответе
+            levels: Оставить только эти уровни (None - все)
+            operation: Подстрока текста (без учёта регистра)
+        
+        Returns:
+            (строки, номер строки для следующей страницы или None в конце)
+        """
+        with self._lock:
+            index = self._update_index()
+            mask = self._level_mask(levels)
+            result: List[LogLine] = []
+            block = max(0, start) // INDEX_STEP
+            while block < len(index["blocks"]):
+                if mask == -1 or mask & index["blocks"][block][2]:
+                    for line in self._read_block(index, block):
+                        if line.number < start or not self._matches(line, mask, operation):
+                            continue
+                        result.append(line)
+                        if len(result) == count:
+                            following = line.number + 1
+                            return result, following if following < index["lines"] else None
+                block += 1
+            return result, None
+    
+    def read_before(self, end: Optional[int] = None, count: int = 100,
+                    levels: Optional[Iterable[str]] = None,
+                    operation: str = "") -> Tuple[List[LogLine], Optional[int]]:
+        """
+        Строки перед номером end (назад), в порядке файла
+        
+        Returns:
+            (строки, номер строки для предыдущей страницы или None в начале)
+        """
+        with self._lock:
+            index = self._update_index()
+            if end is None or end > index["lines"]:
+                end = index["lines"]
+            mask = self._level_mask(levels)
+            result: List[LogLine] = []
+            block = (end - 1) // INDEX_STEP
+            while block >= 0:
+                if mask == -1 or mask & index["blocks"][block][2]:
+                    lines = [line for line in self._read_block(index, block)
+                             if line.number < end and self._matches(line, mask, operation)]
+                    result[:0] = lines[-(count - len(result)):]
+                    if len(result) == count:
+                        return result, result[0].number if result[0].number > 0 else None
+                block -= 1
+            return result, None
+    
+    def tail(self, count: int = 50, levels: Optional[Iterable[str]] = None,
+             operation: str = "") -> List[LogLine]:
+        """Последние count строк (с фильтром)"""
+        return self.read_before(None, count, levels, operation)[0]
+    
+    def find_time(self, timestamp: float) -> int:
+        """Номер первой строки не раньше timestamp (line_count, если такой нет)"""
+        with self._lock:
+            index = self._update_index()
+            times = [entry[1] or 0.0 for entry in index["blocks"]]
+            # Последний блок, начавшийся не позже искомого времени
+            block = max(0, bisect.bisect_right(times, timestamp) - 1)
+            while block < len(index["blocks"]):
+                for line in self._read_block(index, block):
+                    if line.timestamp is not None and line.timestamp >= timestamp:
+                        return line.number
+                block += 1
+            return index["lines"]
+    
+    def _update_index(self) -> Dict:
+        """Загрузка индекса и дописывание строк, добавленных в файл"""
+        try:
+            stat = self.path.stat()
+        except OSError:
+            self._index = self._empty_index(None)
+            return self._index
+        
+        index = self._index if self._index is not None else self._load_index()
+        # Файл заменён или обрезан - строим заново
+        if (index is None or index["inode"] != stat.st_ino
+                or index["size"] > stat.st_size):
+            index = self._empty_index(stat.st_ino)
+        
+        if index["size"] < stat.st_size:
+            self._extend_index(index)
+            self._save_index(index)
+        self._index = index
+        return index
+    
+    def _extend_index(self, index: Dict):
+        blocks = index["blocks"]
+        offset = index["size"]
+        lines = index["lines"]
+        level = index["last_level"]
+        timestamp = index["last_time"]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                line_time, line_level = parse_line(raw.decode("utf-8", errors="replace"))
+                if line_time is not None:
+                    timestamp, level = line_time, line_level
+                if lines % INDEX_STEP == 0:
+                    # [смещение, время, маска уровней блока, уровень первой строки]
+                    blocks.append([offset, timestamp, 0, level])
+                blocks[-1][2] |= LEVEL_BITS.get(level, 0)
+                offset += len(raw)
+                lines += 1
+        index.update(size=offset, lines=lines, last_level=level, last_time=timestamp)
+    
+    def _read_block(self, index: Dict, block: int) -> List[LogLine]:
+        offset, timestamp, _, level = index["blocks"][block]
+        first = block * INDEX_STEP
+        count = min(INDEX_STEP, index["lines"] - first)
+        
+        result = []
+        for number, text in enumerate(self._read_raw(offset, count), first):
+            line_time, line_level = parse_line(text)
+            if line_time is not None:
+                timestamp, level = line_time, line_level
+            result.append(LogLine(number, timestamp, level, text))
+        return result
+    
+    def _read_raw(self, offset: int, count: int) -> List[str]:
+        lines = []
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                if len(lines) == count or not raw.endswith(b"\n"):
+                    break
+                lines.append(raw.decode("utf-8", errors="replace").rstrip("\n"))
+        return lines
+    
+    @staticmethod
+    def _level_mask(levels: Optional[Iterable[str]]) -> int:
+        if levels is None:
+            # Строки без уровня (до первой записи) тоже показываются
+            return -1
+        mask = 0
+        for level in levels:
+            mask |= LEVEL_BITS.get(level.upper(), 0)
+        return mask
+    
+    @staticmethod
+    def _matches(line: LogLine, mask: int, operation: str) -> bool:
+        if mask != -1 and not mask & LEVEL_BITS.get(line.level, 0):
+            return False
+        return not operation or operation.lower() in line.text.lower()
+    
+    @staticmethod
+    def _empty_index(inode) -> Dict:
+        return {"version": INDEX_VERSION, "inode": inode, "size": 0, "lines": 0,
+                "last_level": "", "last_time": None, "blocks": []}
+    
+    def _load_index(self) -> Optional[Dict]:
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+            return None
+        return index
+    
+    def _save_index(self, index: Dict):
+        # Атомарная замена, как у снимка панелей
+        import tempfile
+        try:
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=str(self.index_dir), prefix=".index-")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(index, f, separators=(",", ":"))
+            os.replace(tmp_path, self.index_path)
+        except (OSError, TypeError, ValueError):
+            os.unlink(tmp_path)
+
+
+_readers: Dict[Path, LogReader] = {}
+_readers_lock = threading.Lock()
+
+
+def get_reader(path) -> LogReader:
+    """Общий читатель файла (индекс остаётся в памяти между обращениями)"""
+    path = Path(path)
+    with _readers_lock:
+        reader = _readers.get(path)
+        if reader is None:
+            reader = _readers[path] = LogReader(path)
+        return reader
+
+
+def remove_index(path):
+    """Удаление индекса файла лога (вместе с самим логом)"""
+    path = Path(path)
+    with _readers_lock:
+        _readers.pop(path, None)
+    try:
+        (path.parent / INDEX_DIR_NAME / f"{path.name}.json").unlink()
+    except OSError:
+        pass
+
+
+if __name__ == "__main__":
+    import sys
+    
+    files = [Path(arg) for arg in sys.argv[1:]] or log_files()[:1]
+    for log_file in files:
+        reader = get_reader(log_file)
+        print(f"{log_file}: {reader.line_count} строк")
+        for line in reader.tail(10):
+            print(line.text)
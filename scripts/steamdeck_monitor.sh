@@ -22,31 +22,16 @@ print_warning() { echo -e "${YELLOW}[WARNING]${NC} $1"; }
 print_error() { echo -e "${RED}[ERROR]${NC} $1"; }
 print_header() { echo -e "${CYAN}=== $1 ===${NC}"; }
 
+# Системные пробы: чтение /proc и /sys без запуска lscpu, top, free и uptime
+PROBE_SCRIPT="$(dirname "$(readlink -f "${BASH_SOURCE[0]}")")/steamdeck_probe.py"
+probe() { python3 "$PROBE_SCRIPT" "$@"; }
+
+# Библиотеки Steam: игры по манифестам всех библиотек, включая SD карту
+STEAMLIB_SCRIPT="$(dirname "$PROBE_SCRIPT")/steamdeck_steamlib.py"
+
 # Получение информации о CPU
 get_cpu_info() {
-    print_header "CPU ИНФОРМАЦИЯ"
-    
-    # Модель процессора
-    local cpu_model=$(lscpu | grep "Model name" | cut -d: -f2 | xargs)
-    echo "Модель: $cpu_model"
-    
-    # Количество ядер
-    local cores=$(nproc)
-    echo "Ядра: $cores"
-    
-    # Текущая частота
-    local freq=$(cat /proc/cpuinfo | grep "cpu MHz" | head -1 | cut -d: -f2 | xargs)
-    echo "Частота: ${freq} MHz"
-    
-    # Загрузка CPU
-    local load=$(uptime | awk -F'load average:' '{print $2}' | xargs)
-    echo "Загрузка: $load"
-    
-    # Использование CPU по ядрам
-    echo "Использование по ядрам:"
-    top -bn1 | grep "Cpu(s)" | sed "s/.*, *\([0-9.]*\)%* id.*/\1/" | awk '{print "  CPU: " 100 - $1 "%"}'
-    
-    echo
+    probe cpu
 }
 
 # Получение информации о GPU
@@ -80,17 +65,7 @@ get_gpu_info() {
 
 # Получение информации о памяти
 get_memory_info() {
-    print_header "ПАМЯТЬ"
-    
-    # Общая информация о RAM
-    free -h | grep -E "(Mem|Swap)"
-    
-    # Детальная информация
-    echo
-    echo "Детальная информация:"
-    cat /proc/meminfo | grep -E "(MemTotal|MemFree|MemAvailable|Buffers|Cached|SwapTotal|SwapFree)"
-    
-    echo
+    probe memory
 }
 
 # Получение информации о диске
@@ -115,77 +90,12 @@ get_disk_info() {
 
 # Получение информации о температуре
 get_temperature_info() {
-    print_header "ТЕМПЕРАТУРА"
-    
-    # Температура CPU
-    if [[ -f "/sys/class/thermal/thermal_zone0/temp" ]]; then
-        local cpu_temp=$(cat /sys/class/thermal/thermal_zone0/temp)
-        local cpu_temp_c=$((cpu_temp / 1000))
-        echo "CPU: ${cpu_temp_c}°C"
-    fi
-    
-    # Температура GPU
-    if [[ -f "/sys/class/drm/card0/device/hwmon/hwmon*/temp1_input" ]]; then
-        local gpu_temp_file=$(find /sys/class/drm/card0/device/hwmon/hwmon*/temp1_input 2>/dev/null | head -1)
-        if [[ -f "$gpu_temp_file" ]]; then
-            local gpu_temp=$(cat "$gpu_temp_file")
-            local gpu_temp_c=$((gpu_temp / 1000))
-            echo "GPU: ${gpu_temp_c}°C"
-        fi
-    fi
-    
-    # Температура батареи
-    if [[ -f "/sys/class/power_supply/BAT0/temp" ]]; then
-        local bat_temp=$(cat /sys/class/power_supply/BAT0/temp 2>/dev/null || echo "N/A")
-        if [[ "$bat_temp" != "N/A" ]]; then
-            local bat_temp_c=$((bat_temp / 10))
-            echo "Батарея: ${bat_temp_c}°C"
-        fi
-    fi
-    
-    echo
+    probe temp
 }
 
 # Получение информации о батарее
 get_battery_info() {
-    print_header "БАТАРЕЯ"
-    
-    if [[ -f "/sys/class/power_supply/BAT0/capacity" ]]; then
-        local capacity=$(cat /sys/class/power_supply/BAT0/capacity)
-        local status=$(cat /sys/class/power_supply/BAT0/status)
-        local voltage=$(cat /sys/class/power_supply/BAT0/voltage_now 2>/dev/null || echo "N/A")
-        local current=$(cat /sys/class/power_supply/BAT0/current_now 2>/dev/null || echo "N/A")
-        
-        echo "Заряд: $capacity%"
-        echo "Статус: $status"
-        
-        if [[ "$voltage" != "N/A" ]]; then
-            local voltage_v=$((voltage / 1000000))
-            echo "Напряжение: ${voltage_v}.${voltage: -3}V"
-        fi
-        
-        if [[ "$current" != "N/A" ]]; then
-            local current_ma=$((current / 1000))
-            echo "Ток: ${current_ma}mA"
-        fi
-        
-        # Время работы (если доступно)
-        if command -v upower &> /dev/null; then
-            local time_to_empty=$(upower -i /org/freedesktop/UPower/devices/battery_BAT0 | grep "time to empty" | cut -d: -f2 | xargs)
-            local time_to_full=$(upower -i /org/freedesktop/UPower/devices/battery_BAT0 | grep "time to full" | cut -d: -f2 | xargs)
-            
-            if [[ -n "$time_to_empty" ]]; then
-                echo "Время до разряда: $time_to_empty"
-            fi
-            if [[ -n "$time_to_full" ]]; then
-                echo "Время до полной зарядки: $time_to_full"
-            fi
-        fi
-    else
-        echo "Информация о батарее недоступна"
-    fi
-    
-    echo
+    probe battery
 }
 
 # Получение информации о сети
@@ -241,48 +151,16 @@ get_steam_info() {
         echo "Steam: Не запущен"
     fi
     
-    # Размер Steam
-    if [[ -d "$HOME/.steam" ]]; then
-        local steam_size=$(du -sh "$HOME/.steam" 2>/dev/null | cut -f1)
-        echo "Размер Steam: $steam_size"
-    fi
-    
-    # Количество установленных игр
-    if [[ -d "$HOME/.steam/steam/steamapps" ]]; then
-        local game_count=$(find "$HOME/.steam/steam/steamapps" -name "*.acf" | wc -l)
-        echo "Установленных игр: $game_count"
-    fi
+    # Число и размер игр без обхода каталогов игр (манифесты кэшируются)
+    python3 "$STEAMLIB_SCRIPT" summary 2>/dev/null || \
+        echo "Библиотеки Steam не найдены"
     
     echo
 }
 
 # Получение информации о системе
 get_system_info() {
-    print_header "СИСТЕМА"
-    
-    # Время работы
-    local uptime=$(uptime -p)
-    echo "Время работы: $uptime"
-    
-    # Загрузка системы
-    local load=$(uptime | awk -F'load average:' '{print $2}' | xargs)
-    echo "Загрузка системы: $load"
-    
-    # Версия ядра
-    local kernel=$(uname -r)
-    echo "Ядро: $kernel"
-    
-    # Версия SteamOS
-    if [[ -f "/etc/os-release" ]]; then
-        local os_name=$(grep "PRETTY_NAME" /etc/os-release | cut -d= -f2 | tr -d '"')
-        echo "ОС: $os_name"
-    fi
-    
-    # Свободное место в /tmp
-    local tmp_free=$(df /tmp | tail -1 | awk '{print $4}')
-    echo "Свободно в /tmp: $(numfmt --to=iec $((tmp_free * 1024)))"
-    
-    echo
+    probe system
 }
 
 # Мониторинг в реальном времени
@@ -293,17 +171,8 @@ realtime_monitor() {
     print_message "Нажмите Ctrl+C для выхода"
     echo
     
-    while true; do
-        clear
-        print_header "STEAM DECK MONITOR - $(date)"
-        
-        get_cpu_info
-        get_memory_info
-        get_temperature_info
-        get_battery_info
-        
-        sleep "$interval"
-    done
+    # Один процесс на весь мониторинг: загрузка CPU считается между обновлениями
+    probe watch "$interval"
 }
 
 # Экспорт в файл
@@ -429,5 +298,7 @@ main() {
     esac
 }
 
-# Запуск
-main "$@"
+# Запуск (фоновый обработчик steamdeck_worker.sh только подключает функции)
+if [[ -z "${STEAMDECK_WORKER:-}" ]]; then
+    main "$@"
+fi
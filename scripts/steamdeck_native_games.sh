@@ -15,6 +15,9 @@ PROJECT_ROOT="$(dirname "$SCRIPT_DIR")"
 # Загружаем core библиотеку
 source "$PROJECT_ROOT/lib/core.sh"
 
+# Общий индекс файлов игр
+source "$SCRIPT_DIR/steamdeck_gameindex.sh"
+
 # Конфигурация
 GAMES_DIR="$HOME/Games"
 DOWNLOADS_DIR="$HOME/Downloads"
@@ -32,47 +35,17 @@ create_games_directory() {
 
 # Поиск .sh игр
 find_sh_games() {
-    local search_dirs=(
-        "$GAMES_DIR"
-        "$DOWNLOADS_DIR"
-        "$DESKTOP_DIR"
-        "$SD_CARD_DIR/Games"
-        "$SD_CARD_DIR"
-    )
-    
-    # Добавляем все возможные /run/media/* для флешек и SD карт
-    local media_dirs=()
-    if [[ -d "/run/media" ]]; then
-        while IFS= read -r -d '' dir; do
-            media_dirs+=("$dir")
-        done < <(find /run/media -maxdepth 1 -type d ! -path /run/media -print0 2>/dev/null)
-    fi
-    
-    # Добавляем в search_dirs
-    search_dirs+=("${media_dirs[@]}")
-    
+    # $GAMES_DIR, $DOWNLOADS_DIR, $DESKTOP_DIR, SD карта и все /run/media/*
+    # на глубину 3, без служебных скриптов (общий индекс)
     local found_games=()
     
     print_message "Поиск .sh игр в стандартных директориях..."
     
-    for dir in "${search_dirs[@]}"; do
-        if [[ -d "$dir" ]]; then
-            print_message "Поиск в: $dir"
-            
-            while IFS= read -r -d '' file; do
-                local filename=$(basename "$file")
-                local game_name=$(basename "$file" .sh)
-                
-                # Проверяем, что это может быть игра
-                if [[ ! "$filename" =~ ^(setup|install|config|start|run|steamdeck) ]] && 
-                   [[ ! "$filename" =~ ^\. ]] &&
-                   [[ -f "$file" ]]; then
-                    found_games+=("$game_name|$file")
-                    print_message "Найдена игра: $game_name ($file)"
-                fi
-            done < <(find "$dir" -maxdepth 3 -name "*.sh" -type f -print0 2>/dev/null)
-        fi
-    done
+    while IFS= read -r -d '' file; do
+        local game_name=$(basename "$file" .sh)
+        found_games+=("$game_name|$file")
+        print_message "Найдена игра: $game_name ($file)"
+    done < <(game_index_find sh)
     
     echo "${found_games[@]}"
 }
@@ -103,33 +76,10 @@ analyze_game_script() {
     print_message "Анализ содержимого скрипта:"
     echo
     
-    # Проверяем shebang
-    local shebang=$(head -1 "$script_path")
-    if [[ "$shebang" == \#!/bin/bash ]] || [[ "$shebang" == \#!/bin/sh ]]; then
-        print_success "Shebang: $shebang"
-    else
-        print_warning "Нестандартный shebang: $shebang"
-    fi
-    
-    # Ищем информацию об игре
-    local game_info=$(grep -i -E "(game|title|name|version)" "$script_path" | head -5)
-    if [[ -n "$game_info" ]]; then
-        print_message "Информация об игре:"
-        echo "$game_info" | sed 's/^/  /'
-    fi
-    
-    # Ищем зависимости
-    local dependencies=$(grep -i -E "(apt|yum|pacman|flatpak|wine|steam)" "$script_path" | head -5)
-    if [[ -n "$dependencies" ]]; then
-        print_message "Возможные зависимости:"
-        echo "$dependencies" | sed 's/^/  /'
-    fi
-    
-    # Ищем исполняемые файлы
-    local executables=$(grep -E "\.(exe|bin|app|run)$" "$script_path" | head -5)
-    if [[ -n "$executables" ]]; then
-        print_message "Исполняемые файлы:"
-        echo "$executables" | sed 's/^/  /'
+    # Формат, название, версия и зависимости - по текстовому заголовку,
+    # без чтения архива установщика (результат кэшируется)
+    if ! python3 "$SCRIPT_DIR/steamdeck_gamescript.py" analyze "$script_path"; then
+        print_warning "Не удалось проанализировать скрипт"
     fi
     
     echo
@@ -159,7 +109,11 @@ install_game() {
     # Проверяем, что это действительно bash скрипт
     if ! head -1 "$script_path" | grep -q "^#!"; then
         print_warning "Файл не похож на исполняемый скрипт"
-        read -p "Продолжить установку? (y/n): " confirm
+        # Без терминала (фоновая задача GUI) файл уже выбран пользователем явно
+        local confirm="y"
+        if [[ -t 0 ]]; then
+            read -p "Продолжить установку? (y/n): " confirm
+        fi
         if [[ ! "$confirm" =~ ^[Yy]$ ]]; then
             return 1
         fi
@@ -608,7 +562,7 @@ main() {
             find_sh_games
             ;;
         "analyze")
-            if [[ -z "$2" ]]; then
+            if [[ -z "${2:-}" ]]; then
                 print_error "Укажите путь к скрипту"
                 show_help
                 exit 1
@@ -616,7 +570,7 @@ main() {
             analyze_game_script "$2"
             ;;
         "install")
-            if [[ -z "$2" ]] || [[ -z "$3" ]]; then
+            if [[ -z "${2:-}" ]] || [[ -z "${3:-}" ]]; then
                 print_error "Укажите название игры и путь к скрипту"
                 show_help
                 exit 1
@@ -646,5 +600,7 @@ main() {
     esac
 }
 
-# Запуск
-main "$@"
+# Запуск (фоновый обработчик steamdeck_worker.sh только подключает функции)
+if [[ -z "${STEAMDECK_WORKER:-}" ]]; then
+    main "$@"
+fi
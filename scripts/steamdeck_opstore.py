@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Steam Deck Enhancement Pack - Журнал операций (SQLite)
+Структурированные записи операций рядом с текстовым логом: операция,
+статус, детали, длительность, код возврата и скрипт. База работает в
+режиме WAL: запись идёт из потока логгера, чтение (вкладка "Логи",
+статистика) - из любого потока без блокировки записи.
+Автор: @ncux11
+Версия: динамическая (читается из VERSION)
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+STORE_FILE = Path.home() / ".steamdeck_logs" / "operations.db"
+
+# Ожидание блокировки базы другим процессом (секунды)
+BUSY_TIMEOUT = 5.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS operations (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    operation TEXT NOT NULL,
+    status TEXT NOT NULL,
+    details TEXT NOT NULL DEFAULT '',
+    duration REAL,
+    exit_code INTEGER,
+    script TEXT
+);
+CREATE INDEX IF NOT EXISTS operations_ts ON operations (ts);
+CREATE INDEX IF NOT EXISTS operations_operation ON operations (operation, ts);
+CREATE INDEX IF NOT EXISTS operations_status ON operations (status, ts);
+"""
+
+# Поля, по которым можно группировать статистику
+GROUP_FIELDS = ("operation", "status", "script")
+
+
+class OperationRecord(NamedTuple):
+    """Запись об операции"""
+    id: int
+    ts: float
+    operation: str
+    status: str
+    details: str
+    duration: Optional[float]
+    exit_code: Optional[int]
+    script: Optional[str]
+
+
+class OperationStats(NamedTuple):
+    """Сводка по группе операций"""
+    key: str
+    count: int
+    errors: int
+    avg_duration: Optional[float]
+    max_duration: Optional[float]
+    last_ts: float
+
+
+class OperationStore:
+    """
+    Хранилище записей операций
+    
+    Записи только добавляются; prune() удаляет записи старше заданного
+    времени (вместе со старыми текстовыми логами).
+    """
+    
+    def __init__(self, path=STORE_FILE):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+    
+    def add(self, operation: str, status: str, details: str = "",
+            duration: Optional[float] = None, exit_code: Optional[int] = None,
+            script: Optional[str] = None, ts: Optional[float] = None,
+            commit: bool = True):
+        """
+        Добавление записи
+        
+        Args:
+            commit: False - накопить записи и зафиксировать их вызовом commit()
+        """
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT INTO operations (ts, operation, status, details, duration, exit_code, script)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (ts if ts is not None else time.time(), operation, status, details or "",
+                 duration, exit_code, script)
+            )
+            if commit:
+                conn.commit()
+    
+    def commit(self):
+        """Фиксация накопленных записей одной транзакцией"""
+        with self._lock:
+            if self._conn is not None and self._conn.in_transaction:
+                self._conn.commit()
+    
+    def query(self, operation: Optional[str] = None, status: Optional[str] = None,
+              script: Optional[str] = None, since: Optional[float] = None,
+              until: Optional[float] = None, text: str = "",
+              limit: Optional[int] = 100) -> List[OperationRecord]:
+        """
+        Записи по фильтрам, новые первыми
+        
+        Args:
+            operation: Точное имя операции
+            status: success, error, warning или info
+            script: Имя скрипта
+            since / until: Границы времени (Unix time)
+            text: Подстрока операции или деталей
+            limit: Максимум записей (None - без ограничения)
+        """
+        where, params = self._where(operation, status, script, since, until, text)
+        sql = f"SELECT * FROM operations{where} ORDER BY ts DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._reader() as conn:
+            return [OperationRecord(*row) for row in conn.execute(sql, params)]
+    
+    def stats(self, group_by: str = "operation", status: Optional[str] = None,
+              script: Optional[str] = None, since: Optional[float] = None,
+              until: Optional[float] = None, text: str = "") -> List[OperationStats]:
+        """
+        Сводка по группам: количество, ошибки, длительность, последний запуск
+        
+        Args:
+            group_by: operation, status или script
+        """
+        if group_by not in GROUP_FIELDS:
+            raise ValueError(f"Нельзя группировать по полю: {group_by}")
+        where, params = self._where(None, status, script, since, until, text)
+        sql = (
+            f"SELECT {group_by}, COUNT(*), SUM(status = 'error'), AVG(duration),"
+            f" MAX(duration), MAX(ts) FROM operations{where}"
+            f" GROUP BY {group_by} ORDER BY MAX(ts) DESC"
+        )
+        with self._reader() as conn:
+            return [OperationStats(str(row[0]), *row[1:]) for row in conn.execute(sql, params)]
+    
+    def prune(self, before: float) -> int:
+        """Удаление записей старше before; возвращает количество удалённых"""
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute("DELETE FROM operations WHERE ts < ?", (before,))
+            conn.commit()
+            return cursor.rowcount
+    
+    def close(self):
+        """Фиксация и закрытие соединения записи"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
+    
+    def _connect(self) -> sqlite3.Connection:
+        # Соединение записи: одно на хранилище, используется под self._lock
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=BUSY_TIMEOUT,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # В WAL достаточно NORMAL: при сбое питания теряется только последняя транзакция
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+    
+    def _reader(self):
+        # Чтение через отдельное соединение: WAL не блокирует его записью
+        if not self.path.exists():
+            with self._lock:
+                self._connect()
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, timeout=BUSY_TIMEOUT)
+        return closing(conn)
+    
+    @staticmethod
+    def _where(operation, status, script, since, until, text):
+        conditions = []
+        params: List = []
+        for column, value in (("operation", operation), ("status", status), ("script", script)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            conditions.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("ts < ?")
+            params.append(until)
+        if text:
+            conditions.append("(operation LIKE ? OR details LIKE ?)")
+            params.extend([f"%{text}%"] * 2)
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), params
+
+
+class OperationStoreHandler(logging.Handler):
+    """
+    Обработчик logging, записывающий структурированные поля записи
+    
+    Учитываются записи с атрибутом `operation_record` (его добавляет
+    SteamDeckLogger.log_operation). Записи фиксируются в flush(), который
+    поток логгера вызывает, когда очередь опустела, - одна транзакция на
+    пачку записей.
+    """
+    
+    def __init__(self, store: OperationStore):
+        super().__init__()
+        self.store = store
+    
+    def emit(self, record):
+        fields: Optional[Dict] = getattr(record, "operation_record", None)
+        if fields is None:
+            return
+        try:
+            self.store.add(ts=record.created, commit=False, **fields)
+        except Exception:
+            self.handleError(record)
+    
+    def flush(self):
+        try:
+            self.store.commit()
+        except sqlite3.Error:
+            pass
+    
+    def close(self):
+        try:
+            self.store.close()
+        except sqlite3.Error:
+            pass
+        super().close()
+
+
+_store: Optional[OperationStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> OperationStore:
+    """Общее хранилище процесса"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = OperationStore()
+        return _store
+
+
+if __name__ == "__main__":
+    store = get_store()
+    print("Последние операции:")
+    for item in store.query(limit=10):
+        when = time.strftime("%d.%m %H:%M:%S", time.localtime(item.ts))
+        duration = f" {item.duration:.1f} с" if item.duration is not None else ""
+        print(f"  {when} {item.status:8} {item.operation}{duration}")
+    print("\nСводка за неделю:")
+    for group in store.stats(since=time.time() - 7 * 24 * 3600):
+        print(f"  {group.key}: {group.count} раз, ошибок {group.errors}")
@@ -22,6 +22,48 @@ print_warning() { echo -e "${YELLOW}[WARNING]${NC} $1"; }
 print_error() { echo -e "${RED}[ERROR]${NC} $1"; }
 print_header() { echo -e "${CYAN}=== $1 ===${NC}"; }
 
+# Записи в sysfs копятся и выполняются одним пакетом в sysfs_flush:
+# GUI передаёт пакет привилегированному помощнику (STEAMDECK_SYSFS_BATCH -
+# файл для пакета), в терминале это один sudo на все записи вместо
+# sudo tee на каждый параметр. Пути проверяет steamdeck_privileged.py.
+PRIVILEGED_PY="$(dirname "$(readlink -f "${BASH_SOURCE[0]}")")/steamdeck_privileged.py"
+SYSFS_BATCH=()
+
+sysfs_write() {
+    local value="$1"
+    shift
+    local path
+    for path in "$@"; do
+        SYSFS_BATCH+=("$path"$'\t'"$value")
+    done
+}
+
+# Параметр sysfs существует и будет записан: от root - доступен на запись,
+# иначе запись выполнит помощник или sudo (шаблон раскрывается здесь)
+sysfs_writable() {
+    local path
+    for path in $1; do
+        if [[ -w "$path" ]] || [[ $EUID -ne 0 && -e "$path" ]]; then
+            return 0
+        fi
+    done
+    return 1
+}
+
+sysfs_flush() {
+    if [[ ${#SYSFS_BATCH[@]} -eq 0 ]]; then
+        return 0
+    fi
+    if [[ -n "${STEAMDECK_SYSFS_BATCH:-}" ]]; then
+        printf '%s\n' "${SYSFS_BATCH[@]}" >> "$STEAMDECK_SYSFS_BATCH"
+    elif [[ $EUID -eq 0 ]]; then
+        printf '%s\n' "${SYSFS_BATCH[@]}" | python3 "$PRIVILEGED_PY" sysfs || true
+    else
+        printf '%s\n' "${SYSFS_BATCH[@]}" | sudo python3 "$PRIVILEGED_PY" sysfs || true
+    fi
+    SYSFS_BATCH=()
+}
+
 # Конфигурационные файлы
 CONFIG_DIR="$HOME/.config/steamdeck_optimizer"
 TDP_CONFIG="$CONFIG_DIR/tdp_profiles.conf"
@@ -98,16 +140,16 @@ apply_tdp_profile() {
     print_message "TDP: ${tdp}W, GPU: ${gpu_freq}MHz, CPU: ${cpu_freq}MHz"
     
     # Применение TDP (требует root)
-    if [[ -w "/sys/class/hwmon/hwmon*/power1_cap" ]]; then
-        echo "$((tdp * 1000000))" | sudo tee /sys/class/hwmon/hwmon*/power1_cap > /dev/null 2>&1 || true
+    if sysfs_writable "/sys/class/hwmon/hwmon*/power1_cap"; then
+        sysfs_write "$((tdp * 1000000))" /sys/class/hwmon/hwmon*/power1_cap
         print_success "TDP установлен: ${tdp}W"
     else
         print_warning "Не удалось установить TDP (требуются права root)"
     fi
     
     # Применение частоты GPU
-    if [[ -w "/sys/class/drm/card0/device/gt_max_freq_mhz" ]]; then
-        echo "$gpu_freq" | sudo tee /sys/class/drm/card0/device/gt_max_freq_mhz > /dev/null 2>&1 || true
+    if sysfs_writable "/sys/class/drm/card0/device/gt_max_freq_mhz"; then
+        sysfs_write "$gpu_freq" /sys/class/drm/card0/device/gt_max_freq_mhz
         print_success "Частота GPU установлена: ${gpu_freq}MHz"
     else
         print_warning "Не удалось установить частоту GPU"
@@ -252,8 +294,8 @@ optimize_battery() {
     apply_tdp_profile "BATTERY_SAVER"
     
     # Настройка CPU governor
-    if [[ -w "/sys/devices/system/cpu/cpufreq/policy0/scaling_governor" ]]; then
-        echo "powersave" | sudo tee /sys/devices/system/cpu/cpufreq/policy*/scaling_governor > /dev/null 2>&1 || true
+    if sysfs_writable "/sys/devices/system/cpu/cpufreq/policy0/scaling_governor"; then
+        sysfs_write "powersave" /sys/devices/system/cpu/cpufreq/policy*/scaling_governor
         print_success "CPU governor установлен: powersave"
     fi
     
@@ -277,14 +319,14 @@ optimize_performance() {
     apply_tdp_profile "PERFORMANCE"
     
     # Настройка CPU governor
-    if [[ -w "/sys/devices/system/cpu/cpufreq/policy0/scaling_governor" ]]; then
-        echo "performance" | sudo tee /sys/devices/system/cpu/cpufreq/policy*/scaling_governor > /dev/null 2>&1 || true
+    if sysfs_writable "/sys/devices/system/cpu/cpufreq/policy0/scaling_governor"; then
+        sysfs_write "performance" /sys/devices/system/cpu/cpufreq/policy*/scaling_governor
         print_success "CPU governor установлен: performance"
     fi
     
     # Настройка GPU
-    if [[ -w "/sys/class/drm/card0/device/power_dpm_force_performance_level" ]]; then
-        echo "high" | sudo tee /sys/class/drm/card0/device/power_dpm_force_performance_level > /dev/null 2>&1 || true
+    if sysfs_writable "/sys/class/drm/card0/device/power_dpm_force_performance_level"; then
+        sysfs_write "high" /sys/class/drm/card0/device/power_dpm_force_performance_level
         print_success "GPU режим установлен: high performance"
     fi
     
@@ -296,14 +338,14 @@ reset_to_default() {
     print_message "Сброс к настройкам по умолчанию..."
     
     # Сброс TDP
-    if [[ -w "/sys/class/hwmon/hwmon*/power1_cap" ]]; then
-        echo "15000000" | sudo tee /sys/class/hwmon/hwmon*/power1_cap > /dev/null 2>&1 || true
+    if sysfs_writable "/sys/class/hwmon/hwmon*/power1_cap"; then
+        sysfs_write "15000000" /sys/class/hwmon/hwmon*/power1_cap
         print_success "TDP сброшен к 15W"
     fi
     
     # Сброс CPU governor
-    if [[ -w "/sys/devices/system/cpu/cpufreq/policy0/scaling_governor" ]]; then
-        echo "schedutil" | sudo tee /sys/devices/system/cpu/cpufreq/policy*/scaling_governor > /dev/null 2>&1 || true
+    if sysfs_writable "/sys/devices/system/cpu/cpufreq/policy0/scaling_governor"; then
+        sysfs_write "schedutil" /sys/devices/system/cpu/cpufreq/policy*/scaling_governor
         print_success "CPU governor сброшен к schedutil"
     fi
     
@@ -460,7 +502,11 @@ main() {
             exit 1
             ;;
     esac
+    
+    sysfs_flush
 }
 
-# Запуск
-main "$@"
+# Запуск (фоновый обработчик steamdeck_worker.sh только подключает функции)
+if [[ -z "${STEAMDECK_WORKER:-}" ]]; then
+    main "$@"
+fi
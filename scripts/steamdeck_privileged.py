@@ -0,0 +1,574 @@
+#!/usr/bin/env python3
+"""
+Steam Deck Enhancement Pack - Привилегированный помощник
+Процесс с правами root, который запускается через sudo один раз за сеанс
+и выполняет пакеты разрешённых операций по локальному сокету: запись в
+разрешённые файлы sysfs и фиксированный набор действий скриптов проекта.
+Автор: @ncux11
+Версия: динамическая (читается из VERSION)
+"""
+
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import shutil
+import signal
+import socket
+import socketserver
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+SCRIPTS_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPTS_DIR.parent
+
+# Время на аутентификацию sudo и запуск помощника (секунды)
+START_TIMEOUT = 15
+
+# Интервал проверки, жив ли процесс GUI (секунды)
+OWNER_CHECK_INTERVAL = 2
+
+# Файлы sysfs, доступные для записи
+SYSFS_WRITABLE = (
+    "/sys/devices/system/cpu/cpufreq/policy*/scaling_governor",
+    "/sys/devices/system/cpu/cpufreq/policy*/energy_performance_preference",
+    "/sys/class/hwmon/hwmon*/power1_cap",
+    "/sys/class/drm/card*/device/power_dpm_force_performance_level",
+    "/sys/class/drm/card*/device/gt_max_freq_mhz",
+    "/sys/block/*/queue/scheduler",
+)
+
+SYSFS_ROOT = "/sys/"
+
+# Действия скриптов, которые можно запускать от root (без дополнительных аргументов)
+PRIVILEGED_SCRIPTS = {
+    "steamdeck_optimizer.sh": ("setup", "battery"),
+    "steamdeck_microsd.sh": ("refresh", "fix", "safely-remove"),
+    "steamdeck_setup.sh": ("install-utils",),
+}
+
+# Файлы, которые скрипты подключают через source (относительно корня проекта)
+SCRIPT_SOURCES = {
+    "steamdeck_setup.sh": ("scripts/steamdeck_progress.sh", "config.env"),
+}
+
+# Время между SIGTERM и SIGKILL при отмене операции (секунды)
+CANCEL_TIMEOUT = 2
+
+
+class PrivilegedError(RuntimeError):
+    """Помощник не запущен, не прошёл аутентификацию или отклонил запрос"""
+    pass
+
+
+# --- Сторона root: выполнение операций ---
+
+def _sysfs_allowed(path: str) -> bool:
+    """Путь (или шаблон) совпадает с разрешённым покомпонентно"""
+    parts = path.split("/")
+    for allowed in SYSFS_WRITABLE:
+        allowed_parts = allowed.split("/")
+        # fnmatch для целого пути позволил бы "*" совпасть с "/" и ".."
+        if len(parts) == len(allowed_parts) and all(
+                fnmatch.fnmatchcase(part, pattern)
+                for part, pattern in zip(parts, allowed_parts)):
+            return True
+    return False
+
+
+def _check_sysfs_path(path: str) -> str:
+    """Разрешённый путь sysfs; символические ссылки не выводят за /sys"""
+    if not os.path.isabs(path) or ".." in path.split("/") or not _sysfs_allowed(path):
+        raise PrivilegedError(f"Запись в {path} не разрешена")
+    resolved = os.path.realpath(path)
+    if not resolved.startswith(SYSFS_ROOT):
+        raise PrivilegedError(f"Запись в {path} не разрешена")
+    return resolved
+
+
+def _file_hash(path) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _script_files(name: str) -> List[Path]:
+    return [SCRIPTS_DIR / name] + [PROJECT_ROOT / source for source in SCRIPT_SOURCES.get(name, ())]
+
+
+def script_hashes() -> Dict[str, Optional[str]]:
+    """SHA-256 разрешённых скриптов и подключаемых ими файлов"""
+    return {str(path): _file_hash(path)
+            for name in PRIVILEGED_SCRIPTS for path in _script_files(name)}
+
+
+class _Output:
+    """
+    Вывод операции клиенту и её отмена
+    
+    Запущенный процесс регистрируется через start(); cancel() (клиент
+    закрыл соединение) завершает всю его группу процессов.
+    """
+    
+    def __init__(self, send: Callable[[Dict], None], index: int,
+                 cancelled: threading.Event):
+        self._send = send
+        self._index = index
+        self._cancelled = cancelled
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+    
+    def __call__(self, line: str):
+        try:
+            self._send({"index": self._index, "line": line})
+        except OSError:
+            # Клиент ушёл: вывод некуда передавать, процесс останавливается
+            self.cancel()
+    
+    def start(self, process: subprocess.Popen):
+        with self._lock:
+            self._process = process
+        if self._cancelled.is_set():
+            self.cancel()
+    
+    def finish(self):
+        with self._lock:
+            self._process = None
+    
+    def cancel(self):
+        self._cancelled.set()
+        with self._lock:
+            process = self._process
+        if process is None or process.poll() is not None:
+            return
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+            process.wait(timeout=CANCEL_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+def _stream(cmd: List[str], emit: Callable[[str], None], cwd=None) -> Tuple[bool, str]:
+    """Запуск команды с построчной передачей вывода (отменяется с группой процессов)"""
+    process = subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+        cwd=cwd,
+        start_new_session=True
+    )
+    if isinstance(emit, _Output):
+        emit.start(process)
+    try:
+        for line in process.stdout:
+            emit(line.rstrip("\n"))
+        process.wait()
+    finally:
+        if isinstance(emit, _Output):
+            emit.finish()
+    if process.returncode < 0:
+        return False, "операция прервана"
+    return process.returncode == 0, f"код возврата {process.returncode}"
+
+
+def op_ping(op: Dict, emit) -> Tuple[bool, str]:
+    """Проверка связи"""
+    return True, "pong"
+
+
+def op_sysfs_write(op: Dict, emit) -> Tuple[bool, str]:
+    """Запись значения во все файлы sysfs, подходящие под шаблон"""
+    pattern, value = op["path"], str(op["value"])
+    _check_sysfs_path(pattern)
+    
+    written = 0
+    for path in sorted(glob.glob(pattern)):
+        try:
+            resolved = _check_sysfs_path(path)
+            with open(resolved, "w") as f:
+                f.write(value)
+            written += 1
+        except PrivilegedError as e:
+            emit(str(e))
+        except OSError as e:
+            emit(f"{path}: {e.strerror}")
+    return written > 0, f"записано файлов: {written}"
+
+
+def op_script(op: Dict, emit, hashes: Dict[str, Optional[str]]) -> Tuple[bool, str]:
+    """
+    Разрешённое действие скрипта проекта
+    
+    Каталог scripts доступен пользователю на запись, поэтому скрипт и
+    подключаемые им файлы должны совпадать с тем, что было на диске при
+    запуске помощника (когда пользователь ввёл пароль).
+    """
+    name, action = op["name"], op["action"]
+    if action not in PRIVILEGED_SCRIPTS.get(name, ()):
+        raise PrivilegedError(f"Действие не разрешено: {name} {action}")
+    for path in _script_files(name):
+        if _file_hash(path) != hashes.get(str(path)):
+            raise PrivilegedError(
+                f"{path.name} изменён после ввода пароля, повторите вход sudo")
+    return _stream(["bash", str(SCRIPTS_DIR / name), action], emit, cwd=str(PROJECT_ROOT))
+
+
+OPERATIONS = {
+    "ping": op_ping,
+    "sysfs_write": op_sysfs_write,
+}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """
+    Один пакет операций на соединение
+    
+    Запрос - строка JSON {"ops": [...], "stop_on_error": true}.
+    Ответ - строки JSON {"index": i, "line": "..."} с выводом операций
+    и итоговая {"results": [{"ok": ..., "message": ...}, ...]}.
+    """
+    
+    def handle(self):
+        creds = self.request.getsockopt(
+            socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+        )
+        _, uid, _ = struct.unpack("3i", creds)
+        if uid not in (0, self.server.owner_uid):
+            return
+        
+        try:
+            request = json.loads(self.rfile.readline())
+            ops = request["ops"]
+        except (ValueError, KeyError, TypeError):
+            self._send({"results": [], "error": "некорректный запрос"})
+            return
+        stop_on_error = request.get("stop_on_error", True)
+        
+        # Закрытие соединения клиентом отменяет пакет
+        cancelled = threading.Event()
+        outputs: List[_Output] = []
+        
+        def watch_client():
+            try:
+                self.request.recv(1)
+            except OSError:
+                pass
+            cancelled.set()
+            for output in list(outputs):
+                output.cancel()
+        
+        threading.Thread(target=watch_client, daemon=True).start()
+        
+        results = []
+        for index, op in enumerate(ops):
+            if cancelled.is_set():
+                break
+            emit = _Output(self._send, index, cancelled)
+            outputs.append(emit)
+            
+            if op.get("op") == "shutdown":
+                # shutdown() ждёт выхода из serve_forever, поэтому из другого потока
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                results.append({"ok": True, "message": ""})
+                break
+            
+            handler = OPERATIONS.get(op.get("op"))
+            try:
+                if op.get("op") == "script":
+                    ok, message = op_script(op, emit, self.server.script_hashes)
+                elif handler is None:
+                    raise PrivilegedError(f"Неизвестная операция: {op.get('op')}")
+                else:
+                    ok, message = handler(op, emit)
+            except (PrivilegedError, OSError, KeyError, TypeError, ValueError) as e:
+                ok, message = False, str(e)
+            results.append({"ok": ok, "message": message})
+            if not ok and stop_on_error:
+                break
+        
+        try:
+            self._send({"results": results})
+        except OSError:
+            pass
+    
+    def _send(self, message: Dict):
+        self.wfile.write(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+
+class _HelperServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def serve(socket_path: str, owner_uid: int, owner_pid: int):
+    """
+    Работа помощника (от root)
+    
+    Сокет доступен только владельцу GUI; помощник завершается по запросу
+    shutdown или когда процесс GUI пропадает.
+    """
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    server = _HelperServer(socket_path, _RequestHandler)
+    server.owner_uid = owner_uid
+    server.script_hashes = script_hashes()
+    os.chown(socket_path, owner_uid, -1)
+    os.chmod(socket_path, 0o600)
+    
+    def watch_owner():
+        while True:
+            time.sleep(OWNER_CHECK_INTERVAL)
+            try:
+                os.kill(owner_pid, 0)
+            except ProcessLookupError:
+                server.shutdown()
+                return
+    
+    threading.Thread(target=watch_owner, daemon=True).start()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+# --- Сторона GUI: запуск помощника и отправка запросов ---
+
+def parse_sysfs_batch(text: str) -> List[Dict]:
+    """
+    Операции sysfs_write из пакета записей скрипта: строки "путь<TAB>значение"
+    (steamdeck_optimizer.sh с STEAMDECK_SYSFS_BATCH)
+    """
+    ops = []
+    for line in text.splitlines():
+        path, sep, value = line.partition("\t")
+        if sep and path:
+            ops.append({"op": "sysfs_write", "path": path, "value": value})
+    return ops
+
+
+class PrivilegedRequest:
+    """
+    Выполняемый пакет операций
+    
+    Интерфейс как у subprocess.Popen (poll, terminate, kill), чтобы GUI
+    останавливал его так же, как обычный скрипт: закрытие соединения
+    прерывает пакет, помощник завершает группу процессов операции.
+    """
+    
+    def __init__(self, sock: socket.socket):
+        self._sock = sock
+        self.returncode: Optional[int] = None
+        self.cancelled = False
+    
+    def poll(self) -> Optional[int]:
+        return self.returncode
+    
+    def terminate(self):
+        if self.returncode is None:
+            self.cancelled = True
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+    
+    kill = terminate
+
+class PrivilegedHelper:
+    """
+    Клиент привилегированного помощника
+    
+    Пароль передаётся sudo один раз при start() и не хранится; дальше все
+    операции идут через сокет без повторной аутентификации.
+    """
+    
+    def __init__(self):
+        self._process: Optional[subprocess.Popen] = None
+        self._socket_dir: Optional[str] = None
+        self._socket_path: Optional[str] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def alive(self) -> bool:
+        """Помощник запущен"""
+        return self._process is not None and self._process.poll() is None
+    
+    def start(self, password: str) -> bool:
+        """
+        Запуск помощника через sudo
+        
+        Returns:
+            True, если пароль принят и помощник отвечает
+        
+        Raises:
+            PrivilegedError: помощник не ответил вовремя
+        """
+        with self._lock:
+            if self.alive:
+                return True
+            self._cleanup()
+            
+            runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+            if not runtime_dir or not os.path.isdir(runtime_dir):
+                runtime_dir = None
+            self._socket_dir = tempfile.mkdtemp(prefix="steamdeck-priv-", dir=runtime_dir)
+            self._socket_path = os.path.join(self._socket_dir, "helper.sock")
+            
+            self._process = subprocess.Popen(
+                ["sudo", "-S", "-p", "", sys.executable, str(Path(__file__).resolve()),
+                 "serve", self._socket_path, str(os.getuid()), str(os.getpid())],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True
+            )
+            # Пароль передаётся один раз; при неверном пароле sudo получит EOF и завершится
+            try:
+                self._process.stdin.write(password.encode("utf-8") + b"\n")
+                self._process.stdin.close()
+            except OSError:
+                pass
+            
+            deadline = time.monotonic() + START_TIMEOUT
+            while time.monotonic() < deadline:
+                if self._process.poll() is not None:
+                    self._cleanup()
+                    return False
+                try:
+                    self._request([{"op": "ping"}], None, True)
+                    return True
+                except OSError:
+                    time.sleep(0.05)
+            
+            self._cleanup()
+            raise PrivilegedError("Привилегированный помощник не ответил вовремя")
+    
+    def run(self, ops: List[Dict], on_line: Optional[Callable[[str], None]] = None,
+            stop_on_error: bool = True,
+            on_start: Optional[Callable[[PrivilegedRequest], None]] = None) -> List[Dict]:
+        """
+        Выполнение пакета операций
+        
+        Args:
+            ops: Операции, например {"op": "sysfs_write", "path": ..., "value": ...}
+                 или {"op": "script", "name": ..., "action": ...}
+            on_line: Обработчик строк вывода (вызывается из текущего потока)
+            stop_on_error: Прекратить пакет на первой неудачной операции
+            on_start: Вызывается с PrivilegedRequest для остановки пакета
+        
+        Returns:
+            Результаты выполненных операций: {"ok": bool, "message": str}
+        
+        Raises:
+            PrivilegedError: помощник не запущен или соединение прервано
+        """
+        if not self.alive:
+            raise PrivilegedError("Привилегированный помощник не запущен")
+        try:
+            return self._request(ops, on_line, stop_on_error, on_start)
+        except OSError as e:
+            raise PrivilegedError(f"Ошибка связи с привилегированным помощником: {e}")
+    
+    def close(self):
+        """Остановка помощника"""
+        with self._lock:
+            if self.alive:
+                try:
+                    self._request([{"op": "shutdown"}], None, True)
+                    self._process.wait(timeout=2)
+                except (OSError, subprocess.TimeoutExpired):
+                    pass
+            self._cleanup()
+    
+    def _request(self, ops, on_line, stop_on_error, on_start=None) -> List[Dict]:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self._socket_path)
+            request = {"ops": ops, "stop_on_error": stop_on_error}
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            handle = PrivilegedRequest(sock)
+            if on_start is not None:
+                on_start(handle)
+            
+            try:
+                with sock.makefile("rb") as reader:
+                    for raw in reader:
+                        message = json.loads(raw)
+                        if "results" in message:
+                            if "error" in message:
+                                raise PrivilegedError(message["error"])
+                            results = message["results"]
+                            handle.returncode = 0 if all(r.get("ok") for r in results) else 1
+                            return results
+                        if on_line is not None:
+                            on_line(message["line"])
+            except OSError:
+                if not handle.cancelled:
+                    raise
+            finally:
+                # Остановленный или оборванный пакет не считается успешным
+                if handle.returncode is None:
+                    handle.returncode = -signal.SIGTERM if handle.cancelled else 1
+        if handle.cancelled:
+            raise PrivilegedError("Операция остановлена")
+        raise ConnectionError("соединение закрыто без результата")
+    
+    def _cleanup(self):
+        # Процесс sudo принадлежит пользователю, поэтому его можно завершить
+        process, self._process = self._process, None
+        if process is not None and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                pass
+        if self._socket_dir is not None:
+            shutil.rmtree(self._socket_dir, ignore_errors=True)
+            self._socket_dir = None
+
+
+def apply_sysfs_batch(text: str) -> bool:
+    """Выполнение пакета записей sysfs в текущем процессе (от root)"""
+    ok = True
+    for op in parse_sysfs_batch(text):
+        try:
+            written, message = op_sysfs_write(op, lambda line: print(line, file=sys.stderr))
+        except PrivilegedError as e:
+            written, message = False, str(e)
+        if not written:
+            print(f"{op['path']}: {message}", file=sys.stderr)
+            ok = False
+    return ok
+
+
+def main(argv: List[str]) -> int:
+    if argv[:1] in (["serve"], ["sysfs"]) and os.geteuid() != 0:
+        print("Помощник должен запускаться через sudo", file=sys.stderr)
+        return 1
+    if len(argv) == 4 and argv[0] == "serve":
+        serve(argv[1], int(argv[2]), int(argv[3]))
+        return 0
+    if argv == ["sysfs"]:
+        # Пакет "путь<TAB>значение" на stdin: один sudo на все записи скрипта
+        return 0 if apply_sysfs_batch(sys.stdin.read()) else 1
+    print(f"Использование: {sys.argv[0]} serve <сокет> <uid> <pid> | sysfs < пакет",
+          file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
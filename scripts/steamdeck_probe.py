@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+"""
+Steam Deck Enhancement Pack - Системные пробы
+Чтение состояния системы напрямую из /proc, /sys и statvfs без запуска
+внешних команд (lscpu, top, free, uptime, df). Используется обоими GUI
+и steamdeck_monitor.sh через командную строку этого модуля.
+Автор: @ncux11
+Версия: динамическая (читается из VERSION)
+"""
+
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+PROC = "/proc"
+SYS = "/sys"
+
+# Интервал первого замера загрузки CPU, если предыдущего замера нет (секунды)
+CPU_SAMPLE_INTERVAL = 0.2
+
+
+def _read(path: str) -> Optional[str]:
+    """Содержимое файла или None, если он недоступен"""
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _read_int(path: str) -> Optional[int]:
+    value = _read(path)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def format_bytes(size: Optional[float]) -> str:
+    """Размер в единицах IEC: 1.5G, 512M"""
+    if size is None:
+        return "N/A"
+    for unit in ("B", "K", "M", "G", "T"):
+        if abs(size) < 1024 or unit == "T":
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}T"
+
+
+def format_uptime(seconds: float) -> str:
+    """Время работы: 3 д 4 ч 05 мин"""
+    minutes = int(seconds) // 60
+    days, minutes = divmod(minutes, 24 * 60)
+    hours, minutes = divmod(minutes, 60)
+    parts = []
+    if days:
+        parts.append(f"{days} д")
+    if days or hours:
+        parts.append(f"{hours} ч")
+    parts.append(f"{minutes:02d} мин" if parts else f"{minutes} мин")
+    return " ".join(parts)
+
+
+# ----------------------------------------------------------------------
+# CPU
+# ----------------------------------------------------------------------
+
+def read_cpu_times() -> Dict[str, Tuple[int, int]]:
+    """
+    Счётчики /proc/stat: {"cpu": (busy, total), "cpu0": ...}
+    
+    iowait считается простоем, как в top.
+    """
+    times = {}
+    content = _read(f"{PROC}/stat") or ""
+    for line in content.splitlines():
+        if not line.startswith("cpu"):
+            break
+        name, *fields = line.split()
+        values = [int(v) for v in fields]
+        idle = values[3] + (values[4] if len(values) > 4 else 0)
+        # guest/guest_nice уже учтены в user/nice
+        total = sum(values[:8])
+        times[name] = (total - idle, total)
+    return times
+
+
+class CpuSampler:
+    """
+    Загрузка CPU по разнице счётчиков /proc/stat между замерами
+    
+    Первый вызов usage() делает короткий замер; последующие считают
+    загрузку за время с предыдущего вызова без ожидания.
+    """
+    
+    def __init__(self):
+        self._last: Optional[Dict[str, Tuple[int, int]]] = None
+        self._lock = threading.Lock()
+    
+    def usage(self, interval: float = CPU_SAMPLE_INTERVAL) -> Dict[str, float]:
+        """Загрузка в процентах: {"cpu": 23.5, "cpu0": ..., ...}"""
+        with self._lock:
+            if self._last is None:
+                self._last = read_cpu_times()
+                time.sleep(interval)
+            current = read_cpu_times()
+            previous, self._last = self._last, current
+        
+        result = {}
+        for name, (busy, total) in current.items():
+            prev_busy, prev_total = previous.get(name, (0, 0))
+            delta_total = total - prev_total
+            if delta_total > 0:
+                result[name] = max(0.0, min(100.0, 100.0 * (busy - prev_busy) / delta_total))
+            else:
+                result[name] = 0.0
+        return result
+
+
+_cpu_sampler = CpuSampler()
+
+
+def cpu_usage(interval: float = CPU_SAMPLE_INTERVAL) -> Dict[str, float]:
+    """Загрузка CPU общим замерщиком процесса"""
+    return _cpu_sampler.usage(interval)
+
+
+def cpu_info() -> Dict:
+    """Модель, количество ядер и текущая частота CPU"""
+    model = None
+    mhz = None
+    for line in (_read(f"{PROC}/cpuinfo") or "").splitlines():
+        key, _, value = line.partition(":")
+        key = key.strip()
+        if model is None and key == "model name":
+            model = value.strip()
+        elif mhz is None and key == "cpu MHz":
+            try:
+                mhz = float(value)
+            except ValueError:
+                pass
+        if model is not None and mhz is not None:
+            break
+    
+    freq = _read_int(f"{SYS}/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq")
+    if freq is not None:
+        mhz = freq / 1000
+    
+    return {"model": model, "cores": os.cpu_count(), "mhz": mhz}
+
+
+def load_average() -> Tuple[float, float, float]:
+    """Средняя загрузка за 1, 5 и 15 минут"""
+    try:
+        return os.getloadavg()
+    except OSError:
+        return (0.0, 0.0, 0.0)
+
+
+def uptime_seconds() -> Optional[float]:
+    """Время работы системы в секундах"""
+    content = _read(f"{PROC}/uptime")
+    return float(content.split()[0]) if content else None
+
+
+def process_age(pid="self") -> Optional[float]:
+    """Время с запуска процесса в секундах (по /proc/<pid>/stat)"""
+    stat = _read(f"{PROC}/{pid}/stat")
+    uptime = uptime_seconds()
+    if not stat or uptime is None:
+        return None
+    # Имя процесса в скобках может содержать пробелы: поля считаем после ')'
+    start_ticks = int(stat.rsplit(")", 1)[1].split()[19])
+    return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+
+
+# ----------------------------------------------------------------------
+# Память и диски
+# ----------------------------------------------------------------------
+
+def memory_info() -> Dict[str, int]:
+    """Поля /proc/meminfo в байтах: MemTotal, MemAvailable, SwapTotal, ..."""
+    info = {}
+    for line in (_read(f"{PROC}/meminfo") or "").splitlines():
+        key, _, value = line.partition(":")
+        parts = value.split()
+        if parts:
+            amount = int(parts[0])
+            info[key] = amount * 1024 if len(parts) > 1 and parts[1] == "kB" else amount
+    return info
+
+
+def disk_usage(path: str = "/") -> Optional[Dict[str, int]]:
+    """Размер, занято и свободно (для пользователя) на файловой системе path"""
+    try:
+        st = os.statvfs(path)
+    except OSError:
+        return None
+    total = st.f_blocks * st.f_frsize
+    free = st.f_bavail * st.f_frsize
+    used = (st.f_blocks - st.f_bfree) * st.f_frsize
+    return {"total": total, "used": used, "free": free}
+
+
+# ----------------------------------------------------------------------
+# Температура и батарея
+# ----------------------------------------------------------------------
+
+def temperatures() -> Dict[str, float]:
+    """Температуры в °C: зоны /sys/class/thermal, GPU (hwmon) и батарея"""
+    temps = {}
+    for zone in sorted(glob.glob(f"{SYS}/class/thermal/thermal_zone*")):
+        value = _read_int(f"{zone}/temp")
+        if value is not None:
+            name = _read(f"{zone}/type") or os.path.basename(zone)
+            temps.setdefault(name, value / 1000)
+    
+    for sensor in sorted(glob.glob(f"{SYS}/class/drm/card*/device/hwmon/hwmon*/temp1_input")):
+        value = _read_int(sensor)
+        if value is not None:
+            temps.setdefault("gpu", value / 1000)
+            break
+    
+    battery = _battery_path()
+    if battery:
+        value = _read_int(f"{battery}/temp")
+        if value is not None:
+            # power_supply отдаёт десятые доли градуса
+            temps["battery"] = value / 10
+    return temps
+
+
+def _battery_path() -> Optional[str]:
+    for supply in sorted(glob.glob(f"{SYS}/class/power_supply/*")):
+        if _read(f"{supply}/type") == "Battery":
+            return supply
+    return None
+
+
+def battery_info() -> Optional[Dict]:
+    """
+    Состояние батареи из /sys/class/power_supply (None - батареи нет)
+    
+    Время до разряда/заряда оценивается по energy_*/power_now или
+    charge_*/current_now, как это делает upower.
+    """
+    path = _battery_path()
+    if path is None:
+        return None
+    
+    info = {
+        "name": os.path.basename(path),
+        "capacity": _read_int(f"{path}/capacity"),
+        "status": _read(f"{path}/status"),
+        "voltage": None,
+        "current": None,
+        "time_to_empty": None,
+        "time_to_full": None,
+    }
+    
+    voltage = _read_int(f"{path}/voltage_now")
+    current = _read_int(f"{path}/current_now")
+    if voltage is not None:
+        info["voltage"] = voltage / 1_000_000
+    if current is not None:
+        info["current"] = abs(current) / 1000
+    
+    # Пары "запас / полный запас / расход": энергия (мкВт·ч) или заряд (мкА·ч)
+    for now_name, full_name, rate_name in (("energy_now", "energy_full", "power_now"),
+                                           ("charge_now", "charge_full", "current_now")):
+        now = _read_int(f"{path}/{now_name}")
+        full = _read_int(f"{path}/{full_name}")
+        rate = _read_int(f"{path}/{rate_name}")
+        if now is None or full is None or not rate:
+            continue
+        rate = abs(rate)
+        if info["status"] == "Discharging":
+            info["time_to_empty"] = now / rate * 3600
+        elif info["status"] == "Charging":
+            info["time_to_full"] = max(full - now, 0) / rate * 3600
+        break
+    
+    return info
+
+
+# ----------------------------------------------------------------------
+# Система
+# ----------------------------------------------------------------------
+
+def os_release() -> Optional[str]:
+    """PRETTY_NAME из /etc/os-release"""
+    for line in (_read("/etc/os-release") or "").splitlines():
+        if line.startswith("PRETTY_NAME="):
+            return line.split("=", 1)[1].strip().strip('"')
+    return None
+
+
+def kernel_release() -> str:
+    """Версия ядра"""
+    return os.uname().release
+
+
+def snapshot(cpu_interval: float = CPU_SAMPLE_INTERVAL) -> Dict:
+    """Полный снимок состояния системы"""
+    return {
+        "time": time.time(),
+        "os": os_release(),
+        "kernel": kernel_release(),
+        "uptime": uptime_seconds(),
+        "load": load_average(),
+        "cpu": cpu_info(),
+        "cpu_usage": cpu_usage(cpu_interval),
+        "memory": memory_info(),
+        "disk": disk_usage("/"),
+        "tmp": disk_usage("/tmp"),
+        "temperatures": temperatures(),
+        "battery": battery_info(),
+    }
+
+
+# ----------------------------------------------------------------------
+# Командная строка (используется steamdeck_monitor.sh)
+# ----------------------------------------------------------------------
+
+CYAN = "\033[0;36m"
+NC = "\033[0m"
+
+
+def _header(title: str) -> List[str]:
+    return [f"{CYAN}=== {title} ==={NC}"]
+
+
+def _format_load(load) -> str:
+    return ", ".join(f"{value:.2f}" for value in load)
+
+
+def report_cpu() -> List[str]:
+    info = cpu_info()
+    usage = cpu_usage()
+    lines = _header("CPU ИНФОРМАЦИЯ")
+    lines.append(f"Модель: {info['model'] or 'N/A'}")
+    lines.append(f"Ядра: {info['cores']}")
+    lines.append(f"Частота: {info['mhz']:.0f} MHz" if info["mhz"] else "Частота: N/A")
+    lines.append(f"Загрузка: {_format_load(load_average())}")
+    lines.append("Использование по ядрам:")
+    lines.append(f"  CPU: {usage.get('cpu', 0.0):.1f}%")
+    for name in sorted((n for n in usage if n != "cpu"), key=lambda n: int(n[3:])):
+        lines.append(f"  {name.upper()}: {usage[name]:.1f}%")
+    return lines
+
+
+def report_memory() -> List[str]:
+    mem = memory_info()
+    lines = _header("ПАМЯТЬ")
+    total = mem.get("MemTotal", 0)
+    available = mem.get("MemAvailable", mem.get("MemFree", 0))
+    lines.append(f"RAM:  всего {format_bytes(total)}, занято {format_bytes(total - available)}, "
+                 f"доступно {format_bytes(available)}")
+    swap_total = mem.get("SwapTotal", 0)
+    swap_free = mem.get("SwapFree", 0)
+    lines.append(f"Swap: всего {format_bytes(swap_total)}, занято {format_bytes(swap_total - swap_free)}, "
+                 f"свободно {format_bytes(swap_free)}")
+    lines.append("")
+    lines.append("Детальная информация:")
+    for key in ("MemTotal", "MemFree", "MemAvailable", "Buffers", "Cached", "SwapTotal", "SwapFree"):
+        if key in mem:
+            lines.append(f"{key + ':':<16}{mem[key] // 1024:>12} kB")
+    return lines
+
+
+def report_temperature() -> List[str]:
+    temps = temperatures()
+    lines = _header("ТЕМПЕРАТУРА")
+    if not temps:
+        lines.append("Датчики температуры недоступны")
+    labels = {"gpu": "GPU", "battery": "Батарея"}
+    for name, value in temps.items():
+        lines.append(f"{labels.get(name, name)}: {value:.0f}°C")
+    return lines
+
+
+def report_battery() -> List[str]:
+    info = battery_info()
+    lines = _header("БАТАРЕЯ")
+    if info is None:
+        lines.append("Информация о батарее недоступна")
+        return lines
+    lines.append(f"Заряд: {info['capacity']}%")
+    lines.append(f"Статус: {info['status']}")
+    if info["voltage"] is not None:
+        lines.append(f"Напряжение: {info['voltage']:.3f}V")
+    if info["current"] is not None:
+        lines.append(f"Ток: {info['current']:.0f}mA")
+    if info["time_to_empty"]:
+        lines.append(f"Время до разряда: {format_uptime(info['time_to_empty'])}")
+    if info["time_to_full"]:
+        lines.append(f"Время до полной зарядки: {format_uptime(info['time_to_full'])}")
+    return lines
+
+
+def report_system() -> List[str]:
+    lines = _header("СИСТЕМА")
+    uptime = uptime_seconds()
+    lines.append(f"Время работы: {format_uptime(uptime) if uptime is not None else 'N/A'}")
+    lines.append(f"Загрузка системы: {_format_load(load_average())}")
+    lines.append(f"Ядро: {kernel_release()}")
+    os_name = os_release()
+    if os_name:
+        lines.append(f"ОС: {os_name}")
+    tmp = disk_usage("/tmp")
+    lines.append(f"Свободно в /tmp: {format_bytes(tmp['free']) if tmp else 'N/A'}")
+    return lines
+
+
+REPORTS = {
+    "cpu": report_cpu,
+    "memory": report_memory,
+    "temp": report_temperature,
+    "battery": report_battery,
+    "system": report_system,
+}
+
+
+def watch(interval: float, sections: List[str]):
+    """Обновление отчёта на месте раз в interval секунд (Ctrl+C - выход)"""
+    try:
+        while True:
+            lines = [f"{CYAN}=== STEAM DECK MONITOR - {time.strftime('%c')} ==={NC}"]
+            for section in sections:
+                lines.extend(REPORTS[section]())
+                lines.append("")
+            # Очистка экрана escape-последовательностью вместо clear
+            sys.stdout.write("\033[H\033[2J" + "\n".join(lines) + "\n")
+            sys.stdout.flush()
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv: List[str]) -> int:
+    command = argv[0] if argv else "all"
+    
+    if command == "json":
+        print(json.dumps(snapshot(), ensure_ascii=False, indent=2))
+        return 0
+    
+    if command == "watch":
+        interval = float(argv[1]) if len(argv) > 1 else 2.0
+        watch(interval, ["cpu", "memory", "temp", "battery"])
+        return 0
+    
+    sections = list(REPORTS) if command == "all" else [command]
+    for section in sections:
+        report = REPORTS.get(section)
+        if report is None:
+            print(f"Неизвестный раздел: {section}", file=sys.stderr)
+            print(f"Разделы: {', '.join(REPORTS)}, all, json, watch [интервал]", file=sys.stderr)
+            return 1
+        print("\n".join(report()))
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Steam Deck Enhancement Pack - Протокол прогресса
+Разбор событий прогресса, которые скрипты пишут через steamdeck_progress.sh,
+и запуск процесса с отдельным каналом для этих событий.
+Автор: @ncux11
+Версия: динамическая (читается из VERSION)
+"""
+
+import os
+import selectors
+import subprocess
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Переменная окружения с номером дескриптора канала прогресса
+PROGRESS_FD_ENV = "STEAMDECK_PROGRESS_FD"
+
+# Коэффициент сглаживания скорости для оценки оставшегося времени
+ETA_SMOOTHING = 0.3
+
+# Минимальный интервал между пересчётами скорости (секунды)
+ETA_MIN_INTERVAL = 0.5
+
+
+class ProgressEvent:
+    """Событие прогресса: фаза, элементы, байты и сообщение"""
+    
+    def __init__(self, phase: str, items: Optional[Tuple[int, int]] = None,
+                 bytes: Optional[Tuple[int, int]] = None, message: str = ""):
+        self.phase = phase
+        self.items = items
+        self.bytes = bytes
+        self.message = message
+    
+    @property
+    def fraction(self) -> Optional[float]:
+        """
+        Доля выполнения от 0 до 1 (None - неопределённый прогресс)
+        
+        Байты точнее элементов, поэтому при наличии обоих берутся байты.
+        """
+        for counter in (self.bytes, self.items):
+            if counter is not None and counter[1] > 0:
+                return min(max(counter[0] / counter[1], 0.0), 1.0)
+        return None
+    
+    def __repr__(self):
+        return (f"<ProgressEvent {self.phase!r} items={self.items} "
+                f"bytes={self.bytes} message={self.message!r}>")
+
+
+def _parse_counter(value: str) -> Optional[Tuple[int, int]]:
+    done, sep, total = value.partition("/")
+    if not sep:
+        return None
+    try:
+        return int(done), int(total)
+    except ValueError:
+        return None
+
+
+def parse_progress_line(line: str) -> Optional[ProgressEvent]:
+    """
+    Разбор строки протокола: поля key=value, разделённые табуляцией
+    
+    Returns:
+        Событие или None, если строка не содержит поля phase
+    """
+    fields: Dict[str, str] = {}
+    for field in line.rstrip("\r\n").split("\t"):
+        key, sep, value = field.partition("=")
+        if sep:
+            fields[key] = value
+    
+    phase = fields.get("phase")
+    if not phase:
+        return None
+    
+    return ProgressEvent(
+        phase,
+        items=_parse_counter(fields["items"]) if "items" in fields else None,
+        bytes=_parse_counter(fields["bytes"]) if "bytes" in fields else None,
+        message=fields.get("message", "")
+    )
+
+
+def format_duration(seconds: float) -> str:
+    """Короткая запись длительности: 45 с, 3 мин 10 с, 1 ч 05 мин"""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds} с"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes} мин {seconds:02d} с"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours} ч {minutes:02d} мин"
+
+
+class ProgressTracker:
+    """
+    Сводка событий одного запуска: доля выполнения, подпись и ETA
+    
+    Скорость считается отдельно для каждой фазы и сглаживается,
+    чтобы оценка времени не прыгала от события к событию.
+    """
+    
+    def __init__(self):
+        self.event: Optional[ProgressEvent] = None
+        self._phase: Optional[str] = None
+        self._last: Optional[Tuple[float, float]] = None
+        self._rate: Optional[float] = None
+    
+    def update(self, event: ProgressEvent):
+        """Учесть новое событие"""
+        now = time.monotonic()
+        fraction = event.fraction
+        
+        if event.phase != self._phase:
+            self._phase = event.phase
+            self._last = None
+            self._rate = None
+        elif not event.message and self.event is not None:
+            # Частые события (tar) не повторяют сообщение фазы
+            event.message = self.event.message
+        
+        self.event = event
+        if fraction is None:
+            return
+        
+        if self._last is None:
+            self._last = (now, fraction)
+            return
+        
+        last_time, last_fraction = self._last
+        elapsed = now - last_time
+        if elapsed < ETA_MIN_INTERVAL or fraction <= last_fraction:
+            return
+        
+        rate = (fraction - last_fraction) / elapsed
+        if self._rate is None:
+            self._rate = rate
+        else:
+            self._rate = ETA_SMOOTHING * rate + (1 - ETA_SMOOTHING) * self._rate
+        self._last = (now, fraction)
+    
+    @property
+    def fraction(self) -> Optional[float]:
+        """Доля выполнения текущей фазы"""
+        return self.event.fraction if self.event else None
+    
+    @property
+    def eta(self) -> Optional[float]:
+        """Оценка оставшегося времени текущей фазы в секундах"""
+        fraction = self.fraction
+        if fraction is None or not self._rate:
+            return None
+        return (1.0 - fraction) / self._rate
+    
+    def label(self) -> str:
+        """Подпись для прогресс-бара: сообщение, счётчик и ETA"""
+        event = self.event
+        if event is None:
+            return ""
+        
+        parts = [event.message or event.phase]
+        if event.items is not None:
+            parts.append(f"{event.items[0]}/{event.items[1]}")
+        fraction = event.fraction
+        if fraction is not None:
+            parts.append(f"{fraction * 100:.0f}%")
+        eta = self.eta
+        if eta is not None:
+            parts.append(f"осталось ~{format_duration(eta)}")
+        return " · ".join(parts)
+
+
+def run_with_progress(cmd: List[str], on_line: Optional[Callable] = None,
+                      on_progress: Optional[Callable] = None,
+                      on_start: Optional[Callable] = None, **popen_kwargs) -> int:
+    """
+    Запуск команды с отдельным каналом событий прогресса
+    
+    Вывод и события читаются в текущем потоке через selectors,
+    без дополнительных потоков на каждый канал.
+    
+    Args:
+        cmd: Команда
+        on_line: Обработчик строки вывода (stdout и stderr)
+        on_progress: Обработчик события ProgressEvent
+        on_start: Вызывается с объектом Popen сразу после запуска
+        popen_kwargs: Дополнительные аргументы subprocess.Popen
+    
+    Returns:
+        Код возврата процесса
+    """
+    read_fd, write_fd = os.pipe()
+    env = dict(popen_kwargs.pop("env", None) or os.environ)
+    env[PROGRESS_FD_ENV] = str(write_fd)
+    
+    try:
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            env=env,
+            pass_fds=(write_fd,),
+            **popen_kwargs
+        )
+    except BaseException:
+        os.close(read_fd)
+        os.close(write_fd)
+        raise
+    # Пишущий конец нужен только дочернему процессу, иначе не будет EOF
+    os.close(write_fd)
+    
+    if on_start:
+        on_start(process)
+    
+    handlers = {
+        process.stdout.fileno(): on_line,
+        read_fd: lambda line: _dispatch_event(line, on_progress),
+    }
+    pending = {fd: b"" for fd in handlers}
+    
+    with selectors.DefaultSelector() as selector:
+        for fd in handlers:
+            selector.register(fd, selectors.EVENT_READ)
+        
+        while pending:
+            for key, _ in selector.select():
+                fd = key.fd
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    selector.unregister(fd)
+                    rest = pending.pop(fd)
+                    if rest:
+                        _emit(handlers[fd], rest)
+                    continue
+                
+                *lines, pending[fd] = (pending[fd] + chunk).split(b"\n")
+                for line in lines:
+                    _emit(handlers[fd], line)
+    
+    os.close(read_fd)
+    process.stdout.close()
+    return process.wait()
+
+
+def _emit(handler: Optional[Callable], line: bytes):
+    if handler:
+        handler(line.decode("utf-8", errors="replace").rstrip("\r"))
+
+
+def _dispatch_event(line: str, on_progress: Optional[Callable]):
+    event = parse_progress_line(line)
+    if event is not None and on_progress:
+        on_progress(event)
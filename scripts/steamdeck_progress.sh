@@ -0,0 +1,70 @@
+#!/bin/bash
+
+# Steam Deck Progress Protocol
+# Машиночитаемые события прогресса для GUI
+# Автор: @ncux11
+# Версия: 0.1 (Октябрь 2025)
+#
+# GUI открывает канал и передаёт номер его дескриптора в STEAMDECK_PROGRESS_FD.
+# Без этой переменной (запуск из терминала) все функции ничего не делают.
+#
+# Событие - одна строка полей key=value, разделённых табуляцией:
+#   phase=<id>  items=<done>/<total>  bytes=<done>/<total>  message=<текст>
+# Обязательно только поле phase.
+
+_PROGRESS_FD=""
+if [[ "${STEAMDECK_PROGRESS_FD:-}" =~ ^[0-9]+$ ]] && { : >&"$STEAMDECK_PROGRESS_FD"; } 2>/dev/null; then
+    _PROGRESS_FD="$STEAMDECK_PROGRESS_FD"
+fi
+
+# Слушает ли кто-то события (чтобы не считать прогресс впустую)
+progress_enabled() {
+    [[ -n "$_PROGRESS_FD" ]]
+}
+
+# Отправка события: progress_event "phase=..." ["items=N/M"] ["bytes=N/M"] ["message=..."]
+progress_event() {
+    [[ -n "$_PROGRESS_FD" ]] || return 0
+    local fields=("${@//[$'\t\n']/ }")
+    local IFS=$'\t'
+    printf '%s\n' "${fields[*]}" >&"$_PROGRESS_FD"
+}
+
+# Начало фазы без количественного прогресса
+progress_phase() {
+    progress_event "phase=$1" ${2:+"message=$2"}
+}
+
+# Прогресс по элементам: progress_items <phase> <done> <total> [message]
+progress_items() {
+    progress_event "phase=$1" "items=$2/$3" ${4:+"message=$4"}
+}
+
+# Прогресс по байтам: progress_bytes <phase> <done> <total> [message]
+progress_bytes() {
+    progress_event "phase=$1" "bytes=$2/$3" ${4:+"message=$4"}
+}
+
+# Аргументы GNU tar для событий прогресса по байтам (около 100 событий на архив)
+# progress_tar_args <phase> <path>...; результат в массиве PROGRESS_TAR_ARGS:
+#   tar "${PROGRESS_TAR_ARGS[@]}" -czf ...
+progress_tar_args() {
+    local phase="$1"
+    shift
+    local record=10240
+    
+    PROGRESS_TAR_ARGS=()
+    progress_enabled || return 0
+    
+    local total
+    total=$(du -scb "$@" 2>/dev/null | tail -1 | cut -f1)
+    [[ "${total:-0}" -gt 0 ]] || return 0
+    
+    local every=$(( total / record / 100 ))
+    (( every < 1 )) && every=1
+    
+    PROGRESS_TAR_ARGS=(
+        "--checkpoint=$every"
+        "--checkpoint-action=exec=printf 'phase=$phase\\tbytes=%d/$total\\n' \$((TAR_CHECKPOINT * $record)) >&$_PROGRESS_FD"
+    )
+}
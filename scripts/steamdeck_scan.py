@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Steam Deck Enhancement Pack - Параллельный обход каталогов
+Обход на os.scandir, в котором каждое физическое устройство (встроенный
+NVMe, microSD, USB) обходится своими потоками: корни на разных
+устройствах читаются одновременно, а число одновременных чтений одного
+устройства ограничено (медленная SD карта читается в один поток).
+Используется поиском игр, очисткой и подсчётом занятого места.
+Автор: @ncux11
+Версия: динамическая (читается из VERSION)
+"""
+
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import (Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple,
+                    Optional, Set, Tuple)
+
+# Каталоги, которые не обходятся: префиксы Proton, кэш шейдеров, репозитории
+DEFAULT_PRUNE = frozenset({"compatdata", "shadercache", ".git"})
+
+# Одновременных чтений одного устройства по его типу
+DEVICE_LIMITS = {
+    "nvme": 4,
+    "ssd": 4,
+    "virtual": 4,   # tmpfs, overlay, zram
+    "hdd": 1,
+    "mmc": 1,       # microSD
+    "usb": 1,
+}
+
+# Записей в очереди результатов до приостановки обхода
+RESULT_QUEUE_SIZE = 4096
+
+SYS_BLOCK = "/sys/dev/block"
+
+
+class ScanEntry(NamedTuple):
+    """Файл или каталог, найденный обходом"""
+    path: str
+    name: str
+    is_dir: bool
+    stat: Optional[os.stat_result]  # lstat (None без stat=True или если недоступен; у каталогов есть всегда)
+    depth: int                      # 1 - непосредственно в корне
+    root: str
+
+
+def is_under(path: str, root: str) -> bool:
+    """Путь совпадает с root или лежит внутри него"""
+    return path == root or path.startswith(root.rstrip("/") + "/")
+
+
+def outermost(roots: Iterable) -> List[str]:
+    """Существующие корни без вложенных в другие корни"""
+    paths = sorted({os.path.abspath(str(root)) for root in roots if os.path.isdir(root)})
+    result: List[str] = []
+    for path in paths:
+        if not any(is_under(path, parent) for parent in result):
+            result.append(path)
+    return result
+
+
+def device_class(device: int) -> str:
+    """Тип устройства по st_dev: nvme, ssd, hdd, mmc, usb или virtual"""
+    major, minor = os.major(device), os.minor(device)
+    if major == 0:
+        # Анонимные устройства: tmpfs, overlay, btrfs-подтома
+        return "virtual"
+    try:
+        sys_path = os.path.realpath(f"{SYS_BLOCK}/{major}:{minor}")
+    except OSError:
+        return "ssd"
+    if "/usb" in sys_path:
+        return "usb"
+    if "/mmc" in sys_path:
+        return "mmc"
+    if "/nvme" in sys_path:
+        return "nvme"
+    if "/virtual/" in sys_path:
+        return "virtual"
+    # Раздел: очередь описана у родительского диска
+    for block in (sys_path, os.path.dirname(sys_path)):
+        try:
+            with open(os.path.join(block, "queue", "rotational")) as f:
+                return "hdd" if f.read().strip() == "1" else "ssd"
+        except OSError:
+            continue
+    return "ssd"
+
+
+def device_limit(device: int, limits: Optional[Dict[str, int]] = None) -> int:
+    """Одновременных чтений устройства"""
+    return max(1, (limits or DEVICE_LIMITS).get(device_class(device), 1))
+
+
+def group_by_device(roots: Iterable) -> Dict[int, List[str]]:
+    """Существующие корни (без вложенных), сгруппированные по устройству"""
+    groups: Dict[int, List[str]] = {}
+    for root in outermost(roots):
+        try:
+            groups.setdefault(os.stat(root).st_dev, []).append(root)
+        except OSError:
+            continue
+    return groups
+
+
+def map_roots(func: Callable[[str], object], roots: Iterable,
+              limits: Optional[Dict[str, int]] = None) -> Dict[str, object]:
+    """
+    func(root) для каждого корня: корни разных устройств параллельно,
+    на одном устройстве - не больше его лимита одновременно
+    
+    Returns:
+        {корень: результат func}; исключение func передаётся вызывающему
+    """
+    groups = group_by_device(roots)
+    if not groups:
+        return {}
+    semaphores = {device: threading.Semaphore(device_limit(device, limits))
+                  for device in groups}
+    jobs = [(device, root) for device, device_roots in groups.items() for root in device_roots]
+    
+    def run(job):
+        device, root = job
+        with semaphores[device]:
+            return root, func(root)
+    
+    if len(jobs) == 1:
+        return dict([run(jobs[0])])
+    with ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="scan-root") as pool:
+        return dict(pool.map(run, jobs))
+
+
+class Scanner:
+    """
+    Параллельный обход деревьев каталогов
+    
+    Каталоги обходятся потоками своего устройства (по device_limit на
+    устройство); подкаталог на другом устройстве (точка монтирования)
+    передаётся потокам того устройства. Символические ссылки не
+    открываются, как у find без -L.
+    """
+    
+    def __init__(self, max_depth: Optional[int] = None,
+                 prune: Iterable[str] = DEFAULT_PRUNE,
+                 stat: bool = False,
+                 limits: Optional[Dict[str, int]] = None,
+                 on_error: Optional[Callable[[str, OSError], None]] = None):
+        """
+        Args:
+            max_depth: Глубина записей от корня (как find -maxdepth), None - без ограничения
+            prune: Имена каталогов, которые не обходятся (и не выдаются)
+            stat: Получать lstat и для файлов (каталоги - всегда)
+            limits: Одновременных чтений по типу устройства (по умолчанию DEVICE_LIMITS)
+            on_error: Вызывается для недоступного каталога (из потока обхода)
+        """
+        self.max_depth = max_depth
+        self.prune = frozenset(prune)
+        self.stat = stat
+        self.limits = limits
+        self.on_error = on_error
+    
+    def walk(self, roots: Iterable) -> Iterator[ScanEntry]:
+        """
+        Все записи под корнями, в порядке готовности
+        
+        Прерванный перебор (break) останавливает потоки обхода.
+        """
+        walk = _Walk(self, group_by_device(roots))
+        try:
+            yield from walk.results()
+        finally:
+            walk.cancel()
+    
+    def files(self, roots: Iterable) -> Iterator[ScanEntry]:
+        """Только файлы"""
+        return (entry for entry in self.walk(roots) if not entry.is_dir)
+
+
+class _Walk:
+    """Состояние одного обхода: очереди каталогов по устройствам и потоки"""
+    
+    _DONE = object()
+    
+    def __init__(self, scanner: Scanner, groups: Dict[int, List[str]]):
+        self.scanner = scanner
+        self.results_queue: "queue.Queue" = queue.Queue(maxsize=RESULT_QUEUE_SIZE)
+        self._lock = threading.Condition()
+        self._dirs: Dict[int, Deque[Tuple[str, int, str]]] = {}
+        self._pending = 0
+        self._cancelled = False
+        self._threads: List[threading.Thread] = []
+        # Потоки начинают работу, когда в очередях уже все корни
+        with self._lock:
+            for device, roots in groups.items():
+                for root in roots:
+                    self._push(device, root, 0, root)
+        if not self._pending:
+            self.results_queue.put(self._DONE)
+    
+    def results(self) -> Iterator[ScanEntry]:
+        # Потоки передают записи пачками (одна пачка на каталог)
+        while True:
+            batch = self.results_queue.get()
+            if batch is self._DONE:
+                return
+            yield from batch
+    
+    def cancel(self):
+        with self._lock:
+            self._cancelled = True
+            self._lock.notify_all()
+        # Освобождаем потоки, ждущие места в очереди результатов
+        while any(thread.is_alive() for thread in self._threads):
+            try:
+                self.results_queue.get(timeout=0.05)
+            except queue.Empty:
+                pass
+    
+    def _push(self, device: int, path: str, depth: int, root: str):
+        # Вызывается под self._lock (или до запуска потоков)
+        if device not in self._dirs:
+            self._dirs[device] = deque()
+            for number in range(device_limit(device, self.scanner.limits)):
+                thread = threading.Thread(target=self._worker, args=(device,),
+                                          name=f"scan-{device}-{number}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+        self._dirs[device].append((path, depth, root))
+        self._pending += 1
+        self._lock.notify_all()
+    
+    def _worker(self, device: int):
+        dirs = self._dirs[device]
+        while True:
+            with self._lock:
+                while not dirs and self._pending and not self._cancelled:
+                    self._lock.wait()
+                if self._cancelled or not self._pending:
+                    return
+                path, depth, root = dirs.popleft()
+            subdirs = self._list(path, depth, root)
+            with self._lock:
+                for sub_device, sub_path in subdirs:
+                    self._push(sub_device, sub_path, depth + 1, root)
+                self._pending -= 1
+                finished = not self._pending
+                if finished:
+                    self._lock.notify_all()
+            if finished:
+                self._put(self._DONE)
+                return
+    
+    def _list(self, path: str, depth: int, root: str) -> List[Tuple[int, str]]:
+        scanner = self.scanner
+        descend = scanner.max_depth is None or depth + 1 < scanner.max_depth
+        batch = []
+        subdirs = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        if is_dir and entry.name in scanner.prune:
+                            continue
+                        # У каталога st_dev нужен для перехода на другое устройство
+                        stat = (entry.stat(follow_symlinks=False)
+                                if is_dir or scanner.stat else None)
+                    except OSError:
+                        is_dir, stat = False, None
+                    batch.append(ScanEntry(entry.path, entry.name, is_dir, stat, depth + 1, root))
+                    if is_dir and stat is not None and descend:
+                        subdirs.append((stat.st_dev, entry.path))
+        except OSError as e:
+            if scanner.on_error is not None:
+                scanner.on_error(path, e)
+        if batch:
+            self._put(batch)
+        return subdirs
+    
+    def _put(self, item):
+        while not self._cancelled:
+            try:
+                self.results_queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+
+def disk_usage(paths: Iterable, scanner: Optional[Scanner] = None) -> Dict[str, int]:
+    """
+    Занятое место (байты, как du) под каждым путём
+    
+    Жёсткие ссылки считаются один раз; prune по умолчанию не применяется.
+    """
+    scanner = scanner or Scanner(prune=(), stat=True)
+    roots = outermost(paths)
+    totals = {root: _allocated(os.lstat(root)) for root in roots}
+    seen: Set[Tuple[int, int]] = set()
+    for entry in scanner.walk(roots):
+        stat = entry.stat
+        if stat is None:
+            continue
+        if stat.st_nlink > 1 and not entry.is_dir:
+            key = (stat.st_dev, stat.st_ino)
+            if key in seen:
+                continue
+            seen.add(key)
+        totals[entry.root] += _allocated(stat)
+    return totals
+
+
+def largest_dirs(root, count: int = 10, scanner: Optional[Scanner] = None) -> List[Tuple[int, str]]:
+    """
+    Самые большие каталоги под root (с вложенными), как `du | sort -hr | head`
+    
+    Returns:
+        [(байты, путь)] по убыванию
+    """
+    scanner = scanner or Scanner(prune=(), stat=True)
+    root = os.path.abspath(str(root))
+    sizes: Dict[str, int] = {root: _allocated(os.lstat(root))}
+    seen: Set[Tuple[int, int]] = set()
+    for entry in scanner.walk([root]):
+        stat = entry.stat
+        if stat is None:
+            continue
+        if entry.is_dir:
+            sizes[entry.path] = sizes.get(entry.path, 0) + _allocated(stat)
+            continue
+        if stat.st_nlink > 1:
+            key = (stat.st_dev, stat.st_ino)
+            if key in seen:
+                continue
+            seen.add(key)
+        parent = os.path.dirname(entry.path)
+        sizes[parent] = sizes.get(parent, 0) + _allocated(stat)
+    
+    # Размер каталога включает подкаталоги: суммируем от глубоких к корню
+    for path in sorted(sizes, key=lambda item: item.count("/"), reverse=True):
+        if path != root:
+            parent = os.path.dirname(path)
+            sizes[parent] = sizes.get(parent, 0) + sizes[path]
+    return sorted(((size, path) for path, size in sizes.items()), reverse=True)[:count]
+
+
+def _allocated(stat: os.stat_result) -> int:
+    # Занятые блоки, как у du (разреженные файлы не раздуваются)
+    return getattr(stat, "st_blocks", 0) * 512 or stat.st_size
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    from steamdeck_probe import format_bytes
+    
+    parser = argparse.ArgumentParser(description="Параллельный обход каталогов Steam Deck")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    du_parser = commands.add_parser("du", help="Занятое место под каждым путём")
+    du_parser.add_argument("paths", nargs="+")
+    
+    top_parser = commands.add_parser("top", help="Самые большие каталоги")
+    top_parser.add_argument("root")
+    top_parser.add_argument("count", nargs="?", type=int, default=10)
+    
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "du":
+            for path, size in disk_usage(args.paths).items():
+                print(f"{format_bytes(size)}\t{path}")
+        elif args.command == "top":
+            for size, path in largest_dirs(args.root, args.count):
+                print(f"{format_bytes(size)}\t{path}")
+    except OSError as e:
+        print(f"Ошибка обхода: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
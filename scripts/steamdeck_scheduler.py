@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Steam Deck Enhancement Pack - Планировщик задач
+Общая очередь запуска скриптов для обоих GUI: ограниченный пул потоков,
+приоритеты и классы ресурсов с собственными лимитами параллельности.
+Автор: @ncux11
+Версия: динамическая (читается из VERSION)
+"""
+
+import heapq
+import itertools
+import threading
+from typing import Callable, Dict, List, Optional
+
+
+# Приоритеты задач (меньше - раньше)
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+
+# Классы ресурсов
+RESOURCE_DISK = "disk-heavy"
+RESOURCE_NETWORK = "network"
+RESOURCE_PRIVILEGED = "privileged"
+
+# Сколько задач каждого класса может выполняться одновременно.
+# Задачи без класса (быстрые проверки) ограничены только размером пула.
+RESOURCE_LIMITS = {
+    RESOURCE_DISK: 1,
+    RESOURCE_NETWORK: 2,
+    RESOURCE_PRIVILEGED: 1,
+}
+
+DEFAULT_MAX_WORKERS = 4
+
+# Состояния задачи
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+
+class Job:
+    """Задача планировщика"""
+
+    def __init__(self, func: Callable, args=(), kwargs=None, name: str = "",
+                 priority: int = PRIORITY_NORMAL, resource: Optional[str] = None,
+                 key: Optional[str] = None):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.name = name or getattr(func, "__name__", "job")
+        self.priority = priority
+        self.resource = resource
+        self.key = key
+        self.state = JOB_QUEUED
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self._done = threading.Event()
+        self._callbacks: List[Callable] = []
+        self._lock = threading.Lock()
+
+    def done(self) -> bool:
+        """Задача завершена (успешно, с ошибкой или отменена)"""
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Ожидание завершения задачи"""
+        return self._done.wait(timeout)
+
+    def add_done_callback(self, callback: Callable):
+        """
+        Добавить обработчик завершения
+
+        Обработчик вызывается с задачей в качестве аргумента в потоке,
+        завершившем задачу (или сразу, если задача уже завершена).
+        """
+        with self._lock:
+            if not self._done.is_set():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def run(self):
+        """Выполнение задачи в текущем потоке"""
+        try:
+            self.result = self.func(*self.args, **self.kwargs)
+            self.state = JOB_DONE
+        except BaseException as e:
+            self.error = e
+            self.state = JOB_FAILED
+
+    def finish(self, state: Optional[str] = None):
+        """Отметить задачу завершённой и вызвать обработчики"""
+        if state is not None:
+            self.state = state
+        with self._lock:
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception:
+                pass
+
+    def __repr__(self):
+        return f"<Job {self.name!r} {self.state} resource={self.resource}>"
+
+
+class JobQueue:
+    """
+    Очередь задач с приоритетами и лимитами классов ресурсов
+
+    Не потокобезопасна: вызывающий код держит свою блокировку
+    (JobScheduler) или работает в одном потоке (цикл asyncio).
+    """
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None,
+                 max_running: Optional[int] = None):
+        self.limits = dict(RESOURCE_LIMITS if limits is None else limits)
+        self.max_running = max_running
+        self._heap = []
+        self._seq = itertools.count()
+        self._active: Dict[str, int] = {}
+        self._running = 0
+        self._keys: Dict[str, Job] = {}
+
+    def __len__(self):
+        return len(self._heap)
+
+    @property
+    def running(self) -> int:
+        """Количество выполняющихся задач"""
+        return self._running
+
+    def find(self, key: str) -> Optional[Job]:
+        """Найти ожидающую или выполняющуюся задачу по ключу"""
+        return self._keys.get(key)
+
+    def has_capacity(self, resource: Optional[str]) -> bool:
+        """Можно ли сейчас запустить задачу данного класса"""
+        if self.max_running is not None and self._running >= self.max_running:
+            return False
+        if resource is None or resource not in self.limits:
+            return True
+        return self._active.get(resource, 0) < self.limits[resource]
+
+    def push(self, job: Job):
+        """Добавить задачу в очередь"""
+        heapq.heappush(self._heap, (job.priority, next(self._seq), job))
+        if job.key is not None:
+            self._keys[job.key] = job
+
+    def pop_runnable(self) -> Optional[Job]:
+        """
+        Забрать самую приоритетную задачу, для которой есть свободный ресурс
+
+        Задачи с занятым классом ресурса остаются в очереди и не мешают
+        запуску задач других классов.
+        """
+        skipped = []
+        job = None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            candidate = entry[-1]
+            if candidate.state == JOB_CANCELLED:
+                continue
+            if self.has_capacity(candidate.resource):
+                job = candidate
+                break
+            skipped.append(entry)
+
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+
+        if job is not None:
+            job.state = JOB_RUNNING
+            self._running += 1
+            if job.resource is not None:
+                self._active[job.resource] = self._active.get(job.resource, 0) + 1
+        return job
+
+    def release(self, job: Job):
+        """Освободить ресурсы завершившейся задачи"""
+        self._running -= 1
+        if job.resource is not None:
+            self._active[job.resource] -= 1
+        self._forget(job)
+
+    def remove(self, job: Job) -> bool:
+        """Убрать ожидающую задачу из очереди"""
+        if job.state != JOB_QUEUED:
+            return False
+        job.state = JOB_CANCELLED
+        self._heap = [entry for entry in self._heap if entry[-1] is not job]
+        heapq.heapify(self._heap)
+        self._forget(job)
+        return True
+
+    def _forget(self, job: Job):
+        if job.key is not None and self._keys.get(job.key) is job:
+            del self._keys[job.key]
+
+
+class JobScheduler:
+    """Планировщик задач с ограниченным пулом рабочих потоков"""
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS,
+                 limits: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            max_workers: Размер пула потоков
+            limits: Лимиты классов ресурсов (по умолчанию RESOURCE_LIMITS)
+        """
+        self.max_workers = max_workers
+        self._queue = JobQueue(limits, max_running=max_workers)
+        self._cond = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        self._shutdown = False
+
+    def submit(self, func: Callable, *args, name: str = "",
+               priority: int = PRIORITY_NORMAL, resource: Optional[str] = None,
+               key: Optional[str] = None, **kwargs) -> Job:
+        """
+        Поставить задачу в очередь
+
+        Args:
+            func: Выполняемая функция
+            name: Имя задачи для вывода
+            priority: Приоритет (PRIORITY_HIGH / NORMAL / LOW)
+            resource: Класс ресурса (RESOURCE_DISK / NETWORK / PRIVILEGED) или None
+            key: Ключ задачи; если задача с таким ключом уже ожидает или
+                 выполняется, новая не создаётся и возвращается существующая
+
+        Returns:
+            Объект задачи
+        """
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("Планировщик остановлен")
+            if key is not None:
+                existing = self._queue.find(key)
+                if existing is not None:
+                    return existing
+
+            job = Job(func, args, kwargs, name, priority, resource, key)
+            self._queue.push(job)
+            self._start_workers()
+            self._cond.notify()
+        return job
+
+    def find(self, key: str) -> Optional[Job]:
+        """Найти ожидающую или выполняющуюся задачу по ключу"""
+        with self._cond:
+            return self._queue.find(key)
+
+    def has_capacity(self, resource: Optional[str]) -> bool:
+        """Запустится ли задача данного класса без ожидания"""
+        with self._cond:
+            return self._queue.has_capacity(resource)
+
+    def cancel(self, job: Job) -> bool:
+        """Отмена задачи, которая ещё не начала выполняться"""
+        with self._cond:
+            removed = self._queue.remove(job)
+        if removed:
+            job.finish(JOB_CANCELLED)
+        return removed
+
+    def pending_count(self) -> int:
+        """Количество задач в очереди"""
+        with self._cond:
+            return len(self._queue)
+
+    def running_count(self) -> int:
+        """Количество выполняющихся задач"""
+        with self._cond:
+            return self._queue.running
+
+    def shutdown(self, wait: bool = False):
+        """Остановка пула; ожидающие задачи отменяются"""
+        with self._cond:
+            self._shutdown = True
+            cancelled = []
+            while len(self._queue):
+                job = self._queue._heap[0][-1]
+                if self._queue.remove(job):
+                    cancelled.append(job)
+            self._cond.notify_all()
+            workers = list(self._workers)
+
+        for job in cancelled:
+            job.finish(JOB_CANCELLED)
+
+        if wait:
+            for worker in workers:
+                worker.join()
+
+    def _start_workers(self):
+        """Ленивый запуск рабочих потоков (под блокировкой)"""
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(
+                target=self._worker,
+                name=f"steamdeck-job-{len(self._workers) + 1}",
+                daemon=True
+            )
+            self._workers.append(worker)
+            worker.start()
+
+    def _worker(self):
+        """Цикл рабочего потока"""
+        while True:
+            with self._cond:
+                job = self._queue.pop_runnable()
+                while job is None:
+                    if self._shutdown:
+                        return
+                    self._cond.wait()
+                    job = self._queue.pop_runnable()
+
+            job.run()
+
+            with self._cond:
+                self._queue.release(job)
+                # Освободившийся ресурс может разблокировать отложенные задачи
+                self._cond.notify_all()
+
+            job.finish()
+
+
+_scheduler: Optional[JobScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> JobScheduler:
+    """Общий экземпляр планировщика процесса"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = JobScheduler()
+        return _scheduler
@@ -34,6 +34,9 @@ DECK_USER="${STEAMDECK_USER:-deck}"
 DECK_HOME="${STEAMDECK_HOME:-/home/$DECK_USER}"
 INSTALL_DIR="${STEAMDECK_INSTALL_DIR:-$DECK_HOME/SteamDeck}"
 
+# События прогресса для GUI
+source "$(dirname "$(readlink -f "${BASH_SOURCE[0]}")")/steamdeck_progress.sh"
+
 # Функция для вывода сообщений
 print_message() {
     echo -e "${BLUE}[INFO]${NC} $1"
@@ -982,17 +985,25 @@ main_setup() {
     local backup_dir=$(create_detailed_backup)
     log_setup_state "backup_created" "$backup_dir"
     
-    disable_readonly
-    configure_pacman
-    init_keys
-    install_base_packages
-    install_aur_helper
-    install_wine
-    install_protontricks
-    install_protonup
-    install_sniper
-    install_steamdeck_utils
-    cleanup_cache
+    local steps=(
+        disable_readonly
+        configure_pacman
+        init_keys
+        install_base_packages
+        install_aur_helper
+        install_wine
+        install_protontricks
+        install_protonup
+        install_sniper
+        install_steamdeck_utils
+        cleanup_cache
+    )
+    local i
+    for i in "${!steps[@]}"; do
+        progress_items setup "$i" "${#steps[@]}" "${steps[$i]}"
+        "${steps[$i]}"
+    done
+    progress_items setup "${#steps[@]}" "${#steps[@]}"
     
     echo
     print_success "=== НАСТРОЙКА ЗАВЕРШЕНА ==="
@@ -1010,42 +1021,45 @@ main_setup() {
     show_summary
 }
 
-# Обработка аргументов командной строки
-case "${1:-setup}" in
-    "setup")
-        main_setup
-        ;;
-    "disable")
-        check_root
-        check_password
-        disable_readonly
-        print_success "Режим только для чтения отключен"
-        ;;
-    "enable")
-        check_root
-        check_password
-        enable_readonly
-        print_success "Режим только для чтения включен"
-        ;;
-    "status")
-        show_status
-        ;;
-    "rollback")
-        check_root
-        check_password
-        rollback_setup
-        ;;
-    "install-utils")
-        check_root
-        check_password
-        install_steamdeck_utils
-        ;;
-    "help"|"-h"|"--help")
-        show_help
-        ;;
-    *)
-        print_error "Неизвестная опция: $1"
-        show_help
-        exit 1
-        ;;
-esac
+# Обработка аргументов командной строки (фоновый обработчик
+# steamdeck_worker.sh только подключает функции)
+if [[ -z "${STEAMDECK_WORKER:-}" ]]; then
+    case "${1:-setup}" in
+        "setup")
+            main_setup
+            ;;
+        "disable")
+            check_root
+            check_password
+            disable_readonly
+            print_success "Режим только для чтения отключен"
+            ;;
+        "enable")
+            check_root
+            check_password
+            enable_readonly
+            print_success "Режим только для чтения включен"
+            ;;
+        "status")
+            show_status
+            ;;
+        "rollback")
+            check_root
+            check_password
+            rollback_setup
+            ;;
+        "install-utils")
+            check_root
+            check_password
+            install_steamdeck_utils
+            ;;
+        "help"|"-h"|"--help")
+            show_help
+            ;;
+        *)
+            print_error "Неизвестная опция: $1"
+            show_help
+            exit 1
+            ;;
+    esac
+fi
@@ -22,6 +22,9 @@ print_warning() { echo -e "${YELLOW}[WARNING]${NC} $1"; }
 print_error() { echo -e "${RED}[ERROR]${NC} $1"; }
 print_header() { echo -e "${CYAN}=== $1 ===${NC}"; }
 
+# Общий индекс файлов игр
+source "$(dirname "$(readlink -f "${BASH_SOURCE[0]}")")/steamdeck_gameindex.sh"
+
 # Пути
 STEAM_DIR="$HOME/.steam/steam"
 SHORTCUTS_FILE="$STEAM_DIR/userdata/*/config/shortcuts.vdf"
@@ -228,55 +231,24 @@ add_utilities() {
 add_native_linux_games() {
     print_header "ПОИСК NATIVE LINUX ИГР (.sh скрипты)"
     
-    local search_dirs=(
-        "$HOME/Downloads"
-        "$HOME/Desktop"
-        "$HOME/Games"
-        "/run/media/mmcblk0p1/Games"
-        "/run/media/mmcblk0p1"
-    )
-    
-    # Добавляем все возможные /run/media/* для флешек и SD карт
-    local media_dirs=()
-    if [[ -d "/run/media" ]]; then
-        while IFS= read -r -d '' dir; do
-            media_dirs+=("$dir")
-        done < <(find /run/media -maxdepth 1 -type d ! -path /run/media -print0 2>/dev/null)
-    fi
-    
-    # Добавляем в search_dirs
-    search_dirs+=("${media_dirs[@]}")
-    
     local found_games=()
     
     print_message "Поиск .sh игр в стандартных директориях..."
     
-    for dir in "${search_dirs[@]}"; do
-        if [[ -d "$dir" ]]; then
-            print_message "Поиск в: $dir"
-            
-            # Поиск .sh файлов, которые могут быть играми
-            while IFS= read -r -d '' file; do
-                local filename=$(basename "$file")
-                local game_name=$(basename "$file" .sh)
-                
-                # Проверяем, что это может быть игра (не системный скрипт)
-                if [[ ! "$filename" =~ ^(setup|install|config|start|run) ]] && 
-                   [[ ! "$filename" =~ ^\. ]] &&
-                   [[ -x "$file" ]] || [[ -f "$file" ]]; then
-                    found_games+=("$game_name|$file")
-                    print_message "Найдена игра: $game_name ($file)"
-                fi
-            done < <(find "$dir" -maxdepth 3 -name "*.sh" -type f -print0 2>/dev/null)
-        fi
-    done
+    # Поиск .sh файлов, которые могут быть играми (общий индекс)
+    while IFS= read -r -d '' file; do
+        local game_name=$(basename "$file" .sh)
+        found_games+=("$game_name|$file")
+        print_message "Найдена игра: $game_name ($file)"
+    done < <(game_index_find sh)
     
     if [[ ${#found_games[@]} -eq 0 ]]; then
         print_warning "Native Linux игры (.sh) не найдены"
         print_message "Поместите .sh файлы игр в одну из директорий:"
-        for dir in "${search_dirs[@]}"; do
-            echo "  - $dir"
-        done
+        echo "  - $HOME/Games"
+        echo "  - $HOME/Downloads"
+        echo "  - $HOME/Desktop"
+        echo "  - /run/media/mmcblk0p1/Games"
         return 0
     fi
     
@@ -320,47 +292,15 @@ add_native_linux_games() {
 add_all_native_games() {
     print_header "МАССОВОЕ ДОБАВЛЕНИЕ NATIVE LINUX ИГР"
     
-    local search_dirs=(
-        "$HOME/Downloads"
-        "$HOME/Desktop"
-        "$HOME/Games"
-        "/run/media/mmcblk0p1/Games"
-        "/run/media/mmcblk0p1"
-    )
-    
-    # Добавляем все возможные /run/media/* для флешек и SD карт
-    local media_dirs=()
-    if [[ -d "/run/media" ]]; then
-        while IFS= read -r -d '' dir; do
-            media_dirs+=("$dir")
-        done < <(find /run/media -maxdepth 1 -type d ! -path /run/media -print0 2>/dev/null)
-    fi
-    
-    # Добавляем в search_dirs
-    search_dirs+=("${media_dirs[@]}")
-    
     local added_count=0
     
-    for dir in "${search_dirs[@]}"; do
-        if [[ -d "$dir" ]]; then
-            print_message "Поиск в: $dir"
-            
-            while IFS= read -r -d '' file; do
-                local filename=$(basename "$file")
-                local game_name=$(basename "$file" .sh)
-                
-                # Проверяем, что это может быть игра
-                if [[ ! "$filename" =~ ^(setup|install|config|start|run) ]] && 
-                   [[ ! "$filename" =~ ^\. ]] &&
-                   [[ -f "$file" ]]; then
-                    
-                    print_message "Добавление: $game_name"
-                    create_single_shortcut "$game_name" "$file"
-                    ((added_count++))
-                fi
-            done < <(find "$dir" -maxdepth 3 -name "*.sh" -type f -print0 2>/dev/null)
-        fi
-    done
+    while IFS= read -r -d '' file; do
+        local game_name=$(basename "$file" .sh)
+        
+        print_message "Добавление: $game_name"
+        create_single_shortcut "$game_name" "$file"
+        ((added_count++))
+    done < <(game_index_find sh)
     
     print_success "Добавлено игр: $added_count"
 }
@@ -625,5 +565,7 @@ main() {
     esac
 }
 
-# Запуск
-main "$@"
+# Запуск (фоновый обработчик steamdeck_worker.sh только подключает функции)
+if [[ -z "${STEAMDECK_WORKER:-}" ]]; then
+    main "$@"
+fi
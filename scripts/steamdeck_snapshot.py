@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Steam Deck Enhancement Pack - Снимок данных панелей
+Последние вычисленные значения полей GUI (системная информация, счётчики
+игр и медиа, версия, статус обновлений) с временем вычисления. GUI
+показывает их сразу при запуске и обновляет в фоне поля с истёкшим TTL.
+Автор: @ncux11
+Версия: динамическая (читается из VERSION)
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional
+
+SNAPSHOT_FILE = Path.home() / ".steamdeck_gui" / "snapshot.json"
+
+# Время актуальности полей (секунды)
+FIELD_TTL = {
+    "system_info": 3600,
+    "games_info": 600,
+    "offline_info": 600,
+    "update_status": 6 * 3600,
+    "system.version": 300,
+    "system.os": 24 * 3600,
+    "system.storage": 300,
+    "system.network": 60,
+    "update.version": 300,
+}
+DEFAULT_TTL = 600
+
+
+class SnapshotEntry(NamedTuple):
+    """Значение поля и время его вычисления"""
+    value: Any
+    updated: float
+    
+    @property
+    def age(self) -> float:
+        """Возраст значения в секундах"""
+        return max(0.0, time.time() - self.updated)
+    
+    def updated_text(self) -> str:
+        """Время вычисления для подписи в интерфейсе"""
+        return time.strftime("%d.%m %H:%M", time.localtime(self.updated))
+
+
+class SnapshotCache:
+    """
+    Файл снимка с полями панелей
+    
+    Запись объединяется с текущим содержимым файла, поэтому оба GUI могут
+    пользоваться одним снимком, не затирая поля друг друга.
+    """
+    
+    def __init__(self, path=SNAPSHOT_FILE, ttl: Optional[Dict[str, float]] = None):
+        self.path = Path(path)
+        self.ttl = dict(FIELD_TTL, **(ttl or {}))
+        self._lock = threading.Lock()
+        self._fields: Optional[Dict[str, Dict]] = None
+    
+    def get(self, field: str) -> Optional[SnapshotEntry]:
+        """Сохранённое значение поля или None"""
+        with self._lock:
+            entry = self._load().get(field)
+        if not isinstance(entry, dict) or "updated" not in entry:
+            return None
+        return SnapshotEntry(entry.get("value"), float(entry["updated"]))
+    
+    def is_fresh(self, field: str) -> bool:
+        """Значение есть и его TTL не истёк"""
+        entry = self.get(field)
+        return entry is not None and entry.age < self.ttl.get(field, DEFAULT_TTL)
+    
+    def set(self, field: str, value: Any):
+        """Сохранение нового значения поля"""
+        with self._lock:
+            # Перечитываем файл: другой GUI мог обновить свои поля
+            self._fields = None
+            fields = self._load()
+            fields[field] = {"value": value, "updated": time.time()}
+            self._save(fields)
+    
+    def _load(self) -> Dict[str, Dict]:
+        if self._fields is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    data = json.load(f)
+                self._fields = data if isinstance(data, dict) else {}
+            except (OSError, ValueError):
+                self._fields = {}
+        return self._fields
+    
+    def _save(self, fields: Dict[str, Dict]):
+        # Атомарная замена: при сбое остаётся предыдущий снимок
+        # (tempfile загружается здесь, а не при запуске GUI)
+        import tempfile
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=str(self.path.parent), prefix=".snapshot-")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(fields, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+        except (OSError, TypeError, ValueError):
+            os.unlink(tmp_path)
+
+
+_snapshot: Optional[SnapshotCache] = None
+_snapshot_lock = threading.Lock()
+
+
+def get_snapshot() -> SnapshotCache:
+    """Общий снимок процесса"""
+    global _snapshot
+    with _snapshot_lock:
+        if _snapshot is None:
+            _snapshot = SnapshotCache()
+        return _snapshot
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Steam Deck Enhancement Pack - Библиотеки Steam
+Модель установленных игр Steam по libraryfolders.vdf и манифестам
+appmanifest_*.acf всех библиотек (внутренняя память, SD карта, внешние
+диски). Разобранные манифесты кэшируются по mtime, поэтому число игр и
+их размер считаются за миллисекунды без обхода данных игр.
+Автор: @ncux11
+Версия: динамическая (читается из VERSION)
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from steamdeck_scan import device_class
+
+CACHE_FILE = Path.home() / ".steamdeck_gui" / "steam_library.json"
+CACHE_VERSION = 1
+
+# Каталоги установки Steam (~/.steam/steam обычно ссылка на ~/.local/share/Steam)
+STEAM_ROOTS = (
+    Path.home() / ".steam" / "steam",
+    Path.home() / ".local" / "share" / "Steam",
+)
+
+LIBRARY_FOLDERS = "libraryfolders.vdf"
+MANIFEST_RE = re.compile(r"^appmanifest_(\d+)\.acf$")
+
+# Подписи типов устройств (steamdeck_scan.device_class)
+DEVICE_NAMES = {
+    "nvme": "внутренняя память",
+    "ssd": "SSD",
+    "hdd": "HDD",
+    "mmc": "SD карта",
+    "usb": "USB",
+    "virtual": "виртуальный диск",
+}
+
+_TOKEN_RE = re.compile(r'"((?:[^"\\]|\\.)*)"|([{}])|(//[^\n]*)|([^\s{}"]+)')
+_ESCAPES = {"n": "\n", "t": "\t", "\\": "\\", '"': '"'}
+
+
+class SteamApp(NamedTuple):
+    """Установленное приложение Steam (appmanifest_*.acf)"""
+    appid: int
+    name: str
+    size_on_disk: int
+    last_updated: int
+    install_dir: str
+    library: str
+    device: int
+    
+    @property
+    def install_path(self) -> Path:
+        """Каталог с файлами игры"""
+        return Path(self.library) / "steamapps" / "common" / self.install_dir
+
+
+class SteamLibrary(NamedTuple):
+    """Библиотека Steam и её приложения"""
+    path: str
+    device: int
+    device_class: str
+    apps: List[SteamApp]
+    
+    @property
+    def size_on_disk(self) -> int:
+        """Суммарный размер приложений по манифестам"""
+        return sum(app.size_on_disk for app in self.apps)
+    
+    @property
+    def device_name(self) -> str:
+        """Подпись типа устройства"""
+        return DEVICE_NAMES.get(self.device_class, self.device_class)
+
+
+def parse_vdf(text: str) -> Dict:
+    """
+    Разбор текстового VDF (KeyValues): вложенные словари строк
+    
+    Незакрытые блоки и лишние токены не считаются ошибкой: Steam
+    дописывает файлы атомарно, но повреждённый файл не должен ронять GUI.
+    """
+    root: Dict = {}
+    stack = [root]
+    key: Optional[str] = None
+    for match in _TOKEN_RE.finditer(text):
+        quoted, brace, comment, bare = match.groups()
+        if comment is not None:
+            continue
+        if brace == "{":
+            child: Dict = {}
+            if key is not None:
+                stack[-1][key] = child
+                key = None
+            stack.append(child)
+        elif brace == "}":
+            key = None
+            if len(stack) > 1:
+                stack.pop()
+        else:
+            token = _unescape(quoted) if quoted is not None else bare
+            if key is None:
+                key = token
+            else:
+                stack[-1][key] = token
+                key = None
+    return root
+
+
+def _unescape(value: str) -> str:
+    if "\\" not in value:
+        return value
+    return re.sub(r"\\(.)", lambda m: _ESCAPES.get(m.group(1), m.group(0)), value)
+
+
+def _lower_keys(data: Dict) -> Dict:
+    # Регистр ключей в манифестах разных версий Steam не совпадает
+    return {str(k).lower(): v for k, v in data.items()}
+
+
+def _to_int(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def steam_roots() -> List[str]:
+    """Существующие каталоги установки Steam (без повторов через ссылки)"""
+    roots = []
+    for root in STEAM_ROOTS:
+        real = os.path.realpath(root)
+        if real not in roots and os.path.isdir(os.path.join(real, "steamapps")):
+            roots.append(real)
+    return roots
+
+
+def library_paths(roots: Optional[List[str]] = None) -> List[str]:
+    """
+    Каталоги библиотек: сами каталоги Steam и библиотеки из
+    libraryfolders.vdf (новый формат "N" { "path" ... } и старый "N" "path")
+    """
+    paths: List[str] = []
+    for root in steam_roots() if roots is None else roots:
+        candidates = [root]
+        try:
+            with open(os.path.join(root, "steamapps", LIBRARY_FOLDERS),
+                      encoding="utf-8", errors="replace") as f:
+                data = _lower_keys(parse_vdf(f.read()))
+        except OSError:
+            data = {}
+        folders = data.get("libraryfolders")
+        if isinstance(folders, dict):
+            for key, value in folders.items():
+                if isinstance(value, dict):
+                    value = _lower_keys(value).get("path")
+                elif not key.isdigit():
+                    continue
+                if isinstance(value, str) and value:
+                    candidates.append(value)
+        for path in candidates:
+            real = os.path.realpath(path)
+            if real not in paths and os.path.isdir(os.path.join(real, "steamapps")):
+                paths.append(real)
+    return paths
+
+
+def parse_manifest(path: str, library: str, device: int) -> Optional[SteamApp]:
+    """Приложение из appmanifest_*.acf (None для некорректного файла)"""
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            data = _lower_keys(parse_vdf(f.read()))
+    except OSError:
+        return None
+    state = data.get("appstate")
+    if not isinstance(state, dict):
+        return None
+    state = _lower_keys(state)
+    appid = _to_int(state.get("appid"))
+    if not appid:
+        match = MANIFEST_RE.match(os.path.basename(path))
+        appid = int(match.group(1)) if match else 0
+    if not appid:
+        return None
+    return SteamApp(appid, str(state.get("name") or f"App {appid}"),
+                    _to_int(state.get("sizeondisk")), _to_int(state.get("lastupdated")),
+                    str(state.get("installdir") or ""), library, device)
+
+
+class SteamLibraries:
+    """
+    Библиотеки Steam с кэшем разобранных манифестов
+    
+    Загрузка читает libraryfolders.vdf и список файлов каталогов steamapps;
+    заново разбираются только манифесты с изменившимися mtime или размером.
+    Кэш хранится в JSON файле и в памяти процесса.
+    """
+    
+    def __init__(self, path=CACHE_FILE, roots: Optional[List[str]] = None):
+        self.path = Path(path)
+        self.roots = roots
+        self._lock = threading.Lock()
+        self._manifests: Optional[Dict[str, Dict]] = None
+    
+    def load(self) -> List[SteamLibrary]:
+        """Библиотеки с приложениями (отсортированы по названию)"""
+        with self._lock:
+            cached = self._load_cache()
+            manifests: Dict[str, Dict] = {}
+            libraries = []
+            for library in library_paths(self.roots):
+                loaded = self._load_library(library, cached, manifests)
+                if loaded is None:
+                    continue
+                device, apps = loaded
+                apps.sort(key=lambda app: app.name.lower())
+                libraries.append(SteamLibrary(library, device, device_class(device), apps))
+            if manifests != cached:
+                self._manifests = manifests
+                self._save_cache(manifests)
+            return libraries
+    
+    def apps(self) -> List[SteamApp]:
+        """Все установленные приложения"""
+        return [app for library in self.load() for app in library.apps]
+    
+    def clear(self):
+        """Удаление кэша"""
+        with self._lock:
+            self._manifests = {}
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+    
+    def _load_library(self, library: str, cached: Dict[str, Dict],
+                      manifests: Dict[str, Dict]):
+        steamapps = os.path.join(library, "steamapps")
+        try:
+            device = os.stat(steamapps).st_dev
+            entries = list(os.scandir(steamapps))
+        except OSError:
+            return None
+        apps = []
+        for entry in entries:
+            if not MANIFEST_RE.match(entry.name):
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            key = [st.st_mtime_ns, st.st_size, device]
+            record = cached.get(entry.path)
+            app = None
+            if record is not None and record.get("key") == key:
+                try:
+                    app = SteamApp(**record["app"]) if record["app"] else None
+                except (KeyError, TypeError):
+                    record = None
+            else:
+                record = None
+            if record is None:
+                app = parse_manifest(entry.path, library, device)
+                record = {"key": key, "app": app._asdict() if app else None}
+            manifests[entry.path] = record
+            if app is not None:
+                apps.append(app)
+        return device, apps
+    
+    def _load_cache(self) -> Dict[str, Dict]:
+        if self._manifests is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = None
+            if isinstance(data, dict) and data.get("version") == CACHE_VERSION \
+                    and isinstance(data.get("manifests"), dict):
+                self._manifests = data["manifests"]
+            else:
+                self._manifests = {}
+        return self._manifests
+    
+    def _save_cache(self, manifests: Dict[str, Dict]):
+        # Атомарная замена, как у индекса журналов
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=str(self.path.parent), prefix=".steamlib-")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "manifests": manifests}, f,
+                          ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except (OSError, TypeError, ValueError):
+            os.unlink(tmp_path)
+
+
+_libraries: Optional[SteamLibraries] = None
+_libraries_lock = threading.Lock()
+
+
+def get_libraries() -> SteamLibraries:
+    """Общая модель библиотек Steam для процесса"""
+    global _libraries
+    with _libraries_lock:
+        if _libraries is None:
+            _libraries = SteamLibraries()
+        return _libraries
+
+
+def _format_bytes(size: int) -> str:
+    from steamdeck_probe import format_bytes
+    return format_bytes(size)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Библиотеки Steam")
+    sub = parser.add_subparsers(dest="command", required=True)
+    
+    sub.add_parser("summary", help="Число игр и размер по библиотекам")
+    list_parser = sub.add_parser("list", help="Установленные приложения")
+    list_parser.add_argument("--json", action="store_true", help="Вывод в JSON")
+    sub.add_parser("clear", help="Удалить кэш манифестов")
+    
+    args = parser.parse_args(argv)
+    libraries = get_libraries()
+    
+    if args.command == "clear":
+        libraries.clear()
+        return 0
+    
+    loaded = libraries.load()
+    if not loaded:
+        print("Библиотеки Steam не найдены", file=sys.stderr)
+        return 1
+    
+    if args.command == "summary":
+        for library in loaded:
+            print(f"{library.path} ({library.device_name}): "
+                  f"{len(library.apps)} игр, {_format_bytes(library.size_on_disk)}")
+        total = sum(library.size_on_disk for library in loaded)
+        print(f"Установленных игр: {sum(len(library.apps) for library in loaded)}")
+        print(f"Размер игр: {_format_bytes(total)}")
+    elif args.json:
+        print(json.dumps([app._asdict() for library in loaded for app in library.apps],
+                         ensure_ascii=False, indent=2))
+    else:
+        for library in loaded:
+            for app in library.apps:
+                print(f"{app.appid}\t{_format_bytes(app.size_on_disk)}\t{app.name}\t"
+                      f"{app.install_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,6 +15,12 @@ PROJECT_ROOT="$(dirname "$SCRIPT_DIR")"
 # Загружаем core библиотеку
 source "$PROJECT_ROOT/lib/core.sh"
 
+# Протокол прогресса для GUI
+source "$SCRIPT_DIR/steamdeck_progress.sh"
+
+# Общий индекс файлов игр
+source "$SCRIPT_DIR/steamdeck_gameindex.sh"
+
 # Конфигурация
 GAMES_DIR="$HOME/Games"
 STEAMRIP_DIR="$GAMES_DIR/SteamRip"
@@ -71,34 +77,11 @@ check_dependencies() {
 
 # Поиск RAR файлов SteamRip
 find_steamrip_rar() {
-    local search_dirs=(
-        "$DOWNLOADS_DIR"
-        "$STEAMRIP_DIR"
-        "$GAMES_DIR"
-        "/run/media/mmcblk0p1/Downloads"
-        "/run/media/mmcblk0p1/Games"
-    )
-    
-    # Добавляем все возможные /run/media/* для флешек и SD карт
-    local media_dirs=()
-    if [[ -d "/run/media" ]]; then
-        while IFS= read -r -d '' dir; do
-            media_dirs+=("$dir")
-        done < <(find /run/media -maxdepth 1 -type d ! -path /run/media -print0 2>/dev/null)
-    fi
-    
-    # Добавляем в search_dirs
-    search_dirs+=("${media_dirs[@]}")
-    
+    # Загрузки, Games, SteamRip, SD карта и все /run/media/* (общий индекс)
     local found_files=()
-    
-    for dir in "${search_dirs[@]}"; do
-        if [[ -d "$dir" ]]; then
-            while IFS= read -r -d '' file; do
-                found_files+=("$file")
-            done < <(find "$dir" -name "*.rar" -type f -print0 2>/dev/null)
-        fi
-    done
+    while IFS= read -r -d '' file; do
+        found_files+=("$file")
+    done < <(game_index_find rar search)
     
     if [[ ${#found_files[@]} -eq 0 ]]; then
         print_warning "RAR файлы SteamRip не найдены"
@@ -240,10 +223,41 @@ interactive_rar_extract() {
     fi
 }
 
+# Распаковка RAR с событиями прогресса по файлам
+unrar_extract() {
+    local rar_file="$1"
+    local extract_dir="$2"
+    
+    if ! progress_enabled; then
+        unrar x "$rar_file" "$extract_dir/"
+        return
+    fi
+    
+    local total
+    total=$(unrar lb "$rar_file" 2>/dev/null | wc -l)
+    progress_items extract 0 "$total" "$(basename "$rar_file")"
+    
+    unrar x "$rar_file" "$extract_dir/" | {
+        local done_items=0
+        local line
+        while IFS= read -r line; do
+            printf '%s\n' "$line"
+            case "$line" in
+                "Extracting from "*)
+                    ;;
+                "Extracting "*|"Creating "*)
+                    done_items=$((done_items + 1))
+                    progress_items extract "$done_items" "$total"
+                    ;;
+            esac
+        done
+    }
+}
+
 # Распаковка SteamRip RAR
 extract_steamrip_rar() {
     local rar_file="$1"
-    local extract_dir="$2"
+    local extract_dir="${2:-}"
     
     # Валидация
     if [[ ! -f "$rar_file" ]]; then
@@ -260,7 +274,11 @@ extract_steamrip_rar() {
     # Проверяем Proton или Wine
     if ! check_proton && ! check_wine; then
         print_warning "Proton и Wine не найдены"
-        read -p "Установить Wine для запуска Windows игр? (y/n): " confirm
+        # Без терминала (фоновая задача GUI) спросить некого: Wine не ставим
+        local confirm="n"
+        if [[ -t 0 ]]; then
+            read -p "Установить Wine для запуска Windows игр? (y/n): " confirm
+        fi
         if [[ "$confirm" == "y" || "$confirm" == "Y" ]]; then
             print_message "Установка Wine..."
             sudo pacman -S wine --noconfirm
@@ -284,7 +302,7 @@ extract_steamrip_rar() {
     
     # Распаковка RAR
     print_message "Распаковка в: $extract_dir"
-    if unrar x "$rar_file" "$extract_dir/"; then
+    if unrar_extract "$rar_file" "$extract_dir"; then
         print_success "RAR файл распакован"
     else
         print_error "Ошибка распаковки RAR файла"
@@ -391,9 +409,12 @@ batch_process_steamrip() {
     
     print_message "Найдено RAR файлов: ${#rar_files[@]}"
     
+    local processed=0
     for rar_file in "${rar_files[@]}"; do
         echo
         print_message "Обработка: $(basename "$rar_file")"
+        progress_items batch "$processed" "${#rar_files[@]}" "$(basename "$rar_file")"
+        processed=$((processed + 1))
         
         if analyze_steamrip_rar "$rar_file"; then
             read -p "Распаковать этот файл? (y/N): " confirm
@@ -402,6 +423,7 @@ batch_process_steamrip() {
             fi
         fi
     done
+    progress_items batch "$processed" "${#rar_files[@]}"
 }
 
 # Очистка SteamRip директории
@@ -506,7 +528,7 @@ main() {
             find_steamrip_rar
             ;;
         "analyze")
-            if [[ -z "$2" ]]; then
+            if [[ -z "${2:-}" ]]; then
                 print_error "Укажите путь к RAR файлу"
                 show_help
                 exit 1
@@ -514,12 +536,12 @@ main() {
             analyze_steamrip_rar "$2"
             ;;
         "extract")
-            if [[ -z "$2" ]]; then
+            if [[ -z "${2:-}" ]]; then
                 print_error "Укажите путь к RAR файлу"
                 show_help
                 exit 1
             fi
-            extract_steamrip_rar "$2" "$3"
+            extract_steamrip_rar "$2" "${3:-}"
             ;;
         "batch")
             batch_process_steamrip
@@ -542,5 +564,7 @@ main() {
     esac
 }
 
-# Запуск
-main "$@"
+# Запуск (фоновый обработчик steamdeck_worker.sh только подключает функции)
+if [[ -z "${STEAMDECK_WORKER:-}" ]]; then
+    main "$@"
+fi
@@ -15,8 +15,26 @@ SCRIPT_PATH="$(readlink -f "${BASH_SOURCE[0]}")"
 SCRIPT_DIR="$(dirname "$SCRIPT_PATH")"
 PROJECT_ROOT="$(dirname "$SCRIPT_DIR")"
 
-# Загружаем core библиотеку
-source "$PROJECT_ROOT/lib/core.sh"
+# Загружаем core библиотеку (в поставке её может не быть - тогда
+# функции вывода определяются здесь, как в остальных скриптах)
+if [[ -f "$PROJECT_ROOT/lib/core.sh" ]]; then
+    source "$PROJECT_ROOT/lib/core.sh"
+else
+    RED='\033[0;31m'
+    GREEN='\033[0;32m'
+    YELLOW='\033[1;33m'
+    BLUE='\033[0;34m'
+    CYAN='\033[0;36m'
+    NC='\033[0m'
+    
+    print_message() { echo -e "${BLUE}[INFO]${NC} $1"; }
+    print_success() { echo -e "${GREEN}[SUCCESS]${NC} $1"; }
+    print_warning() { echo -e "${YELLOW}[WARNING]${NC} $1"; }
+    print_error() { echo -e "${RED}[ERROR]${NC} $1"; }
+    print_header() { echo -e "${CYAN}=== $1 ===${NC}"; }
+    print_debug() { [[ -n "${DEBUG:-}" ]] && echo -e "${CYAN}[DEBUG]${NC} $1" >&2; return 0; }
+    log_info() { print_debug "$1"; }
+fi
 
 # Конфигурация
 REPO_URL="https://github.com/ncux-ad/SteamDeck_start.git"
@@ -1085,5 +1103,7 @@ main() {
     esac
 }
 
-# Запуск
-main "$@"
+# Запуск (фоновый обработчик steamdeck_worker.sh только подключает функции)
+if [[ -z "${STEAMDECK_WORKER:-}" ]]; then
+    main "$@"
+fi
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Steam Deck Enhancement Pack - Фоновые bash-обработчики
+Долгоживущие bash-процессы, которые один раз подключают скрипт проекта
+и выполняют его функции по запросу, без повторного запуска и разбора скрипта.
+Автор: @ncux11
+Версия: динамическая (читается из VERSION)
+"""
+
+import os
+import secrets
+import selectors
+import signal
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+WORKER_SCRIPT = Path(__file__).parent / "steamdeck_worker.sh"
+
+# Время ожидания ответа на один вызов (секунды)
+CALL_TIMEOUT = 30
+
+# Время на подключение скрипта при запуске обработчика (секунды)
+START_TIMEOUT = 10
+
+
+class WorkerError(RuntimeError):
+    """Обработчик не запустился, завершился или не ответил вовремя"""
+    pass
+
+
+class BashWorker:
+    """
+    Bash-процесс с подключённым скриптом
+    
+    Вызовы выполняются по одному (под блокировкой), каждый в своём
+    подшелле. Если обработчик завершился или завис, он перезапускается
+    при следующем вызове.
+    """
+    
+    def __init__(self, script_path, timeout: float = CALL_TIMEOUT):
+        """
+        Args:
+            script_path: Путь к скрипту (должен не запускать main при STEAMDECK_WORKER)
+            timeout: Время ожидания ответа по умолчанию
+        """
+        self.script_path = Path(script_path)
+        self.timeout = timeout
+        self._process: Optional[subprocess.Popen] = None
+        self._token = b""
+        self._buffer = b""
+        self._lock = threading.Lock()
+    
+    @property
+    def alive(self) -> bool:
+        """Процесс обработчика запущен"""
+        return self._process is not None and self._process.poll() is None
+    
+    def call(self, func: str, *args, timeout: Optional[float] = None) -> Tuple[int, str]:
+        """
+        Вызов функции скрипта
+        
+        Args:
+            func: Имя функции (или команды)
+            args: Аргументы
+            timeout: Время ожидания ответа (по умолчанию self.timeout)
+        
+        Returns:
+            Кортеж (код возврата, вывод)
+        
+        Raises:
+            WorkerError: обработчик не запустился или не ответил вовремя
+        """
+        request = [str(len(args) + 1), func] + [str(arg) for arg in args]
+        data = b"".join(part.encode("utf-8") + b"\0" for part in request)
+        
+        with self._lock:
+            if not self.alive:
+                self._start()
+            try:
+                self._process.stdin.write(data)
+                self._process.stdin.flush()
+            except (BrokenPipeError, OSError) as e:
+                self._kill()
+                raise WorkerError(f"{self.script_path.name}: обработчик недоступен ({e})")
+            return self._read_response(timeout or self.timeout)
+    
+    def close(self):
+        """Остановка обработчика"""
+        with self._lock:
+            if self._process is None:
+                return
+            try:
+                self._process.stdin.close()
+                self._process.wait(timeout=1)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+            self._kill()
+    
+    def _start(self):
+        """Запуск процесса и подключение скрипта (под блокировкой)"""
+        if not self.script_path.exists():
+            raise WorkerError(f"Скрипт не найден: {self.script_path}")
+        
+        self._token = f"__steamdeck_worker_{secrets.token_hex(8)}__".encode()
+        self._buffer = b""
+        self._process = subprocess.Popen(
+            ["bash", "-c", 'source "$1" "$2"', str(self.script_path),
+             str(WORKER_SCRIPT), self._token.decode()],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            cwd=str(self.script_path.parent.parent),
+            # Своя группа процессов: при зависании убиваем вместе с потомками
+            start_new_session=True
+        )
+        
+        returncode, output = self._read_response(START_TIMEOUT)
+        if returncode != 0:
+            self._kill()
+            raise WorkerError(
+                f"{self.script_path.name}: не удалось подключить скрипт (код {returncode})"
+            )
+    
+    def _read_response(self, timeout: float) -> Tuple[int, str]:
+        """Чтение вывода до строки-маркера с кодом возврата (под блокировкой)"""
+        marker = b"\n" + self._token + b" "
+        stdout = self._process.stdout
+        deadline = time.monotonic() + timeout
+        
+        with selectors.DefaultSelector() as selector:
+            selector.register(stdout, selectors.EVENT_READ)
+            while True:
+                start = self._buffer.find(marker)
+                if start != -1:
+                    end = self._buffer.find(b"\n", start + len(marker))
+                    if end != -1:
+                        output = self._buffer[:start]
+                        returncode = int(self._buffer[start + len(marker):end])
+                        self._buffer = self._buffer[end + 1:]
+                        return returncode, output.decode("utf-8", errors="replace")
+                
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._kill()
+                    raise WorkerError(f"{self.script_path.name}: нет ответа за {timeout} с")
+                
+                if not selector.select(remaining):
+                    continue
+                chunk = os.read(stdout.fileno(), 65536)
+                if not chunk:
+                    self._kill()
+                    raise WorkerError(f"{self.script_path.name}: обработчик завершился")
+                self._buffer += chunk
+    
+    def _kill(self):
+        """Завершение группы процессов обработчика (под блокировкой)"""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        if process.poll() is None:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        process.wait()
+        for stream in (process.stdin, process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+
+_workers: Dict[str, BashWorker] = {}
+_workers_lock = threading.Lock()
+
+
+def get_worker(script_path) -> BashWorker:
+    """Общий обработчик для скрипта (один на скрипт в процессе)"""
+    key = str(Path(script_path).resolve())
+    with _workers_lock:
+        worker = _workers.get(key)
+        if worker is None:
+            worker = BashWorker(key)
+            _workers[key] = worker
+        return worker
+
+
+def close_workers():
+    """Остановка всех обработчиков процесса"""
+    with _workers_lock:
+        workers = list(_workers.values())
+        _workers.clear()
+    for worker in workers:
+        worker.close()
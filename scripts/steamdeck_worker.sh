@@ -0,0 +1,49 @@
+#!/bin/bash
+
+# Steam Deck Bash Worker
+# Долгоживущий процесс, который один раз подключает скрипт и выполняет
+# вызовы его функций по запросам GUI (steamdeck_worker.py)
+# Автор: @ncux11
+# Версия: 0.1 (Октябрь 2025)
+#
+# Запуск: bash -c 'source "$1" "$2"' <script.sh> steamdeck_worker.sh <token>
+# ($0 указывает на подключаемый скрипт, как при обычном запуске)
+#
+# Запрос (stdin): число аргументов и сами аргументы, каждый завершается NUL:
+#   2\0get_current_version\0\0   ->   функция и её аргументы
+# Ответ (stdout): вывод функции (stdout и stderr), затем строка
+#   \n<token> <код возврата>\n
+# Первый ответ без запроса - результат подключения скрипта.
+
+_worker_token="$1"
+set --
+
+# Скрипт видит эту переменную и не запускает main
+STEAMDECK_WORKER=1
+
+source "$0" </dev/null >/dev/null 2>&1
+_worker_rc=$?
+
+# Режимы set -e / set -u скрипта действуют только внутри вызовов
+_worker_opts=""
+[[ $- == *e* ]] && _worker_opts+="e"
+[[ $- == *u* ]] && _worker_opts+="u"
+set +eu
+
+printf '\n%s %d\n' "$_worker_token" "$_worker_rc"
+(( _worker_rc == 0 )) || exit "$_worker_rc"
+
+while IFS= read -r -d '' _worker_argc; do
+    _worker_args=()
+    for (( _worker_i = 0; _worker_i < _worker_argc; _worker_i++ )); do
+        IFS= read -r -d '' _worker_arg || exit 0
+        _worker_args+=("$_worker_arg")
+    done
+
+    # Подшелл: exit и изменения переменных не затрагивают обработчик
+    (
+        [[ -n "$_worker_opts" ]] && set "-$_worker_opts"
+        "${_worker_args[@]}"
+    ) </dev/null 2>&1
+    printf '\n%s %d\n' "$_worker_token" "$?"
+done